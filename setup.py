@@ -4,4 +4,7 @@ setup(
     name="auto-scheduler",
     version="0.1",
     packages=find_packages(),
+    entry_points={
+        "console_scripts": ["auto-scheduler=src.cli:main"],
+    },
 ) 
\ No newline at end of file
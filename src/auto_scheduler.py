@@ -1,8 +1,23 @@
-from typing import Dict, List, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import math
 import random
 
-def simple_round_robin_auto_schedule(data: Dict) -> List[Tuple[Dict, Dict]]:
+from src.utils.availability import RoundRobinQueue
+from src.utils.dates import DayCalendar
+from src.utils.instrumentation import current_instrumentation, instrumented
+from src.utils.schedule import (SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES, SKIP_NOT_ENOUGH_RESOURCES,
+                                Schedule, parse_minute)
+from src.utils.skill_index import SkillIndex
+
+# Working day used when packing jobs by duration
+DAY_START = "08:00"
+DAY_END = "17:00"
+
+# NumPy and the NumPy-backed helpers are imported inside the schedulers that use
+# them, so the round-robin schedulers start without loading NumPy
+
+@instrumented("round_robin")
+def simple_round_robin_auto_schedule(data: Dict) -> Schedule:
     """
     Simple round robin job scheduling algorithm that assigns jobs to resources in rotation,
     without considering skill matching.
@@ -11,142 +26,451 @@ def simple_round_robin_auto_schedule(data: Dict) -> List[Tuple[Dict, Dict]]:
     - data: Input data containing jobs, resources and date range
     
     Returns:
-    - List of (event, event_assignment) tuples
+    - Schedule of (event, event_assignment) tuples; jobs past the date range are in `skipped`
     """
     # Validate date range
-    start_date = datetime.strptime(data["date_range"]["start_date"], "%Y-%m-%d")
-    end_date = datetime.strptime(data["date_range"]["end_date"], "%Y-%m-%d")
+    calendar = DayCalendar(data["date_range"])
     
-    if end_date < start_date:
+    if calendar.end_date < calendar.start_date:
         raise ValueError("End date cannot be before start date")
+    last_day = calendar.last_day
 
     job_ids = data["job_ids"]
     resources = data["resources"]
 
-    # Initialize resource availability
-    resource_availability = {res["id"]: start_date for res in resources}
+    # Initialize resource availability as day offsets, indexed by resource position
+    resource_availability = [0] * len(resources)
     
     # Initialize round robin pointer
     current_resource_index = 0
     
     # Job schedule output
-    job_schedule = []
+    job_schedule = Schedule(job_ids, [res["id"] for res in resources], calendar)
 
     # Process jobs one by one
-    for job_id in job_ids:
-        # Get next available resource in round robin fashion
-        resource = resources[current_resource_index]
-        resource_id = resource["id"]
-        
-        # Get assignment date
-        job_date = resource_availability[resource_id]
+    for job_index in range(len(job_ids)):
+        # Get assignment date of the next resource in round robin fashion
+        job_date = resource_availability[current_resource_index]
         
         # Only schedule if within date range
-        if job_date <= end_date:
-            # Create event and event_assignment
-            event = {
-                "name": f"Job {job_id}",
-                "job_id": job_id,
-                "start_date": job_date.strftime("%Y-%m-%d"),
-                "end_date": job_date.strftime("%Y-%m-%d"),
-                "start_time": None,
-                "end_time": None
-            }
-            
-            event_assignment = {
-                "id": None,
-                "event_id": None,
-                "resource_id": resource_id,
-                "key": None
-            }
-            
+        if job_date <= last_day:
             # Add to schedule
-            job_schedule.append((event, event_assignment))
+            job_schedule.append(job_index, current_resource_index, job_date)
             
             # Update resource availability
-            resource_availability[resource_id] += timedelta(days=1)
+            resource_availability[current_resource_index] = job_date + 1
+        else:
+            job_schedule.skip(job_index, SKIP_NO_AVAILABILITY)
         
         # Move to next resource
         current_resource_index = (current_resource_index + 1) % len(resources)
 
     return job_schedule
 
-def round_robin_with_skills_autoschedule(data: Dict) -> List[Tuple[Dict, Dict]]:
+@instrumented("round_robin_with_skills")
+def round_robin_with_skills_autoschedule(data: Dict, skill_index: Optional[SkillIndex] = None) -> Schedule:
+    """
+    Round robin job scheduling per skill group: each job goes to the next resource, in
+    rotation among the resources having all its required skills, on that resource's next free day.
+
+    Parameters:
+    - data: Input data containing jobs, resources and date range
+    - skill_index: SkillIndex over data["resources"] to reuse, e.g. kept warm between runs
+
+    Returns:
+    - Schedule of (event, event_assignment) tuples; unplaced jobs are in `skipped`
+    """
     job_ids = data["job_ids"]
     resources = data["resources"]
     jobs = data["jobs"]
-    start_date = datetime.strptime(data["date_range"]["start_date"], "%Y-%m-%d")
-    end_date = datetime.strptime(data["date_range"]["end_date"], "%Y-%m-%d")
+    calendar = DayCalendar(data["date_range"])
+    last_day = calendar.last_day
+    instrumentation = current_instrumentation()
+    enabled = instrumentation.enabled
 
-    # Initialize availability for each resource
-    resource_availability = {res["id"]: start_date for res in resources}
+    # Initialize availability for each resource as a day offset, indexed by resource position
+    resource_availability = [0] * len(resources)
 
-    # Keep track of where we are in the round-robin cycle for each skill group
-    round_robin_pointers = {}
+    # Index resource skills as bitmasks; eligible resources are memoized per skill group
+    if skill_index is None:
+        with instrumentation.phase("index"):
+            skill_index = SkillIndex(resources)
 
-    # Job schedule output
-    job_schedule = []
+    # Round-robin queue for each skill group; booked-up resources drop out of it
+    round_robin_queues = {}
 
-    # Helper function to filter resources based on job skills
-    def get_eligible_resources(required_skills):
-        return [res for res in resources if set(required_skills).issubset(res["skills"])]
+    # Job schedule output
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
 
     # Process jobs one by one
-    for job in jobs:
-        job_id = job["id"]
-        required_skills = job["required_skills"]
-
-        # Find all eligible resources
-        eligible_resources = get_eligible_resources(required_skills)
-        if not eligible_resources:
-            print(f"Warning: No resources available for job {job_id}.")
-            continue
-
-        # Initialize round-robin pointer for this skill group if not already initialized
-        skill_key = "_".join(sorted(required_skills))  # Unique key for this skill group
-        if skill_key not in round_robin_pointers:
-            round_robin_pointers[skill_key] = 0
-
-        # Find the next eligible resource in round-robin order
-        num_resources = len(eligible_resources)
-        start_index = round_robin_pointers[skill_key]
-        chosen_resource = None
-        for i in range(num_resources):
-            index = (start_index + i) % num_resources  # Cycle through resources
-            resource = eligible_resources[index]
-            if resource_availability[resource["id"]] <= end_date:
-                chosen_resource = resource
-                round_robin_pointers[skill_key] = (index + 1) % num_resources  # Update pointer
-                break
-
-        if not chosen_resource:
-            print(f"Warning: No available resources for job {job_id} within the date range.")
-            continue
-
-        # Assign the job to the chosen resource
-        resource_id = chosen_resource["id"]
-        job_date = resource_availability[resource_id]
-
-        # Create "event" and "event_assignment"
-        event = {
-            "name": f"Job {job_id}",
-            "job_id": job_id,
-            "start_date": job_date.strftime("%Y-%m-%d"),
-            "end_date": job_date.strftime("%Y-%m-%d"),
-            "start_time": None,
-            "end_time": None
-        }
-        event_assignment = {
-            "id": None,
-            "event_id": None,
-            "resource_id": resource_id,
-            "key": None
-        }
-
-        # Append to the schedule
-        job_schedule.append((event, event_assignment))
-
-        # Update resource availability to the next day
-        resource_availability[resource_id] += timedelta(days=1)
-
-    return job_schedule
\ No newline at end of file
+    with instrumentation.phase("assign"):
+        for job_index, job in enumerate(jobs):
+            # Find all eligible resources
+            skill_key = skill_index.mask_for(job["required_skills"])  # Unique key for this skill group
+            eligible_indices = skill_index.eligible_indices_for_mask(skill_key)
+            if not eligible_indices:
+                job_schedule.skip(job_index, SKIP_NO_ELIGIBLE_RESOURCES)
+                continue
+
+            # Initialize the round-robin queue for this skill group if not already initialized
+            queue = round_robin_queues.get(skill_key)
+            if queue is None:
+                queue = round_robin_queues[skill_key] = RoundRobinQueue(eligible_indices)
+
+            # Find the next eligible resource in round-robin order
+            if enabled:
+                probes = queue.probes
+            resource_index = queue.next_available(resource_availability, last_day)
+            if enabled:
+                instrumentation.observe("eligible_resources", len(eligible_indices))
+                instrumentation.observe("probes_per_job", queue.probes - probes)
+            if resource_index is None:
+                job_schedule.skip(job_index, SKIP_NO_AVAILABILITY)
+                continue
+
+            # Assign the job to the chosen resource
+            job_date = resource_availability[resource_index]
+            job_schedule.append(job_index, resource_index, job_date)
+
+            # Update resource availability to the next day
+            resource_availability[resource_index] = job_date + 1
+
+    return job_schedule
+
+@instrumented("capacity")
+def capacity_autoschedule(data: Dict,
+                          strategy: str = "first_fit",
+                          day_start: str = DAY_START,
+                          day_end: str = DAY_END) -> Schedule:
+    """
+    Duration-aware scheduling that packs jobs into each resource's working hours.
+
+    Every resource has day_end - day_start minutes per day (capped at max_hours
+    when given), and jobs are packed back to back by estimated_duration. Among
+    the eligible resources with room on the chosen day, the next one in
+    round-robin order for the skill group gets the job. A job longer than a
+    resource's day is split over consecutive completely free days; a job without
+    a duration takes a whole day, like in the round-robin schedulers.
+
+    Parameters:
+    - data: Input data containing jobs, resources and date range
+    - strategy: "first_fit" (earliest day with room) or "best_fit" (least time left over)
+    - day_start: Start of the working day ("HH:MM")
+    - day_end: End of the working day ("HH:MM")
+
+    Returns:
+    - Schedule with start_time/end_time filled
+    """
+    import numpy as np
+    from src.utils.capacity import CapacityCalendar, daily_capacity
+
+    if strategy not in ("first_fit", "best_fit"):
+        raise ValueError(f"Unknown strategy: {strategy}")
+    resources = data["resources"]
+    jobs = data["jobs"]
+    calendar = DayCalendar(data["date_range"])
+
+    start_minute = parse_minute(day_start)
+    day_minutes = parse_minute(day_end) - start_minute
+    if day_minutes <= 0:
+        raise ValueError("End of the working day must be after its start")
+    capacity_calendar = CapacityCalendar(daily_capacity(resources, day_minutes), calendar.num_days)
+    fit = capacity_calendar.first_fit if strategy == "first_fit" else capacity_calendar.best_fit
+    instrumentation = current_instrumentation()
+    enabled = instrumentation.enabled
+
+    with instrumentation.phase("index"):
+        skill_index = SkillIndex(resources)
+    eligible_rows = {}  # skill mask -> eligible resource positions as an array
+    pointers = {}       # skill mask -> round-robin position in eligible_rows
+
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
+
+    with instrumentation.phase("assign"):
+        for job_index, job in enumerate(jobs):
+            skill_key = skill_index.mask_for(job["required_skills"])
+            rows = eligible_rows.get(skill_key)
+            if rows is None:
+                rows = eligible_rows[skill_key] = np.array(skill_index.eligible_indices_for_mask(skill_key),
+                                                           dtype=np.intp)
+                pointers[skill_key] = 0
+            if enabled:
+                instrumentation.observe("eligible_resources", len(rows))
+            if not len(rows):
+                job_schedule.skip(job_index, SKIP_NO_ELIGIBLE_RESOURCES)
+                continue
+
+            duration = job.get("estimated_duration")
+            minutes = int(round(60 * duration)) if duration else None
+            pointer = pointers[skill_key]
+            if minutes is not None and minutes <= capacity_calendar.capacity[rows].max():
+                slot = fit(rows, minutes, pointer)
+            else:
+                slot = capacity_calendar.first_free_span(rows, minutes, pointer)
+            if slot is None:
+                job_schedule.skip(job_index, SKIP_NO_AVAILABILITY)
+                continue
+
+            resource_index, day = slot
+            end_day, start_offset, end_offset = capacity_calendar.book(resource_index, day, minutes)
+            job_schedule.append(job_index, resource_index, day, end_day,
+                                start_minute + start_offset, start_minute + end_offset)
+            pointers[skill_key] = (int(np.searchsorted(rows, resource_index)) + 1) % len(rows)
+
+    return job_schedule
+
+@instrumented("crew")
+def crew_autoschedule(data: Dict) -> Schedule:
+    """
+    Round robin scheduling for jobs that need several resources at once.
+
+    A job with resource_count k (1 by default) is booked on the earliest day on
+    which k of its skill-eligible resources are free, for one day like the
+    round-robin schedulers. The crew is picked among the free resources in
+    round-robin order per skill group, and the job gets one schedule row per
+    crew member, so it exports as one event with several event assignments.
+
+    Parameters:
+    - data: Input data containing jobs (with optional resource_count), resources and date range
+
+    Returns:
+    - Schedule with one row per (job, crew member)
+    """
+    import numpy as np
+    from src.utils.bitmap import AvailabilityBitmap
+
+    resources = data["resources"]
+    jobs = data["jobs"]
+    calendar = DayCalendar(data["date_range"])
+
+    availability = AvailabilityBitmap(len(resources), calendar.num_days)
+    instrumentation = current_instrumentation()
+    enabled = instrumentation.enabled
+
+    with instrumentation.phase("index"):
+        skill_index = SkillIndex(resources)
+    packed_masks = {}  # skill mask -> packed bit mask of the eligible resources
+    pointers = {}      # skill mask -> resource position the next crew starts from
+
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
+
+    with instrumentation.phase("assign"):
+        for job_index, job in enumerate(jobs):
+            crew_size = job.get("resource_count") or 1
+            skill_key = skill_index.mask_for(job["required_skills"])
+            eligible_indices = skill_index.eligible_indices_for_mask(skill_key)
+            if enabled:
+                instrumentation.observe("eligible_resources", len(eligible_indices))
+            if len(eligible_indices) < crew_size:
+                job_schedule.skip(job_index, SKIP_NO_ELIGIBLE_RESOURCES if not eligible_indices
+                                  else SKIP_NOT_ENOUGH_RESOURCES)
+                continue
+
+            packed = packed_masks.get(skill_key)
+            if packed is None:
+                packed = packed_masks[skill_key] = availability.pack(eligible_indices)
+                pointers[skill_key] = 0
+
+            job_date = availability.earliest_day(packed, crew_size)
+            if job_date is None:
+                job_schedule.skip(job_index, SKIP_NO_AVAILABILITY)
+                continue
+
+            # Take the free resources from the round-robin position onwards, wrapping around
+            free = availability.free_resources(packed, job_date)
+            start = int(np.searchsorted(free, pointers[skill_key]))
+            crew = np.roll(free, -start)[:crew_size]
+            for resource_index in crew:
+                job_schedule.append(job_index, int(resource_index), job_date)
+            availability.book(crew, job_date)
+            pointers[skill_key] = int(crew[-1]) + 1
+
+    return job_schedule
+
+@instrumented("travel_aware")
+def travel_aware_autoschedule(data: Dict,
+                              max_candidates: int = 8,
+                              cell_km: Optional[float] = None,
+                              day_start: str = DAY_START,
+                              day_end: str = DAY_END) -> Schedule:
+    """
+    Greedy insertion scheduling that keeps every technician's daily route short.
+
+    Jobs are taken in order and inserted into the skill-eligible (resource, day)
+    route where they add the least travel: at the cheapest position between the
+    home base and the jobs already on that route, or as a new route out of the
+    home base on the resource's first free day. Candidate routes come from a
+    grid index over home bases and placed jobs, walked outwards from the job
+    until `max_candidates` routes with room are found, so a job only looks at
+    the routes around it rather than at every resource.
+
+    Jobs take their estimated_duration out of the resource's working day (a
+    job without one, or longer than the day, takes the whole day) and are laid
+    out back to back from day_start in route order. A job without coordinates,
+    or without a located candidate route, goes to the eligible resource and day
+    with the most room left.
+
+    Parameters:
+    - data: Input data containing jobs and resources (with latitude/longitude) and date range
+    - max_candidates: Number of candidate routes compared per job
+    - cell_km: Grid cell size; by default sized for a few points per cell
+    - day_start: Start of the working day ("HH:MM")
+    - day_end: End of the working day ("HH:MM")
+
+    Returns:
+    - Schedule with start_time/end_time filled; unplaced jobs are in `skipped`
+    """
+    from src.utils.capacity import daily_capacity
+    from src.utils.travel import SpatialGrid, haversine_km
+
+    jobs = data["jobs"]
+    resources = data["resources"]
+    calendar = DayCalendar(data["date_range"])
+    num_days = calendar.num_days
+    num_jobs = len(jobs)
+    instrumentation = current_instrumentation()
+    enabled = instrumentation.enabled
+
+    start_minute = parse_minute(day_start)
+    day_minutes = parse_minute(day_end) - start_minute
+    if day_minutes <= 0:
+        raise ValueError("End of the working day must be after its start")
+    capacity = daily_capacity(resources, day_minutes)
+    durations = [int(round(60 * (job.get("estimated_duration") or 0))) for job in jobs]
+
+    def need(j: int, r: int) -> int:
+        # Same rule as the local search: no duration, or longer than the day, takes the whole day
+        return durations[j] if 0 < durations[j] <= capacity[r] else capacity[r]
+
+    # Nodes follow the TravelMatrix layout: jobs first, then home bases
+    records = list(jobs) + list(resources)
+    lat = [rec.get("latitude") for rec in records]
+    lon = [rec.get("longitude") for rec in records]
+    located = [lat[n] is not None and lon[n] is not None for n in range(len(records))]
+
+    with instrumentation.phase("index"):
+        skill_index = SkillIndex(resources)
+        located_lat = [lat[n] for n in range(len(records)) if located[n]]
+        located_lon = [lon[n] for n in range(len(records)) if located[n]]
+        reference_lat = sum(located_lat) / len(located_lat) if located_lat else 0.0
+        if cell_km is None:
+            # About two points per cell over the area the points span
+            span_km = 1.0
+            if located_lat:
+                span_km = max(haversine_km(min(located_lat), min(located_lon), max(located_lat), max(located_lon)), 1.0)
+            cell_km = max(span_km / max(math.sqrt(len(located_lat) / 2), 1.0), 0.5)
+        grid = SpatialGrid(cell_km, reference_lat)
+        for r in range(len(resources)):
+            if located[num_jobs + r]:
+                grid.add(num_jobs + r, lat[num_jobs + r], lon[num_jobs + r])
+
+    sequences = {}                               # (resource, day) -> jobs in route order
+    route_of = {}                                # job -> (resource, day)
+    skipped = {}                                 # job -> skip reason
+    used = [[0] * num_days for _ in resources]   # minutes booked per resource and day
+    first_empty = [0] * len(resources)           # first day without a route, per resource
+
+    def leg(a: int, b: int) -> float:
+        if located[a] and located[b]:
+            return haversine_km(lat[a], lon[a], lat[b], lon[b])
+        return 0.0
+
+    def best_insertion(r: int, sequence: List[int], j: int) -> Tuple[float, int]:
+        # Cheapest position for job j in a route that starts and ends at home
+        home = num_jobs + r
+        best, best_position = None, 0
+        previous = home
+        for position in range(len(sequence) + 1):
+            following = sequence[position] if position < len(sequence) else home
+            delta = leg(previous, j) + leg(j, following) - leg(previous, following)
+            if best is None or delta < best:
+                best, best_position = delta, position
+            previous = following
+        return best, best_position
+
+    def empty_day(r: int) -> Optional[int]:
+        day = first_empty[r]
+        while day < num_days and (r, day) in sequences:
+            day += 1
+        first_empty[r] = day
+        # need() never exceeds the day, but a resource without working hours takes nothing
+        return day if day < num_days and capacity[r] > 0 else None
+
+    masks = skill_index.resource_masks
+    with instrumentation.phase("assign"):
+        for j, job in enumerate(jobs):
+            mask = skill_index.mask_for(job["required_skills"])
+            eligible = skill_index.eligible_indices_for_mask(mask)
+            if not eligible:
+                skipped[j] = SKIP_NO_ELIGIBLE_RESOURCES
+                continue
+
+            best = None  # (added km, resource, day, position)
+            examined = 0
+            if located[j]:
+                seen = set()
+                found = 0
+                last_ring = False
+                for ring in grid.rings(lat[j], lon[j]):
+                    for node in ring:
+                        if node >= num_jobs:
+                            r = node - num_jobs
+                            if masks[r] & mask != mask:
+                                continue
+                            day = empty_day(r)
+                            if day is None or (r, day) in seen:
+                                continue
+                            key = (r, day)
+                        else:
+                            key = route_of[node]
+                            r, day = key
+                            if key in seen or masks[r] & mask != mask or used[r][day] + need(j, r) > capacity[r]:
+                                continue
+                        seen.add(key)
+                        found += 1
+                        delta, position = best_insertion(r, sequences.get(key, []), j)
+                        if best is None or delta < best[0]:
+                            best = (delta, r, day, position)
+                    # Routes in the next ring can still be closer than the corners of this one
+                    if last_ring:
+                        break
+                    last_ring = found >= max_candidates
+                examined = found
+
+            if best is None:
+                # No located candidate: the eligible resource and day with the most room
+                for r in eligible:
+                    for day in range(num_days):
+                        room = capacity[r] - used[r][day] - need(j, r)
+                        if capacity[r] > 0 and room >= 0 and (best is None or room > best[0]):
+                            best = (room, r, day, len(sequences.get((r, day), ())))
+                examined += len(eligible)
+            if enabled:
+                instrumentation.observe("eligible_resources", len(eligible))
+                instrumentation.observe("candidate_routes", examined)
+            if best is None:
+                skipped[j] = SKIP_NO_AVAILABILITY
+                continue
+
+            _, r, day, position = best
+            sequences.setdefault((r, day), []).insert(position, j)
+            route_of[j] = (r, day)
+            used[r][day] += need(j, r)
+            if located[j]:
+                grid.add(j, lat[j], lon[j])
+
+    # Lay each route out back to back from the start of the day
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
+    slots = {}
+    for (r, day), sequence in sequences.items():
+        clock = start_minute
+        for j in sequence:
+            slots[j] = (r, day, clock, clock + need(j, r))
+            clock += need(j, r)
+    for j in range(num_jobs):
+        if j in slots:
+            r, day, start, end = slots[j]
+            job_schedule.append(j, r, day, day, start, end)
+        else:
+            job_schedule.skip(j, skipped[j])
+    return job_schedule
@@ -0,0 +1,288 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.synthetic import TENANT_SIZES, generate_sized_tenant
+
+# Relative slowdown (or memory growth) tolerated before a result counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Timings below this many seconds are too noisy to compare
+MIN_COMPARABLE_TIME = 0.005
+
+def _prepare_round_robin(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import simple_round_robin_auto_schedule
+    return lambda: simple_round_robin_auto_schedule(data), len(data["jobs"])
+
+def _prepare_round_robin_with_skills(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import round_robin_with_skills_autoschedule
+    return lambda: round_robin_with_skills_autoschedule(data), len(data["jobs"])
+
+def _prepare_capacity(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import capacity_autoschedule
+    return lambda: capacity_autoschedule(data), len(data["jobs"])
+
+def _prepare_crew(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import crew_autoschedule
+    return lambda: crew_autoschedule(data), len(data["jobs"])
+
+def _prepare_travel_aware(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import travel_aware_autoschedule
+    return lambda: travel_aware_autoschedule(data), len(data["jobs"])
+
+def _prepare_export(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import round_robin_with_skills_autoschedule
+    from src.utils.io import stream_job_schedule_to_file
+    job_schedule = round_robin_with_skills_autoschedule(data)
+    filename = os.path.join(workdir, "schedule.ndjson")
+    return lambda: stream_job_schedule_to_file(job_schedule, filename), len(data["jobs"])
+
+def _prepare_export_json(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    # The original in-memory export, for comparison with the streaming one
+    from src.auto_scheduler import round_robin_with_skills_autoschedule
+    from src.utils.io import export_job_schedule_to_json
+    job_schedule = round_robin_with_skills_autoschedule(data)
+    filename = os.path.join(workdir, "schedule.json")
+    return lambda: export_job_schedule_to_json(job_schedule, filename), len(data["jobs"])
+
+def _prepare_visualization(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from src.auto_scheduler import round_robin_with_skills_autoschedule
+    from src.utils.visualization import visualize_job_assignments
+    job_schedule = round_robin_with_skills_autoschedule(data)
+
+    def run():
+        with warnings.catch_warnings():
+            # plt.show() warns on the non-interactive backend
+            warnings.simplefilter("ignore", UserWarning)
+            visualize_job_assignments(job_schedule, data["resources"], data["date_range"], data["jobs"], "benchmark")
+        plt.close("all")
+    return run, len(data["jobs"])
+
+def _prepare_headless_visualization(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.auto_scheduler import round_robin_with_skills_autoschedule
+    from src.utils.visualization import render_job_assignments
+    job_schedule = round_robin_with_skills_autoschedule(data)
+    output_dir = os.path.join(workdir, "views")
+    return (lambda: render_job_assignments(job_schedule, data["resources"], data["date_range"], data["jobs"],
+                                           "benchmark", output_dir), len(data["jobs"]))
+
+def _prepare_cp_sat(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.optimizer import optimized_autoschedule
+    return lambda: optimized_autoschedule(data, time_limit=10.0), len(data["jobs"])
+
+def _prepare_priority(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.priority import priority_autoschedule
+    return lambda: priority_autoschedule(data, time_limit=5.0), len(data["jobs"])
+
+def _prepare_local_search(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    # The travel matrix is built once up front, so only the search is timed. A fixed number of
+    # moves rather than the time limit ends the search, so the timings stay comparable
+    from src.local_search import local_search_autoschedule
+    from src.utils.travel import build_travel_matrix
+    travel = build_travel_matrix(data["jobs"], data["resources"], cache_dir=None)
+    return (lambda: local_search_autoschedule(data, travel, time_limit=30.0, max_iterations=20_000),
+            len(data["jobs"]))
+
+def _prepare_decomposed(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    from src.decomposition import decomposed_autoschedule
+    return lambda: decomposed_autoschedule(data), len(data["jobs"])
+
+def _prepare_routing(data: Dict, workdir: str) -> Tuple[Callable, int]:
+    # One day of routing: the day's worth of jobs for a handful of technicians
+    from src.routing import solve_routing
+    from src.utils.travel import build_travel_matrix
+    jobs, resources = data["jobs"][:40], data["resources"][:10]
+    travel = build_travel_matrix(jobs, resources, cache_dir=None)
+    return lambda: solve_routing(jobs, resources, travel, time_limit=5.0), len(jobs)
+
+# name -> (prepare(data, workdir) returning the timed callable and the number of jobs it
+# processes, largest tenant in jobs or None)
+BENCHMARKS = {
+    "round_robin": (_prepare_round_robin, None),
+    "round_robin_with_skills": (_prepare_round_robin_with_skills, None),
+    "capacity": (_prepare_capacity, None),
+    "crew": (_prepare_crew, 10_000),
+    "travel_aware": (_prepare_travel_aware, 10_000),
+    "export": (_prepare_export, None),
+    "export_json": (_prepare_export_json, None),
+    "visualization": (_prepare_visualization, 1_000),
+    "headless_visualization": (_prepare_headless_visualization, 10_000),
+    "cp_sat": (_prepare_cp_sat, 10_000),
+    "priority": (_prepare_priority, 100),
+    "local_search": (_prepare_local_search, 1_000),
+    "decomposed": (_prepare_decomposed, 10_000),
+    "routing": (_prepare_routing, None),
+}
+
+def measure(run: Callable, num_jobs: int, repeat: int = 3) -> Dict:
+    """
+    Time a callable and measure its peak traced memory.
+
+    The wall time is the best of `repeat` runs; memory is measured in one extra
+    run under tracemalloc, which would otherwise distort the timings. Output
+    printed by the schedulers is discarded.
+
+    Parameters:
+    - run: Zero-argument callable to measure
+    - num_jobs: Number of jobs the callable processes, for jobs_per_sec
+    - repeat: Number of timed runs
+
+    Returns:
+    - Dictionary with wall_time (seconds), peak_memory (bytes) and jobs_per_sec
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        try:
+            run()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    wall_time = min(timings)
+    return {
+        "wall_time": wall_time,
+        "peak_memory": peak_memory,
+        "jobs_per_sec": num_jobs / wall_time if wall_time > 0 else None,
+    }
+
+def run_suite(sizes: List[str],
+              benchmarks: Optional[List[str]] = None,
+              repeat: int = 3,
+              seed: int = 0,
+              log: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Run the benchmarks over synthetic tenants of the given sizes.
+
+    Parameters:
+    - sizes: TENANT_SIZES names
+    - benchmarks: BENCHMARKS names; all of them by default
+    - repeat: Number of timed runs per benchmark
+    - seed: Seed of the synthetic tenants
+    - log: Optional callable receiving one progress line per result
+
+    Returns:
+    - Dictionary with run metadata and results keyed "<benchmark>[<size>]"
+    """
+    benchmarks = list(BENCHMARKS) if benchmarks is None else benchmarks
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            data = generate_sized_tenant(size, seed)
+            num_jobs = len(data["jobs"])
+            for name in benchmarks:
+                prepare, max_jobs = BENCHMARKS[name]
+                if max_jobs is not None and num_jobs > max_jobs:
+                    continue
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    run, processed_jobs = prepare(data, workdir)
+                result = {
+                    "benchmark": name,
+                    "size": size,
+                    "jobs": processed_jobs,
+                    "resources": len(data["resources"]),
+                }
+                result.update(measure(run, processed_jobs, repeat))
+                results[f"{name}[{size}]"] = result
+                if log is not None:
+                    log(f"{name}[{size}]: {result['wall_time']:.4f}s, "
+                        f"{result['peak_memory'] / 1e6:.1f} MB peak, "
+                        f"{result['jobs_per_sec'] or 0:,.0f} jobs/s")
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+def compare_to_baseline(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Find results that got slower or use more memory than the baseline.
+
+    Parameters:
+    - current: Output of run_suite
+    - baseline: Earlier output of run_suite
+    - tolerance: Relative growth tolerated before reporting a regression
+
+    Returns:
+    - List of regressions with key, metric, baseline, current and ratio
+    """
+    regressions = []
+    for key, result in current["results"].items():
+        reference = baseline.get("results", {}).get(key)
+        if reference is None:
+            continue
+        for metric in ("wall_time", "peak_memory"):
+            before, after = reference.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            if metric == "wall_time" and max(before, after) < MIN_COMPARABLE_TIME:
+                continue
+            ratio = after / before
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    "key": key,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": after,
+                    "ratio": ratio,
+                })
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point: python -m src.benchmark [options].
+
+    Returns:
+    - Exit status: 1 if a regression against --baseline was found, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers on synthetic tenants.")
+    parser.add_argument("--sizes", nargs="+", default=["tiny", "small", "medium"], choices=list(TENANT_SIZES))
+    parser.add_argument("--benchmarks", nargs="+", default=None, choices=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results to this JSON file (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="Compare against this earlier results file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.benchmarks, args.repeat, args.seed, log=print)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=4)
+        print(f"Benchmark results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression['key']} {regression['metric']}: "
+                  f"{regression['baseline']:.4g} -> {regression['current']:.4g} (x{regression['ratio']:.2f})")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
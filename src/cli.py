@@ -0,0 +1,178 @@
+import argparse
+import functools
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.instrumentation import PROFILE_MODES, current_instrumentation, instrument
+from src.utils.io import DEFAULT_CACHE_DIR, stream_job_schedule_to_file
+
+# Bump when the cached result layout changes so stale entries are ignored
+CACHE_VERSION = 1
+
+# Package whose source is hashed into the cache key
+SOURCE_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (module, function, options it accepts). Modules are imported only when their
+# algorithm runs, so the round-robin path never loads NumPy or OR-Tools.
+ALGORITHMS = {
+    "round_robin": ("src.auto_scheduler", "simple_round_robin_auto_schedule", ()),
+    "round_robin_with_skills": ("src.auto_scheduler", "round_robin_with_skills_autoschedule", ()),
+    "capacity": ("src.auto_scheduler", "capacity_autoschedule", ("strategy",)),
+    "crew": ("src.auto_scheduler", "crew_autoschedule", ()),
+    "travel_aware": ("src.auto_scheduler", "travel_aware_autoschedule", ()),
+    "cp_sat": ("src.optimizer", "optimized_autoschedule", ("time_limit",)),
+    "priority": ("src.priority", "priority_autoschedule", ("time_limit",)),
+    "local_search": ("src.local_search", "local_search_autoschedule", ("time_limit", "seed")),
+    "decomposed": ("src.decomposition", "decomposed_autoschedule", ("seed",)),
+}
+
+def load_input(filename: str) -> Dict:
+    """
+    Read scheduler input (job_ids, jobs, resources, date_range) from a JSON or .json.gz file.
+    """
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "rt", encoding="utf-8") as input_file:
+        return json.load(input_file)
+
+@functools.lru_cache(maxsize=None)
+def _code_version() -> str:
+    """
+    Hash the package's Python source, so an upgrade that changes any algorithm invalidates the cache.
+    """
+    digest = hashlib.sha256()
+    for directory, subdirectories, filenames in os.walk(SOURCE_ROOT):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                path = os.path.join(directory, filename)
+                digest.update(os.path.relpath(path, SOURCE_ROOT).encode() + b"\0")
+                with open(path, "rb") as source_file:
+                    digest.update(source_file.read())
+    return digest.hexdigest()
+
+def cache_key(data: Dict, algorithm: str, options: Dict) -> str:
+    """
+    Hash the normalized input together with the algorithm, its options and the code version.
+
+    Key order and whitespace of the input file do not change the key.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{CACHE_VERSION}:{_code_version()}:{algorithm}:".encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    digest.update(json.dumps(data, sort_keys=True, separators=(",", ":")).encode())
+    return digest.hexdigest()
+
+def run_algorithm(algorithm: str, data: Dict, options: Dict) -> Tuple:
+    """
+    Run an algorithm by name.
+
+    Returns:
+    - Tuple of (Schedule, stats dictionary or None)
+    """
+    module_name, function_name, _ = ALGORITHMS[algorithm]
+    result = getattr(importlib.import_module(module_name), function_name)(data, **options)
+    if isinstance(result, tuple):
+        return result
+    return result, None
+
+def cached_run(data: Dict, algorithm: str, options: Dict,
+               cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Tuple:
+    """
+    Run an algorithm, or return the cached result of an identical earlier run.
+
+    Results are pickled to `cache_dir` under a content hash of the input,
+    algorithm, options and source code, written atomically so concurrent runs
+    never read a partial entry. An entry that cannot be unpickled, e.g. one
+    written against an older Schedule layout, counts as a miss.
+
+    Parameters:
+    - data: Scheduler input
+    - algorithm: ALGORITHMS name
+    - options: Keyword arguments for the algorithm
+    - cache_dir: Cache directory, or None to always run
+
+    Returns:
+    - Tuple of (Schedule, stats or None, whether it came from the cache)
+    """
+    instrumentation = current_instrumentation()
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(cache_dir, f"schedule-{cache_key(data, algorithm, options)}.pickle")
+        try:
+            with open(cache_path, "rb") as cache_file:
+                job_schedule, stats = pickle.load(cache_file)
+            instrumentation.count("result_cache", result="hit")
+            return job_schedule, stats, True
+        except Exception:
+            instrumentation.count("result_cache", result="miss")
+
+    job_schedule, stats = run_algorithm(algorithm, data, options)
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            pickle.dump((job_schedule, stats), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    return job_schedule, stats, False
+
+def _output_format(filename: str) -> str:
+    name = filename[:-3] if filename.endswith(".gz") else filename
+    return "json" if name.endswith(".json") else "ndjson"
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point: auto-scheduler INPUT -o OUTPUT [options].
+
+    Returns:
+    - Exit status
+    """
+    parser = argparse.ArgumentParser(prog="auto-scheduler", description="Schedule jobs onto resources.")
+    parser.add_argument("input", help="Input JSON file with job_ids, jobs, resources and date_range (.gz allowed)")
+    parser.add_argument("-o", "--output", required=True,
+                        help="Output file; .json writes a JSON array, anything else NDJSON, .gz compresses")
+    parser.add_argument("-a", "--algorithm", default="round_robin_with_skills", choices=list(ALGORITHMS))
+    parser.add_argument("--start-date", help="Override the input's date_range start (YYYY-MM-DD)")
+    parser.add_argument("--end-date", help="Override the input's date_range end (YYYY-MM-DD)")
+    parser.add_argument("--strategy", default="first_fit", choices=["first_fit", "best_fit"],
+                        help="Packing strategy of the capacity algorithm")
+    parser.add_argument("--time-limit", type=float, default=30.0, help="Solver budget in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Result cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Always recompute the schedule")
+    parser.add_argument("--metrics", help="Write instrumentation records to this JSON lines file")
+    parser.add_argument("--profile", choices=list(PROFILE_MODES), help="Also capture a profile into --metrics")
+    args = parser.parse_args(argv)
+    if args.profile and not args.metrics:
+        parser.error("--profile needs --metrics")
+
+    data = load_input(args.input)
+    date_range = dict(data["date_range"])
+    if args.start_date:
+        date_range["start_date"] = args.start_date
+    if args.end_date:
+        date_range["end_date"] = args.end_date
+    data["date_range"] = date_range
+    options = {name: getattr(args, name) for name in ALGORITHMS[args.algorithm][2]}
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    if args.metrics:
+        with instrument(args.profile) as instrumentation:
+            job_schedule, stats, cached = cached_run(data, args.algorithm, options, cache_dir)
+            stream_job_schedule_to_file(job_schedule, args.output, _output_format(args.output))
+        instrumentation.write_json_lines(args.metrics)
+    else:
+        job_schedule, stats, cached = cached_run(data, args.algorithm, options, cache_dir)
+        stream_job_schedule_to_file(job_schedule, args.output, _output_format(args.output))
+
+    print(f"Scheduled {len(set(job_schedule.job_index))} of {len(data['jobs'])} jobs with {args.algorithm}"
+          f"{' (cached)' if cached else ''}; {len(job_schedule.skipped)} skipped.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.availability import RoundRobinQueue, first_free_day
+from src.utils.dates import DayCalendar
+from src.utils.instrumentation import current_instrumentation, instrumented
+from src.utils.schedule import SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES, Schedule
+from src.utils.skill_index import SkillIndex
+
+ALGORITHMS = ("round_robin", "round_robin_with_skills", "cp_sat")
+
+def _run_algorithm(algorithm: str, data: Dict, options: Dict) -> Schedule:
+    if algorithm == "round_robin":
+        from src.auto_scheduler import simple_round_robin_auto_schedule
+        return simple_round_robin_auto_schedule(data)
+    if algorithm == "round_robin_with_skills":
+        from src.auto_scheduler import round_robin_with_skills_autoschedule
+        return round_robin_with_skills_autoschedule(data)
+    if algorithm == "cp_sat":
+        from src.optimizer import optimized_autoschedule
+        return optimized_autoschedule(data, **options)[0]
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+def _solve_cluster(algorithm: str, data: Dict, options: Dict) -> List[Tuple]:
+    """
+    Solve one subproblem and return its (job id, resource id, day) assignments.
+    """
+    job_schedule = _run_algorithm(algorithm, data, options)
+    return [(row.job_id, row.resource_id, row.day) for row in job_schedule.rows()]
+
+def _planar(lat: np.ndarray, lon: np.ndarray, reference_lat: float) -> np.ndarray:
+    # Equirectangular projection, good enough to compare distances within a region
+    return np.column_stack((lat, lon * math.cos(math.radians(reference_lat))))
+
+def cluster_jobs(jobs: List[Dict],
+                 num_clusters: int,
+                 seed: int = 0,
+                 iterations: int = 25) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cluster jobs by location with k-means.
+
+    Parameters:
+    - jobs: Job dictionaries with latitude and longitude
+    - num_clusters: Number of clusters
+    - seed: Seed for the initial centroids
+    - iterations: Maximum number of k-means iterations
+
+    Returns:
+    - Tuple of (label per job, -1 for jobs without coordinates; centroids as (lat, lon) rows)
+    """
+    lat = np.array([np.nan if job.get("latitude") is None else job["latitude"] for job in jobs], dtype=np.float64)
+    lon = np.array([np.nan if job.get("longitude") is None else job["longitude"] for job in jobs], dtype=np.float64)
+    labels = np.full(len(jobs), -1, dtype=np.int64)
+    located = ~(np.isnan(lat) | np.isnan(lon))
+    if not located.any():
+        return labels, np.empty((0, 2))
+
+    reference_lat = float(lat[located].mean())
+    points = _planar(lat[located], lon[located], reference_lat)
+    num_clusters = max(1, min(num_clusters, len(points)))
+    rng = np.random.default_rng(seed)
+    centroids = points[rng.choice(len(points), num_clusters, replace=False)]
+    for _ in range(iterations):
+        distance = ((points[:, np.newaxis, :] - centroids[np.newaxis, :, :]) ** 2).sum(axis=2)
+        assignment = distance.argmin(axis=1)
+        updated = centroids.copy()
+        for c in range(num_clusters):
+            members = points[assignment == c]
+            if len(members):
+                updated[c] = members.mean(axis=0)
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+
+    labels[located] = assignment
+    return labels, np.column_stack((centroids[:, 0], centroids[:, 1] / math.cos(math.radians(reference_lat))))
+
+def _allocate_resources(jobs: List[Dict], resources: List[Dict], labels: np.ndarray, centroids: np.ndarray,
+                        skill_index: SkillIndex, num_days: int) -> List[int]:
+    """
+    Assign every resource to one job cluster.
+
+    Resources with a home base join the nearest cluster. The others, specialists
+    first, join the cluster with the most not-yet-covered demand among the jobs
+    they are able to do.
+    """
+    num_clusters = len(centroids)
+    if not num_clusters:
+        return [-1] * len(resources)
+    reference_lat = float(centroids[:, 0].mean())
+    planar_centroids = _planar(centroids[:, 0], centroids[:, 1], reference_lat)
+    unmet = [{} for _ in range(num_clusters)]
+    for job, label in zip(jobs, labels):
+        if label >= 0:
+            mask = skill_index.mask_for(job["required_skills"])
+            unmet[label][mask] = unmet[label].get(mask, 0) + 1
+
+    def can_do(r: int, mask: int) -> bool:
+        return skill_index.resource_masks[r] & mask == mask
+
+    cluster_of = [0] * len(resources)
+    floating = []
+    for r, res in enumerate(resources):
+        if res.get("latitude") is not None and res.get("longitude") is not None:
+            home = _planar(np.array([res["latitude"]]), np.array([res["longitude"]]), reference_lat)[0]
+            cluster_of[r] = int(((planar_centroids - home) ** 2).sum(axis=1).argmin())
+        else:
+            floating.append(r)
+            continue
+        _consume(unmet[cluster_of[r]], [m for m in unmet[cluster_of[r]] if can_do(r, m)], num_days)
+
+    all_masks = {mask for cluster in unmet for mask in cluster}
+    floating.sort(key=lambda r: sum(1 for mask in all_masks if can_do(r, mask)))
+    for r in floating:
+        best_cluster, best_unmet = 0, -1
+        for c in range(num_clusters):
+            cluster_unmet = sum(count for mask, count in unmet[c].items() if can_do(r, mask))
+            if cluster_unmet > best_unmet:
+                best_cluster, best_unmet = c, cluster_unmet
+        cluster_of[r] = best_cluster
+        _consume(unmet[best_cluster], [m for m in unmet[best_cluster] if can_do(r, m)], num_days)
+    return cluster_of
+
+def _consume(unmet: Dict[int, int], masks: List[int], capacity: int) -> None:
+    # Spend a resource's capacity on the largest uncovered skill groups first
+    for mask in sorted(masks, key=unmet.get, reverse=True):
+        used = min(unmet[mask], capacity)
+        unmet[mask] -= used
+        capacity -= used
+        if not capacity:
+            break
+
+@instrumented("decomposed")
+def decomposed_autoschedule(data: Dict,
+                            algorithm: str = "round_robin_with_skills",
+                            num_clusters: Optional[int] = None,
+                            jobs_per_cluster: int = 100,
+                            max_workers: Optional[int] = None,
+                            seed: int = 0,
+                            options: Optional[Dict] = None) -> Tuple[Schedule, Dict]:
+    """
+    Split the problem into independent geographic subproblems and solve them in parallel.
+
+    Jobs are clustered by location and every resource is allocated to one
+    cluster, by home base or by uncovered demand for its skills. Each cluster is
+    solved in a separate process with the chosen algorithm. The partial schedules
+    are merged, then a repair pass assigns the jobs left over (unscheduled in
+    their cluster, or without a location) to any resource still free, in
+    round-robin order per skill group.
+
+    Parameters:
+    - data: Input data containing jobs, resources and date range
+    - algorithm: "round_robin", "round_robin_with_skills" or "cp_sat"
+    - num_clusters: Number of clusters; defaults to one per `jobs_per_cluster` jobs
+    - jobs_per_cluster: Target cluster size when num_clusters is not given
+    - max_workers: Worker processes; defaults to the number of CPUs
+    - seed: Seed for the clustering
+    - options: Extra keyword arguments for the algorithm (e.g. time_limit for cp_sat)
+
+    Returns:
+    - Tuple of (Schedule, stats with cluster sizes and the number of repaired jobs)
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    options = dict(options or {})
+    if algorithm == "cp_sat":
+        options.setdefault("num_workers", 1)
+
+    jobs = data["jobs"]
+    resources = data["resources"]
+    calendar = DayCalendar(data["date_range"])
+    skill_index = SkillIndex(resources)
+    if num_clusters is None:
+        num_clusters = max(1, round(len(jobs) / jobs_per_cluster))
+
+    labels, centroids = cluster_jobs(jobs, num_clusters, seed)
+    cluster_of = _allocate_resources(jobs, resources, labels, centroids, skill_index, calendar.num_days)
+
+    subproblems = []
+    for c in range(len(centroids)):
+        members = [job for job, label in zip(jobs, labels) if label == c]
+        cluster_resources = [res for res, cluster in zip(resources, cluster_of) if cluster == c]
+        if members and cluster_resources:
+            subproblems.append({
+                "job_ids": [job["id"] for job in members],
+                "jobs": members,
+                "resources": cluster_resources,
+                "date_range": data["date_range"],
+            })
+
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(subproblems), 1))
+    with current_instrumentation().phase("solve"):
+        if max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_solve_cluster, algorithm, sub, options) for sub in subproblems]
+                partials = [future.result() for future in futures]
+        else:
+            partials = [_solve_cluster(algorithm, sub, options) for sub in subproblems]
+
+    # Merge the partial schedules
+    job_position = {job["id"]: j for j, job in enumerate(jobs)}
+    resource_position = {res["id"]: r for r, res in enumerate(resources)}
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
+    booked = [0] * len(resources)  # bitmask of booked days per resource
+    scheduled = set()
+    for partial in partials:
+        for job_id, resource_id, day in partial:
+            j, r = job_position[job_id], resource_position[resource_id]
+            job_schedule.append(j, r, day)
+            booked[r] |= 1 << day
+            scheduled.add(j)
+
+    # Repair pass: leftover jobs go to any free eligible resource
+    next_free = [first_free_day(mask) for mask in booked]
+    queues = {}
+    repaired = 0
+    for j, job in enumerate(jobs):
+        if j in scheduled:
+            continue
+        mask = skill_index.mask_for(job["required_skills"])
+        queue = queues.get(mask)
+        if queue is None:
+            queue = queues[mask] = RoundRobinQueue(skill_index.eligible_indices_for_mask(mask))
+        r = queue.next_available(next_free, calendar.last_day)
+        if r is None:
+            job_schedule.skip(j, SKIP_NO_AVAILABILITY if queue.members else SKIP_NO_ELIGIBLE_RESOURCES)
+            continue
+        day = next_free[r]
+        job_schedule.append(j, r, day)
+        booked[r] |= 1 << day
+        next_free[r] = first_free_day(booked[r])
+        repaired += 1
+
+    stats = {
+        "clusters": [len(sub["jobs"]) for sub in subproblems],
+        "repaired": repaired,
+        "scheduled": len(job_schedule),
+    }
+    return job_schedule, stats
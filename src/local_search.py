@@ -0,0 +1,395 @@
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.auto_scheduler import DAY_END, DAY_START, round_robin_with_skills_autoschedule
+from src.utils.capacity import daily_capacity
+from src.utils.instrumentation import current_instrumentation, instrumented
+from src.utils.schedule import SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES, Schedule, parse_minute
+from src.utils.skill_index import SkillIndex
+from src.utils.travel import TravelMatrix, build_travel_matrix
+
+# Share of iterations spent on each move type
+MOVE_WEIGHTS = {"relocate": 0.45, "swap": 0.25, "route_swap": 0.1, "two_opt": 0.2}
+
+# Number of nearest jobs whose routes are tried as relocate/swap targets
+NEIGHBORS = 10
+
+
+class _Routes:
+    """
+    Job sequences of every (resource, day) with their travel and load bookkeeping.
+    """
+
+    def __init__(self, distance: np.ndarray, job_nodes: np.ndarray, home_nodes: np.ndarray,
+                 capacity: List[int], durations: List[int], num_days: int):
+        self.distance = distance
+        self.job_nodes = job_nodes
+        self.home_nodes = home_nodes
+        self.capacity = capacity
+        self.durations = durations
+        self.sequences: Dict[Tuple[int, int], List[int]] = {}
+        self.route_of: Dict[int, Tuple[int, int]] = {}
+        self.used = [[0] * num_days for _ in capacity]  # minutes booked per resource and day
+        self.load = [0] * len(capacity)                 # minutes booked per resource
+
+    def need(self, job: int, resource: int) -> int:
+        # Jobs without a duration, or longer than the working day, take the whole day
+        duration = self.durations[job]
+        capacity = self.capacity[resource]
+        return duration if 0 < duration <= capacity else capacity
+
+    def node(self, sequence: List[int], position: int, resource: int) -> int:
+        # Node at a position of the route, with the home base at both ends
+        if 0 <= position < len(sequence):
+            return self.job_nodes[sequence[position]]
+        return self.home_nodes[resource]
+
+    def leg(self, a: int, b: int) -> float:
+        return float(self.distance[a, b])
+
+    def route_km(self, resource: int, sequence: List[int]) -> float:
+        if not sequence:
+            return 0.0
+        nodes = [self.home_nodes[resource]] + [self.job_nodes[j] for j in sequence] + [self.home_nodes[resource]]
+        return float(self.distance[nodes[:-1], nodes[1:]].sum())
+
+    def total_km(self) -> float:
+        return sum(self.route_km(r, sequence) for (r, _), sequence in self.sequences.items())
+
+    def removal_delta(self, key: Tuple[int, int], position: int) -> float:
+        r = key[0]
+        sequence = self.sequences[key]
+        before = self.node(sequence, position - 1, r)
+        after = self.node(sequence, position + 1, r)
+        node = self.job_nodes[sequence[position]]
+        return self.leg(before, after) - self.leg(before, node) - self.leg(node, after)
+
+    def best_insertion(self, key: Tuple[int, int], job: int) -> Tuple[float, int]:
+        # Cheapest position to insert `job` and the added distance
+        r = key[0]
+        sequence = self.sequences.get(key, [])
+        node = self.job_nodes[job]
+        best, best_position = None, 0
+        for position in range(len(sequence) + 1):
+            before = self.node(sequence, position - 1, r)
+            after = self.node(sequence, position, r)
+            delta = self.leg(before, node) + self.leg(node, after) - self.leg(before, after)
+            if best is None or delta < best:
+                best, best_position = delta, position
+        return best, best_position
+
+    def insert(self, key: Tuple[int, int], job: int, position: int) -> None:
+        r, day = key
+        self.sequences.setdefault(key, []).insert(position, job)
+        self.route_of[job] = key
+        minutes = self.need(job, r)
+        self.used[r][day] += minutes
+        self.load[r] += minutes
+
+    def remove(self, job: int) -> None:
+        key = self.route_of.pop(job)
+        r, day = key
+        sequence = self.sequences[key]
+        position = sequence.index(job)
+        del sequence[position]
+        if not sequence:
+            del self.sequences[key]
+        minutes = self.need(job, r)
+        self.used[r][day] -= minutes
+        self.load[r] -= minutes
+
+
+@instrumented("local_search")
+def local_search_autoschedule(data: Dict,
+                              travel: Optional[TravelMatrix] = None,
+                              time_limit: float = 5.0,
+                              max_iterations: Optional[int] = None,
+                              balance_weight: float = 1.0,
+                              day_start: str = DAY_START,
+                              day_end: str = DAY_END,
+                              seed: int = 0) -> Tuple[Schedule, Dict]:
+    """
+    Improve the round-robin with skills schedule with an anytime local search.
+
+    Starting from `round_robin_with_skills_autoschedule`, jobs are packed into
+    each resource's working day (day_end - day_start, capped at max_hours) by
+    estimated_duration. Each iteration samples one move and applies it only if
+    it lowers the cost:
+    - relocate: move a job into the route of one of its nearest jobs, or onto a
+      random day, at the cheapest position
+    - swap: exchange a job with a job in the route of one of its nearest jobs
+    - route_swap: exchange a job's whole day route with the route (possibly empty)
+      of another eligible resource, which moves a cluster of jobs that single-job
+      moves cannot move one at a time
+    - two_opt: reverse the best segment of a job's route
+
+    Moves are scored incrementally from the legs they change. The cost is the
+    total travel in km (home base -> jobs -> home base per resource and day) plus
+    `balance_weight` times the variance of the resources' hours. Jobs the
+    heuristic left unassigned are inserted at the cheapest feasible position
+    before and after the search, while the time budget lasts. Jobs without a
+    duration, or longer than the working day, take a whole day.
+
+    Parameters:
+    - data: Input data containing jobs, resources and date range
+    - travel: Travel matrix over the jobs and resources; built if not given
+    - time_limit: Wall-clock budget in seconds
+    - max_iterations: Optional cap on the number of sampled moves
+    - balance_weight: Cost of one hour^2 of variance in resource hours, in km
+    - day_start: Start of the working day ("HH:MM")
+    - day_end: End of the working day ("HH:MM")
+    - seed: Seed for move sampling
+
+    Returns:
+    - Tuple of (Schedule with start_time/end_time filled, search statistics)
+    """
+    started = time.perf_counter()
+    jobs = data["jobs"]
+    resources = data["resources"]
+    initial = round_robin_with_skills_autoschedule(data)
+    calendar = initial.calendar
+    num_days = calendar.num_days
+    if travel is None:
+        travel = build_travel_matrix(jobs, resources)
+
+    start_minute = parse_minute(day_start)
+    capacity = daily_capacity(resources, parse_minute(day_end) - start_minute)
+    durations = [int(round(60 * (job.get("estimated_duration") or 0))) for job in jobs]
+    job_nodes = np.array([travel.job_node(job["id"]) for job in jobs], dtype=np.intp)
+    home_nodes = np.array([travel.home_node(res["id"]) for res in resources], dtype=np.intp)
+    routes = _Routes(np.asarray(travel.distance_km), job_nodes, home_nodes, capacity, durations, num_days)
+
+    skill_index = SkillIndex(resources)
+    job_masks = [skill_index.mask_for(job["required_skills"]) for job in jobs]
+    resource_masks = skill_index.resource_masks
+
+    def can_do(r: int, j: int) -> bool:
+        return resource_masks[r] & job_masks[j] == job_masks[j]
+
+    def fits(r: int, day: int, j: int) -> bool:
+        return routes.used[r][day] + routes.need(j, r) <= capacity[r]
+
+    for j, r, day in zip(initial.job_index, initial.resource_index, initial.day):
+        if fits(r, day, j):
+            routes.insert((r, day), j, len(routes.sequences.get((r, day), [])))
+
+    # Nearest other jobs, used to pick relocate and swap targets
+    if len(jobs) > 1:
+        job_distance = np.asarray(travel.distance_km)[np.ix_(job_nodes, job_nodes)]
+        k = min(NEIGHBORS, len(jobs) - 1)
+        nearest = np.argpartition(job_distance, k, axis=1)[:, :k + 1]
+        near = [[int(n) for n in row if n != j][:k] for j, row in enumerate(nearest)]
+    else:
+        near = [[] for _ in jobs]
+
+    num_resources = max(len(resources), 1)
+
+    def balance_delta(changes: Dict[int, int]) -> float:
+        # Change in balance_weight * variance of resource hours; the mean only moves with the total
+        if not balance_weight:
+            return 0.0
+        total = sum(routes.load)
+        new_total = total + sum(changes.values())
+        before = sum((routes.load[r] / 60) ** 2 for r in changes)
+        after = sum(((routes.load[r] + change) / 60) ** 2 for r, change in changes.items())
+        mean_before, mean_after = total / 60 / num_resources, new_total / 60 / num_resources
+        return balance_weight * ((after - before) / num_resources - mean_after ** 2 + mean_before ** 2)
+
+    def cost() -> float:
+        hours = np.array(routes.load, dtype=np.float64) / 60
+        return routes.total_km() + balance_weight * float(hours.var()) if len(hours) else routes.total_km()
+
+    def insert_unassigned() -> int:
+        # Each job scans every eligible (resource, day), so stop once the budget is spent
+        inserted = 0
+        for j in range(len(jobs)):
+            if j in routes.route_of:
+                continue
+            if time.perf_counter() >= deadline:
+                break
+            best = None
+            for r in skill_index.eligible_indices_for_mask(job_masks[j]):
+                for day in range(num_days):
+                    if not fits(r, day, j):
+                        continue
+                    delta, position = routes.best_insertion((r, day), j)
+                    delta += balance_delta({r: routes.need(j, r)})
+                    if best is None or delta < best[0]:
+                        best = (delta, (r, day), position)
+            if best is not None:
+                routes.insert(best[1], j, best[2])
+                inserted += 1
+        return inserted
+
+    def try_relocate(j: int) -> bool:
+        source = routes.route_of[j]
+        ra = source[0]
+        position = routes.sequences[source].index(j)
+        gain = routes.removal_delta(source, position)
+        targets = {routes.route_of[n] for n in near[j] if n in routes.route_of}
+        eligible = skill_index.eligible_indices_for_mask(job_masks[j])
+        if eligible and num_days:
+            targets.add((rng.choice(eligible), rng.randrange(num_days)))
+        best = None
+        for target in targets:
+            rb, day = target
+            if target == source or not can_do(rb, j) or not fits(rb, day, j):
+                continue
+            delta, insert_at = routes.best_insertion(target, j)
+            delta += gain
+            if rb != ra:
+                delta += balance_delta({ra: -routes.need(j, ra), rb: routes.need(j, rb)})
+            if best is None or delta < best[0]:
+                best = (delta, target, insert_at)
+        if best is None or best[0] >= -1e-9:
+            return False
+        routes.remove(j)
+        routes.insert(best[1], j, best[2])
+        return True
+
+    def try_swap(j: int) -> bool:
+        source = routes.route_of[j]
+        candidates = [routes.route_of[n] for n in near[j] if n in routes.route_of and routes.route_of[n] != source]
+        if not candidates:
+            return False
+        target = rng.choice(candidates)
+        other = rng.choice(routes.sequences[target])
+        ra, rb = source[0], target[0]
+        if not (can_do(rb, j) and can_do(ra, other)):
+            return False
+        need_j_a, need_j_b = routes.need(j, ra), routes.need(j, rb)
+        need_o_a, need_o_b = routes.need(other, ra), routes.need(other, rb)
+        if routes.used[ra][source[1]] - need_j_a + need_o_a > capacity[ra]:
+            return False
+        if routes.used[rb][target[1]] - need_o_b + need_j_b > capacity[rb]:
+            return False
+
+        sequence_a, sequence_b = routes.sequences[source], routes.sequences[target]
+        i, k = sequence_a.index(j), sequence_b.index(other)
+        node_j, node_o = job_nodes[j], job_nodes[other]
+        before_a, after_a = routes.node(sequence_a, i - 1, ra), routes.node(sequence_a, i + 1, ra)
+        before_b, after_b = routes.node(sequence_b, k - 1, rb), routes.node(sequence_b, k + 1, rb)
+        delta = (routes.leg(before_a, node_o) + routes.leg(node_o, after_a)
+                 - routes.leg(before_a, node_j) - routes.leg(node_j, after_a)
+                 + routes.leg(before_b, node_j) + routes.leg(node_j, after_b)
+                 - routes.leg(before_b, node_o) - routes.leg(node_o, after_b))
+        if ra != rb:
+            delta += balance_delta({ra: need_o_a - need_j_a, rb: need_j_b - need_o_b})
+        if delta >= -1e-9:
+            return False
+        routes.remove(j)
+        routes.remove(other)
+        routes.insert(source, other, i)
+        routes.insert(target, j, k)
+        return True
+
+    def try_route_swap(j: int) -> bool:
+        source = routes.route_of[j]
+        ra = source[0]
+        eligible = skill_index.eligible_indices_for_mask(job_masks[j])
+        rb = rng.choice(eligible)
+        if rb == ra:
+            return False
+        target = (rb, source[1] if rng.random() < 0.5 else rng.randrange(num_days))
+        sequence_a = routes.sequences[source]
+        sequence_b = routes.sequences.get(target, [])
+        if not all(can_do(rb, n) for n in sequence_a) or not all(can_do(ra, n) for n in sequence_b):
+            return False
+        load_a = sum(routes.need(n, rb) for n in sequence_a)
+        load_b = sum(routes.need(n, ra) for n in sequence_b)
+        if load_a > capacity[rb] or load_b > capacity[ra]:
+            return False
+        delta = (routes.route_km(rb, sequence_a) + routes.route_km(ra, sequence_b)
+                 - routes.route_km(ra, sequence_a) - routes.route_km(rb, sequence_b))
+        delta += balance_delta({ra: load_b - routes.used[ra][source[1]], rb: load_a - routes.used[rb][target[1]]})
+        if delta >= -1e-9:
+            return False
+        sequence_a, sequence_b = list(sequence_a), list(sequence_b)
+        for n in sequence_a + sequence_b:
+            routes.remove(n)
+        for position, n in enumerate(sequence_b):
+            routes.insert(source, n, position)
+        for position, n in enumerate(sequence_a):
+            routes.insert(target, n, position)
+        return True
+
+    def try_two_opt(j: int) -> bool:
+        key = routes.route_of[j]
+        r = key[0]
+        sequence = routes.sequences[key]
+        best = None
+        for i in range(len(sequence) - 1):
+            before = routes.node(sequence, i - 1, r)
+            first = job_nodes[sequence[i]]
+            for k in range(i + 1, len(sequence)):
+                last = job_nodes[sequence[k]]
+                after = routes.node(sequence, k + 1, r)
+                delta = (routes.leg(before, last) + routes.leg(first, after)
+                         - routes.leg(before, first) - routes.leg(last, after))
+                if best is None or delta < best[0]:
+                    best = (delta, i, k)
+        if best is None or best[0] >= -1e-9:
+            return False
+        _, i, k = best
+        sequence[i:k + 1] = sequence[i:k + 1][::-1]
+        return True
+
+    moves = {"relocate": try_relocate, "swap": try_swap, "route_swap": try_route_swap, "two_opt": try_two_opt}
+    move_names = list(MOVE_WEIGHTS)
+    move_weights = [MOVE_WEIGHTS[name] for name in move_names]
+    rng = random.Random(seed)
+
+    instrumentation = current_instrumentation()
+    initial_km = routes.total_km()
+    initial_cost = cost()
+    deadline = started + time_limit
+    inserted = insert_unassigned()
+    accepted = dict.fromkeys(move_names, 0)
+    iterations = 0
+    with instrumentation.phase("search"):
+        while routes.route_of and (max_iterations is None or iterations < max_iterations):
+            if iterations % 256 == 0 and time.perf_counter() >= deadline:
+                break
+            iterations += 1
+            j = rng.randrange(len(jobs))
+            if j not in routes.route_of:
+                continue
+            name = rng.choices(move_names, move_weights)[0]
+            if moves[name](j):
+                accepted[name] += 1
+    inserted += insert_unassigned()
+
+    # Walk each route to lay the jobs out back to back from the start of the day
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
+    slots = {}
+    for (r, day), sequence in routes.sequences.items():
+        clock = start_minute
+        for j in sequence:
+            minutes = routes.need(j, r)
+            slots[j] = (r, day, clock, clock + minutes)
+            clock += minutes
+    for j in range(len(jobs)):
+        if j in slots:
+            r, day, start, end = slots[j]
+            job_schedule.append(j, r, day, day, start, end)
+        else:
+            job_schedule.skip(j, SKIP_NO_AVAILABILITY if skill_index.eligible_indices_for_mask(job_masks[j])
+                              else SKIP_NO_ELIGIBLE_RESOURCES)
+
+    stats = {
+        "iterations": iterations,
+        "accepted": accepted,
+        "inserted": inserted,
+        "unassigned": len(jobs) - len(job_schedule),
+        "initial_travel_km": initial_km,
+        "travel_km": routes.total_km(),
+        "initial_cost": initial_cost,
+        "cost": cost(),
+        "wall_time": time.perf_counter() - started,
+    }
+    instrumentation.record("local_search", **{key: value for key, value in stats.items() if key != "accepted"},
+                           **{f"accepted_{name}": count for name, count in accepted.items()})
+    return job_schedule, stats
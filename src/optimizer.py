@@ -0,0 +1,128 @@
+from typing import Dict, Optional, Tuple
+
+from ortools.sat.python import cp_model
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.utils.cp_sat import configure_solver, solver_stats
+from src.utils.instrumentation import current_instrumentation, instrumented
+from src.utils.schedule import SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES, Schedule
+from src.utils.skill_index import SkillIndex
+
+@instrumented("optimized")
+def optimized_autoschedule(data: Dict,
+                           time_limit: float = 30.0,
+                           num_workers: Optional[int] = None,
+                           relative_gap: Optional[float] = 0.01,
+                           skill_index: Optional[SkillIndex] = None) -> Tuple[Schedule, Dict]:
+    """
+    Schedule jobs with CP-SAT, warm-started from the round-robin with skills heuristic.
+
+    The heuristic runs first and its assignment is passed to the solver as a
+    solution hint, so the solver starts from a complete schedule and only has to
+    improve on it. Like the heuristic, each resource does at most one job per day.
+    Days are otherwise interchangeable and so are jobs with the same required
+    skills, so the model only decides how many jobs of each skill group every
+    resource does; jobs and days are handed out afterwards in job order.
+
+    The objective maximizes the number of scheduled jobs, then minimizes the
+    largest number of jobs given to a single resource.
+
+    Parameters:
+    - data: Input data containing jobs, resources and date range
+    - time_limit: Wall-clock budget in seconds
+    - num_workers: Parallel search workers; defaults to the number of CPUs
+    - relative_gap: Stop early once the solution is within this relative gap
+    - skill_index: SkillIndex over data["resources"] to reuse, e.g. kept warm between runs
+
+    Returns:
+    - Tuple of (Schedule, solver statistics). If the solver finds nothing better
+      than the heuristic within the budget, the heuristic schedule is returned.
+    """
+    jobs = data["jobs"]
+    resources = data["resources"]
+    if skill_index is None:
+        skill_index = SkillIndex(resources)
+    heuristic = round_robin_with_skills_autoschedule(data, skill_index)
+    calendar = heuristic.calendar
+    num_days = calendar.num_days
+
+    # Jobs with the same required-skill mask are interchangeable, so the model decides
+    # how many jobs of each skill group every resource does rather than which ones
+    group_of_job = [skill_index.mask_for(job["required_skills"]) for job in jobs]
+    group_sizes = {}
+    for mask in group_of_job:
+        group_sizes[mask] = group_sizes.get(mask, 0) + 1
+
+    model = cp_model.CpModel()
+    counts = {}  # counts[mask, r] = number of jobs of skill group `mask` done by resource r
+    by_resource = [[] for _ in resources]
+    for mask, size in group_sizes.items():
+        options = []
+        for r in skill_index.eligible_indices_for_mask(mask):
+            count = counts[mask, r] = model.NewIntVar(0, min(size, num_days), f"n_{mask}_{r}")
+            options.append(count)
+            by_resource[r].append(count)
+        if options:
+            model.Add(sum(options) <= size)
+
+    max_load = model.NewIntVar(0, num_days, "max_load")
+    for resource_counts in by_resource:
+        if resource_counts:
+            model.Add(sum(resource_counts) <= max_load)
+
+    # One more scheduled job always outweighs any change in the largest load
+    model.Maximize((num_days + 1) * sum(counts.values()) - max_load)
+
+    # Warm start from the heuristic's assignment; the hint covers every variable
+    hinted = {}
+    loads = [0] * len(resources)
+    for j, r in zip(heuristic.job_index, heuristic.resource_index):
+        hinted[group_of_job[j], r] = hinted.get((group_of_job[j], r), 0) + 1
+        loads[r] += 1
+    for key, count in counts.items():
+        model.AddHint(count, hinted.get(key, 0))
+    model.AddHint(max_load, max(loads, default=0))
+
+    instrumentation = current_instrumentation()
+    solver = configure_solver(cp_model.CpSolver(), time_limit, num_workers, relative_gap)
+    with instrumentation.phase("solve"):
+        status = solver.Solve(model)
+    stats = solver_stats(solver, status)
+    stats["heuristic_scheduled"] = len(heuristic)
+    instrumentation.record("solver", algorithm="optimized", **stats)
+
+    # A solve cut short by the budget (or the gap limit) can be worse than its own hint
+    heuristic_objective = (num_days + 1) * len(heuristic) - max(loads, default=0)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) or solver.ObjectiveValue() < heuristic_objective:
+        stats["scheduled"] = len(heuristic)
+        return heuristic, stats
+
+    # Hand out each group's resource slots to its jobs in job order, cycling over the
+    # resources like the heuristic does, and give each resource consecutive days
+    slots = {}
+    for (mask, r), count in counts.items():
+        value = solver.Value(count)
+        if value:
+            slots.setdefault(mask, []).append([r, value])
+    pointers = dict.fromkeys(slots, 0)
+    next_free = [0] * len(resources)
+    job_schedule = Schedule(heuristic.job_ids, heuristic.resource_ids, calendar)
+    for j, mask in enumerate(group_of_job):
+        group_slots = slots.get(mask)
+        if not group_slots:
+            job_schedule.skip(j, SKIP_NO_AVAILABILITY if skill_index.eligible_indices_for_mask(mask)
+                              else SKIP_NO_ELIGIBLE_RESOURCES)
+            continue
+        position = pointers[mask] % len(group_slots)
+        slot = group_slots[position]
+        r = slot[0]
+        job_schedule.append(j, r, next_free[r])
+        next_free[r] += 1
+        slot[1] -= 1
+        if slot[1]:
+            pointers[mask] = position + 1
+        else:
+            del group_slots[position]
+            pointers[mask] = position
+    stats["scheduled"] = len(job_schedule)
+    return job_schedule, stats
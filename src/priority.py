@@ -0,0 +1,211 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from ortools.sat.python import cp_model
+
+from src.utils.bitmap import AvailabilityBitmap
+from src.utils.cp_sat import configure_solver, solver_stats
+from src.utils.dates import DayCalendar
+from src.utils.instrumentation import current_instrumentation, instrumented
+from src.utils.schedule import (SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES, SKIP_NOT_ENOUGH_RESOURCES,
+                                Schedule)
+from src.utils.skill_index import SkillIndex
+
+def priority_rank(job: Dict) -> int:
+    """
+    Return a job's priority tier (1 is scheduled first).
+
+    Uses the job's priority_rank when set, otherwise the sprint-D decision rules:
+    high priority is rank 1, high customer priority is rank 2, anything else rank 3.
+    """
+    if job.get("priority_rank") is not None:
+        return job["priority_rank"]
+    if job.get("priority") == "high":
+        return 1
+    if job.get("customer_priority") == "high":
+        return 2
+    return 3
+
+def _set_domain(model: cp_model.CpModel, var: cp_model.IntVar, low: int, high: int) -> None:
+    # Restrict a variable in place, so later solves of the same model see the new bounds
+    domain = model.Proto().variables[var.Index()].domain
+    domain[0] = low
+    domain[1] = high
+
+@instrumented("priority")
+def priority_autoschedule(data: Dict,
+                          time_limit: float = 30.0,
+                          num_workers: Optional[int] = None,
+                          relative_gap: Optional[float] = None) -> Tuple[Schedule, Dict]:
+    """
+    Schedule jobs tier by tier in priority order with one reusable CP-SAT model.
+
+    The model is built once for all jobs. Each job is placed on at most one day
+    with resource_count skill-eligible resources (variables only exist for
+    eligible resource/job pairs), and each resource does at most one job per day.
+    Tiers are then solved in rank order. Jobs of tiers not solved yet are held
+    out by fixing their day variables to 0. Once a tier is solved its
+    assignment is fixed through the variable domains, so the capacity it uses
+    carries into the lower tiers without rebuilding the model.
+
+    Each tier maximizes its number of scheduled jobs, then minimizes the sum of
+    cost_per_day of the resources used. The tiers share one time budget: each
+    gets the remaining time in proportion to its share of the remaining jobs, so
+    time a tier does not use goes to the next ones. Every tier is hinted with a
+    greedy earliest-day crew assignment, which is also kept if the solver finds
+    nothing better within the tier's budget.
+
+    Parameters:
+    - data: Input data containing jobs (with priority/customer_priority or
+            priority_rank, and optional resource_count), resources (with optional
+            cost_per_day) and date range
+    - time_limit: Wall-clock budget in seconds for all tiers together
+    - num_workers: Parallel search workers; defaults to the number of CPUs
+    - relative_gap: Stop each tier early once it is within this relative gap
+
+    Returns:
+    - Tuple of (Schedule with one row per (job, crew member), stats with one entry
+      per tier, the infeasible job ids and the total cost)
+    """
+    started = time.perf_counter()
+    instrumentation = current_instrumentation()
+    jobs = data["jobs"]
+    resources = data["resources"]
+    calendar = DayCalendar(data["date_range"])
+    num_days = calendar.num_days
+    skill_index = SkillIndex(resources)
+    costs = [int(res.get("cost_per_day") or 0) for res in resources]
+
+    # Like filter_infeasible_jobs: drop jobs that can never get a full crew
+    eligible = {}
+    infeasible = {}  # job position -> skip reason
+    for j, job in enumerate(jobs):
+        candidates = skill_index.eligible_indices(job["required_skills"])
+        if not candidates:
+            infeasible[j] = SKIP_NO_ELIGIBLE_RESOURCES
+        elif len(candidates) < (job.get("resource_count") or 1):
+            infeasible[j] = SKIP_NOT_ENOUGH_RESOURCES
+        elif not num_days:
+            infeasible[j] = SKIP_NO_AVAILABILITY
+        else:
+            eligible[j] = candidates
+
+    model = cp_model.CpModel()
+    x = {}  # x[r, j, d] = 1 if resource r works on job j on day d
+    y = {}  # y[j, d] = 1 if job j is done on day d
+    by_slot = {}
+    for j, candidates in eligible.items():
+        crew_size = jobs[j].get("resource_count") or 1
+        for d in range(num_days):
+            y[j, d] = model.NewBoolVar(f"y_{j}_{d}")
+            crew = []
+            for r in candidates:
+                x[r, j, d] = model.NewBoolVar(f"x_{r}_{j}_{d}")
+                crew.append(x[r, j, d])
+                by_slot.setdefault((r, d), []).append(x[r, j, d])
+            model.Add(sum(crew) == crew_size * y[j, d])
+            # Held out until its tier is solved
+            _set_domain(model, y[j, d], 0, 0)
+        model.AddAtMostOne(y[j, d] for d in range(num_days))
+    for slot_vars in by_slot.values():
+        model.AddAtMostOne(slot_vars)
+
+    tiers = {}
+    for j in eligible:
+        tiers.setdefault(priority_rank(jobs[j]), []).append(j)
+
+    booked = AvailabilityBitmap(len(resources), num_days)
+    crews = {}  # job position -> (day, crew resource positions)
+    tier_stats = []
+    remaining_jobs = len(eligible)
+    deadline = started + time_limit
+    for rank in sorted(tiers):
+        tier_jobs = tiers[rank]
+        budget = max(deadline - time.perf_counter(), 0.0) * len(tier_jobs) / remaining_jobs
+        remaining_jobs -= len(tier_jobs)
+
+        # Greedy earliest-day crews on top of the tiers above, used as hint and fallback
+        greedy = {}
+        for j in tier_jobs:
+            mask = booked.pack(eligible[j])
+            crew_size = jobs[j].get("resource_count") or 1
+            day = booked.earliest_day(mask, crew_size)
+            if day is not None:
+                crew = booked.free_resources(mask, day)[:crew_size]
+                booked.book(crew, day)
+                greedy[j] = (day, [int(r) for r in crew])
+
+        model.ClearHints()
+        max_cost = 0
+        for j in tier_jobs:
+            max_cost += (jobs[j].get("resource_count") or 1) * max((costs[r] for r in eligible[j]), default=0)
+            chosen = greedy.get(j)
+            for d in range(num_days):
+                _set_domain(model, y[j, d], 0, 1)
+                model.AddHint(y[j, d], chosen is not None and chosen[0] == d)
+                for r in eligible[j]:
+                    model.AddHint(x[r, j, d], chosen is not None and chosen[0] == d and r in chosen[1])
+
+        # One more scheduled job always outweighs any saving in cost
+        model.ClearObjective()
+        model.Maximize((max_cost + 1) * sum(y[j, d] for j in tier_jobs for d in range(num_days))
+                       - sum(costs[r] * x[r, j, d] for j in tier_jobs for d in range(num_days)
+                             for r in eligible[j]))
+
+        solver = configure_solver(cp_model.CpSolver(), budget, num_workers, relative_gap)
+        with instrumentation.phase("solve"):
+            status = solver.Solve(model)
+        stats = solver_stats(solver, status)
+        stats["rank"] = rank
+        stats["jobs"] = len(tier_jobs)
+
+        stats["greedy_scheduled"] = len(greedy)
+        greedy_objective = (max_cost + 1) * len(greedy) - sum(costs[r] for _, crew in greedy.values() for r in crew)
+        # A solution cut short by the budget (or the gap limit) can be worse than its own hint
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) and solver.ObjectiveValue() >= greedy_objective:
+            solution = {}
+            for j in tier_jobs:
+                for d in range(num_days):
+                    if solver.Value(y[j, d]):
+                        solution[j] = (d, [r for r in eligible[j] if solver.Value(x[r, j, d])])
+        else:
+            solution = greedy
+
+        # Fix the tier so its capacity carries into the lower tiers
+        for j in tier_jobs:
+            chosen = solution.get(j)
+            for d in range(num_days):
+                on_day = chosen is not None and chosen[0] == d
+                _set_domain(model, y[j, d], int(on_day), int(on_day))
+                for r in eligible[j]:
+                    value = int(on_day and r in chosen[1])
+                    _set_domain(model, x[r, j, d], value, value)
+        crews.update(solution)
+        stats["scheduled"] = len(solution)
+        instrumentation.record("solver", algorithm="priority", **stats)
+
+        # Rebuild the booked bitmap from the fixed assignments
+        booked = AvailabilityBitmap(len(resources), num_days)
+        for day, crew in crews.values():
+            booked.book(crew, day)
+        tier_stats.append(stats)
+
+    job_schedule = Schedule([job["id"] for job in jobs], [res["id"] for res in resources], calendar)
+    total_cost = 0
+    for j in range(len(jobs)):
+        if j in crews:
+            day, crew = crews[j]
+            for r in crew:
+                job_schedule.append(j, r, day)
+                total_cost += costs[r]
+        else:
+            job_schedule.skip(j, infeasible.get(j, SKIP_NO_AVAILABILITY))
+
+    stats = {
+        "tiers": tier_stats,
+        "infeasible": [jobs[j]["id"] for j in infeasible],
+        "scheduled": len(crews),
+        "cost": total_cost,
+        "wall_time": time.perf_counter() - started,
+    }
+    return job_schedule, stats
@@ -0,0 +1,209 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from src.utils.cp_sat import configure_solver, solver_stats
+from src.utils.instrumentation import current_instrumentation
+from src.utils.skill_index import SkillIndex
+from src.utils.travel import TravelMatrix, build_travel_matrix
+
+# Defaults for jobs without an estimated duration and resources without a daily limit
+DEFAULT_JOB_HOURS = 1.0
+DEFAULT_MAX_HOURS = 8.0
+
+# Objective coefficients are scaled to integers with this factor
+OBJECTIVE_SCALE = 100
+
+def solve_routing(jobs: List[Dict],
+                  resources: List[Dict],
+                  travel: Optional[TravelMatrix] = None,
+                  max_arc_km: Optional[float] = None,
+                  max_neighbors: Optional[int] = 10,
+                  distance_weight: float = 1.0,
+                  time_limit: float = 30.0,
+                  num_workers: Optional[int] = None,
+                  relative_gap: Optional[float] = None,
+                  hint: Optional[Dict] = None) -> Dict:
+    """
+    Assign and sequence one day of jobs for each technician with CP-SAT.
+
+    Each technician gets a circuit over their home base and the jobs they are
+    skill-compatible with. Jobs are optional nodes of the circuit (a self-loop
+    means "not visited by this technician"), so the model only grows with the
+    compatible (technician, job) pairs and the arcs kept between them. An arc from one job
+    to another is only created if the second job is among the `max_neighbors`
+    nearest candidates of the first, is at most `max_arc_km` away, and both fit
+    in the technician's day together.
+
+    Jobs have no time windows, so the working day is a single constraint per
+    technician: job durations plus drive time along the chosen arcs must fit in
+    max_hours. Start times are derived afterwards by walking each route.
+
+    The objective maximizes minutes of work assigned minus `distance_weight`
+    minutes for each kilometre driven; jobs that do not fit are left unassigned.
+
+    Parameters:
+    - jobs: Job dictionaries with id, required_skills, estimated_duration (hours),
+            latitude and longitude
+    - resources: Resource dictionaries with id, skills, latitude/longitude of the
+                 home base and optional max_hours
+    - travel: Travel matrix over these jobs and resources; built if not given
+    - max_arc_km: Maximum distance between two consecutive jobs, or None for no limit
+    - max_neighbors: Number of nearest jobs each job keeps arcs to, or None for no limit
+    - distance_weight: Minutes of work one kilometre of travel is worth
+    - time_limit: Wall-clock budget in seconds
+    - num_workers: Parallel search workers; defaults to the number of CPUs
+    - relative_gap: Stop early once the solution is within this relative gap
+    - hint: Warm-start assignment (job id -> resource id), e.g. one day of
+            round_robin_with_skills_autoschedule output
+
+    Returns:
+    - Dictionary with status, objective, assignments (job id -> resource id),
+      routes (resource id -> ordered job ids), schedule (job id -> start minute
+      from the start of the day), unassigned job ids and solver stats
+    """
+    if travel is None:
+        travel = build_travel_matrix(jobs, resources)
+    model = cp_model.CpModel()
+
+    durations = [int(round(60 * (job.get("estimated_duration") or DEFAULT_JOB_HOURS))) for job in jobs]
+    job_nodes = [travel.job_node(job["id"]) for job in jobs]
+    distance = np.asarray(travel.distance_km)
+    minutes = np.rint(travel.drive_minutes()).astype(np.int64)
+
+    skill_index = SkillIndex(resources)
+    eligible_jobs = [[] for _ in resources]
+    for j, job in enumerate(jobs):
+        for t in skill_index.eligible_indices(job["required_skills"]):
+            eligible_jobs[t].append(j)
+
+    assigned = {}      # assigned[t, j] = 1 if technician t does job j
+    arcs = {}          # arcs[t, i, j] = 1 if technician t goes from job i to job j
+    leave_arcs = {}    # leave_arcs[t, j] = 1 if technician t starts the day with job j
+    objective_terms = []
+
+    for t, res in enumerate(resources):
+        day_minutes = int(round(60 * (res.get("max_hours") or DEFAULT_MAX_HOURS)))
+        home = travel.home_node(res["id"])
+
+        # Only keep jobs that fit in the day on their own, including the round trip
+        candidates = [
+            j for j in eligible_jobs[t]
+            if minutes[home, job_nodes[j]] + durations[j] + minutes[job_nodes[j], home] <= day_minutes
+        ]
+        if not candidates:
+            continue
+
+        # Node 0 is the home base, node k + 1 is candidates[k]
+        circuit = []
+        idle = model.NewBoolVar(f"idle_{t}")
+        circuit.append((0, 0, idle))
+        day_terms = []
+        for k, j in enumerate(candidates):
+            node = job_nodes[j]
+            x = assigned[t, j] = model.NewBoolVar(f"x_{t}_{j}")
+            model.AddImplication(x, idle.Not())
+            circuit.append((k + 1, k + 1, x.Not()))
+            day_terms.append(durations[j] * x)
+
+            leave = leave_arcs[t, j] = model.NewBoolVar(f"leave_{t}_{j}")
+            circuit.append((0, k + 1, leave))
+            day_terms.append(int(minutes[home, node]) * leave)
+            back = model.NewBoolVar(f"back_{t}_{j}")
+            circuit.append((k + 1, 0, back))
+            day_terms.append(int(minutes[node, home]) * back)
+
+            objective_terms.append(OBJECTIVE_SCALE * durations[j] * x)
+            objective_terms.append(-int(round(OBJECTIVE_SCALE * distance_weight * distance[home, node])) * leave)
+            objective_terms.append(-int(round(OBJECTIVE_SCALE * distance_weight * distance[node, home])) * back)
+
+        candidate_nodes = np.array([job_nodes[j] for j in candidates])
+        candidate_distance = distance[np.ix_(candidate_nodes, candidate_nodes)]
+        if max_neighbors is not None and max_neighbors + 1 < len(candidates):
+            # Keep arcs to the nearest neighbours only (column 0 of the ranking is the job itself)
+            nearest = np.argsort(candidate_distance, axis=1, kind="stable")[:, :max_neighbors + 1]
+        else:
+            nearest = np.broadcast_to(np.arange(len(candidates)), candidate_distance.shape)
+
+        for a, i in enumerate(candidates):
+            node_i = job_nodes[i]
+            for b in nearest[a]:
+                if a == b:
+                    continue
+                j = candidates[b]
+                node_j = job_nodes[j]
+                if max_arc_km is not None and candidate_distance[a, b] > max_arc_km:
+                    continue
+                if (minutes[home, node_i] + durations[i] + minutes[node_i, node_j] + durations[j]
+                        + minutes[node_j, home] > day_minutes):
+                    continue
+                arc = arcs[t, i, j] = model.NewBoolVar(f"arc_{t}_{i}_{j}")
+                circuit.append((a + 1, int(b) + 1, arc))
+                day_terms.append(int(minutes[node_i, node_j]) * arc)
+                objective_terms.append(-int(round(OBJECTIVE_SCALE * distance_weight * candidate_distance[a, b])) * arc)
+
+        model.AddCircuit(circuit)
+        model.Add(sum(day_terms) <= day_minutes)
+
+    # Each job is done by at most one technician
+    by_job = {}
+    for (t, j), x in assigned.items():
+        by_job.setdefault(j, []).append(x)
+    for xs in by_job.values():
+        model.AddAtMostOne(xs)
+
+    model.Maximize(sum(objective_terms))
+
+    if hint:
+        for (t, j), x in assigned.items():
+            model.AddHint(x, hint.get(jobs[j]["id"]) == resources[t]["id"])
+
+    solver = configure_solver(cp_model.CpSolver(), time_limit, num_workers, relative_gap)
+    # The LP relaxation of many large circuits is expensive and rarely pays off within short budgets
+    solver.parameters.linearization_level = 0
+    instrumentation = current_instrumentation()
+    with instrumentation.phase("routing/solve"):
+        status = solver.Solve(model)
+    stats = solver_stats(solver, status)
+    instrumentation.record("solver", algorithm="routing", **stats)
+
+    solution = {
+        "status": solver.StatusName(status),
+        "objective": None,
+        "assignments": {},
+        "routes": {},
+        "schedule": {},
+        "unassigned": [],
+        "stats": stats,
+    }
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        solution["unassigned"] = [job["id"] for job in jobs]
+        return solution
+
+    solution["objective"] = solver.ObjectiveValue() / OBJECTIVE_SCALE
+    successors = {}
+    for (t, i, j), arc in arcs.items():
+        if solver.Value(arc):
+            successors[t, i] = j
+    for (t, j), x in assigned.items():
+        if solver.Value(x):
+            solution["assignments"][jobs[j]["id"]] = resources[t]["id"]
+
+    for t, res in enumerate(resources):
+        current = next((j for j in eligible_jobs[t] if (t, j) in leave_arcs and solver.Value(leave_arcs[t, j])),
+                       None)
+        route = []
+        clock = 0
+        node = travel.home_node(res["id"])
+        while current is not None:
+            clock += int(minutes[node, job_nodes[current]])
+            solution["schedule"][jobs[current]["id"]] = clock
+            clock += durations[current]
+            node = job_nodes[current]
+            route.append(jobs[current]["id"])
+            current = successors.get((t, current))
+        solution["routes"][res["id"]] = route
+
+    solution["unassigned"] = [job["id"] for job in jobs if job["id"] not in solution["assignments"]]
+    return solution
@@ -0,0 +1,263 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.availability import RoundRobinQueue, first_free_day
+from src.utils.dates import DayCalendar
+from src.utils.schedule import Schedule, make_event, make_event_assignment
+from src.utils.skill_index import SkillIndex
+
+
+class Scheduler:
+    """
+    Stateful round-robin with skills scheduler for incremental updates.
+
+    Keeps the booked days of every resource, the round-robin queue of every
+    skill group and the current assignments, so jobs can be added, cancelled
+    and moved without rebuilding the whole schedule. Adding jobs one by one in
+    order gives the same schedule as `round_robin_with_skills_autoschedule`.
+
+    Every operation returns the list of changed events, each a dictionary with
+    an "action" ("create", "update" or "delete") plus the "event" and
+    "event_assignment" in export format. Updates also carry the "previous"
+    resource_id and start_date.
+
+    Parameters:
+    - resources: Resource dictionaries with id and skills
+    - date_range: Dictionary with start_date and end_date ("YYYY-MM-DD")
+    """
+
+    def __init__(self, resources: List[Dict], date_range: Dict):
+        self.calendar = DayCalendar(date_range)
+        if self.calendar.end_date < self.calendar.start_date:
+            raise ValueError("End date cannot be before start date")
+        self.resources = resources
+        self.resource_ids = [res["id"] for res in resources]
+        self.skill_index = SkillIndex(resources)
+        self._resource_position = {res_id: r for r, res_id in enumerate(self.resource_ids)}
+        self._booked = [0] * len(resources)     # bitmask of booked days per resource
+        self._next_free = [0] * len(resources)  # lowest free day per resource
+        self._queues: Dict[int, RoundRobinQueue] = {}
+        self._jobs: Dict = {}                   # job id -> job, in arrival order
+        self._assignments: Dict = {}            # job id -> (resource position, day)
+
+    @classmethod
+    def from_data(cls, data: Dict) -> "Scheduler":
+        """
+        Build a scheduler from batch input data and add its jobs in order.
+        """
+        scheduler = cls(data["resources"], data["date_range"])
+        for job in data["jobs"]:
+            scheduler.add_job(job)
+        return scheduler
+
+    @property
+    def unassigned(self) -> List:
+        """Ids of the jobs that could not be scheduled, in arrival order."""
+        return [job_id for job_id in self._jobs if job_id not in self._assignments]
+
+    def assignment(self, job_id) -> Optional[Tuple]:
+        """
+        Return the (resource id, "YYYY-MM-DD" date) of a job, or None if it is unassigned.
+        """
+        if job_id not in self._jobs:
+            raise ValueError(f"Unknown job: {job_id}")
+        slot = self._assignments.get(job_id)
+        if slot is None:
+            return None
+        return self.resource_ids[slot[0]], self.calendar.iso(slot[1])
+
+    def schedule(self) -> Schedule:
+        """
+        Return the current assignments as a Schedule, in job arrival order.
+        """
+        job_ids = list(self._jobs)
+        job_schedule = Schedule(job_ids, self.resource_ids, self.calendar)
+        for job_index, job_id in enumerate(job_ids):
+            slot = self._assignments.get(job_id)
+            if slot is not None:
+                job_schedule.append(job_index, slot[0], slot[1])
+        return job_schedule
+
+    def add_job(self, job: Dict) -> List[Dict]:
+        """
+        Schedule a new job on the next eligible resource in round-robin order.
+
+        Jobs that cannot be placed are kept as unassigned and retried by
+        `schedule_unassigned` and `extend_date_range`.
+
+        Parameters:
+        - job: Job dictionary with id and required_skills
+
+        Returns:
+        - List of changed events
+        """
+        job_id = job["id"]
+        if job_id in self._jobs:
+            raise ValueError(f"Job {job_id} already exists")
+        self._jobs[job_id] = job
+        return self._place(job_id)
+
+    def cancel_job(self, job_id) -> List[Dict]:
+        """
+        Remove a job and free its day.
+
+        Parameters:
+        - job_id: Id of the job to cancel
+
+        Returns:
+        - List of changed events
+        """
+        if job_id not in self._jobs:
+            raise ValueError(f"Unknown job: {job_id}")
+        del self._jobs[job_id]
+        slot = self._assignments.pop(job_id, None)
+        if slot is None:
+            return []
+        self._release(*slot)
+        return [self._change("delete", job_id, *slot)]
+
+    def reassign(self, job_id, resource_id=None, date: Optional[str] = None) -> List[Dict]:
+        """
+        Move a job to another resource and/or day.
+
+        Without a resource the job goes to the next eligible resource in
+        round-robin order (free on `date` if given); without a date it goes to
+        the resource's first free day.
+
+        Parameters:
+        - job_id: Id of the job to move
+        - resource_id: Target resource id, or None to pick one
+        - date: Target "YYYY-MM-DD" date, or None for the first free day
+
+        Returns:
+        - List of changed events (empty if the job stays where it is)
+        """
+        if job_id not in self._jobs:
+            raise ValueError(f"Unknown job: {job_id}")
+        previous = self._assignments.pop(job_id, None)
+        if previous is not None:
+            self._release(*previous)
+
+        try:
+            slot = self._target_slot(job_id, resource_id, date)
+        except ValueError:
+            if previous is not None:
+                self._book(job_id, *previous)
+            raise
+        if slot is None:
+            # Nowhere to go; leave the job where it was
+            if previous is not None:
+                self._book(job_id, *previous)
+            return []
+
+        self._book(job_id, *slot)
+        if previous is None:
+            return [self._change("create", job_id, *slot)]
+        if slot == previous:
+            return []
+        return [self._change("update", job_id, *slot, previous=previous)]
+
+    def extend_date_range(self, end_date: str) -> List[Dict]:
+        """
+        Move the end of the date range later and schedule unassigned jobs into the new days.
+
+        Parameters:
+        - end_date: New end date ("YYYY-MM-DD"), not before the current one
+
+        Returns:
+        - List of changed events
+        """
+        calendar = DayCalendar({"start_date": self.calendar.start_date.isoformat(), "end_date": end_date})
+        if calendar.end_date < self.calendar.end_date:
+            raise ValueError("The date range can only be extended")
+        self.calendar = calendar
+        # Resources that were booked up have room again
+        for queue in self._queues.values():
+            queue.reset()
+        return self.schedule_unassigned()
+
+    def schedule_unassigned(self) -> List[Dict]:
+        """
+        Retry the unassigned jobs in arrival order, e.g. after cancellations freed some days.
+
+        Returns:
+        - List of changed events
+        """
+        changes = []
+        for job_id in self.unassigned:
+            changes.extend(self._place(job_id))
+        return changes
+
+    def _queue(self, mask: int) -> RoundRobinQueue:
+        queue = self._queues.get(mask)
+        if queue is None:
+            queue = self._queues[mask] = RoundRobinQueue(self.skill_index.eligible_indices_for_mask(mask))
+        return queue
+
+    def _place(self, job_id) -> List[Dict]:
+        mask = self.skill_index.mask_for(self._jobs[job_id]["required_skills"])
+        r = self._queue(mask).next_available(self._next_free, self.calendar.last_day)
+        if r is None:
+            return []
+        day = self._next_free[r]
+        self._book(job_id, r, day)
+        return [self._change("create", job_id, r, day)]
+
+    def _target_slot(self, job_id, resource_id, date: Optional[str]) -> Optional[Tuple[int, int]]:
+        mask = self.skill_index.mask_for(self._jobs[job_id]["required_skills"])
+        last_day = self.calendar.last_day
+        day = None
+        if date is not None:
+            day = self.calendar.day_of(date)
+            if not 0 <= day <= last_day:
+                raise ValueError(f"Date {date} is outside the date range")
+
+        if resource_id is None:
+            if day is None:
+                r = self._queue(mask).next_available(self._next_free, last_day)
+                return None if r is None else (r, self._next_free[r])
+            r = self._queue(mask).next_free_on(self._booked, day)
+            return None if r is None else (r, day)
+
+        r = self._resource_position.get(resource_id)
+        if r is None:
+            raise ValueError(f"Unknown resource: {resource_id}")
+        if self.skill_index.resource_masks[r] & mask != mask:
+            raise ValueError(f"Resource {resource_id} lacks the skills for job {job_id}")
+        if day is None:
+            day = self._next_free[r]
+            if day > last_day:
+                raise ValueError(f"Resource {resource_id} is booked up")
+        elif self._booked[r] >> day & 1:
+            raise ValueError(f"Resource {resource_id} is already booked on {date}")
+        return r, day
+
+    def _book(self, job_id, r: int, day: int) -> None:
+        self._assignments[job_id] = (r, day)
+        self._booked[r] |= 1 << day
+        if day == self._next_free[r]:
+            self._next_free[r] = first_free_day(self._booked[r])
+
+    def _release(self, r: int, day: int) -> None:
+        booked_up = self._next_free[r] > self.calendar.last_day
+        self._booked[r] &= ~(1 << day)
+        self._next_free[r] = min(self._next_free[r], day)
+        if booked_up:
+            # The resource dropped out of its skill groups' queues; bring it back
+            resource_mask = self.skill_index.resource_masks[r]
+            for mask, queue in self._queues.items():
+                if resource_mask & mask == mask:
+                    queue.reset()
+
+    def _change(self, action: str, job_id, r: int, day: int, previous: Optional[Tuple] = None) -> Dict:
+        iso_date = self.calendar.iso(day)
+        change = {
+            "action": action,
+            "event": make_event(job_id, iso_date, iso_date),
+            "event_assignment": make_event_assignment(self.resource_ids[r]),
+        }
+        if previous is not None:
+            change["previous"] = {
+                "resource_id": self.resource_ids[previous[0]],
+                "start_date": self.calendar.iso(previous[1]),
+            }
+        return change
@@ -0,0 +1,391 @@
+import asyncio
+import itertools
+from collections import OrderedDict
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from src.utils.io import iter_export_records
+from src.utils.schedule import Schedule
+
+SERVICE_ALGORITHMS = ("round_robin_with_skills", "cp_sat", "local_search")
+
+# Request states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timed_out"
+FINISHED = (DONE, FAILED, CANCELLED, TIMED_OUT)
+
+# Share of a request's time budget given to the solvers; the rest covers loading and export
+SOLVER_BUDGET_SHARE = 0.8
+
+# Tenants whose data each worker process keeps warm; the least recently used one is dropped first
+WARM_TENANTS = 16
+
+
+class ServiceBusy(RuntimeError):
+    """
+    Raised when a request would exceed a tenant's or the service's queue limit.
+    """
+
+
+class FileSObjectSource:
+    """
+    Local stand-in for the sObject API, reading each tenant's exports from disk.
+
+    Tenant `t` lives in `root/t/` with one strk__Job__c and one
+    strk__Timesheet_User__c JSON export, as downloaded from the API. Any object
+    with the same `version` and `fetch` methods can replace it; it must be
+    picklable, because requests load their data inside the worker processes.
+
+    Parameters:
+    - root: Directory with one subdirectory per tenant
+    - job_skill_field: Job field holding the required skills, if any
+    - resource_skill_field: Resource field holding the skills, if any
+    - cache_dir: Ingest cache directory, or None to disable it
+    """
+
+    JOBS_FILENAME = "strk__Job__c.json"
+    RESOURCES_FILENAME = "strk__Timesheet_User__c.json"
+
+    def __init__(self, root: str, job_skill_field: Optional[str] = None,
+                 resource_skill_field: Optional[str] = None, cache_dir: Optional[str] = None):
+        self.root = root
+        self.job_skill_field = job_skill_field
+        self.resource_skill_field = resource_skill_field
+        self.cache_dir = cache_dir
+
+    def _paths(self, tenant: str) -> Tuple[str, str]:
+        directory = os.path.join(self.root, tenant)
+        return os.path.join(directory, self.JOBS_FILENAME), os.path.join(directory, self.RESOURCES_FILENAME)
+
+    def tenants(self) -> List[str]:
+        """
+        Return the tenants that have both exports.
+        """
+        return sorted(tenant for tenant in os.listdir(self.root)
+                      if all(os.path.isfile(path) for path in self._paths(tenant)))
+
+    def version(self, tenant: str) -> Tuple:
+        """
+        Return a value that changes whenever the tenant's data changes.
+        """
+        version = []
+        for path in self._paths(tenant):
+            stat = os.stat(path)
+            version += [stat.st_mtime_ns, stat.st_size]
+        return tuple(version)
+
+    def fetch(self, tenant: str, date_range: Dict) -> Dict:
+        """
+        Load the tenant's jobs and resources as scheduler input.
+        """
+        from src.utils.ingest import load_salesforce_exports
+        jobs_filename, resources_filename = self._paths(tenant)
+        return load_salesforce_exports(jobs_filename, resources_filename, date_range, self.job_skill_field,
+                                       self.resource_skill_field, cache_dir=self.cache_dir)
+
+
+# Per worker process: tenant -> loaded data and indexes, reused while the source version is unchanged
+_WARM_STATE: "OrderedDict[str, Dict]" = OrderedDict()
+
+def _run_request(source, tenant: str, algorithm: str, date_range: Dict, options: Dict) -> Tuple[Schedule, Dict]:
+    """
+    Schedule one request inside a worker process.
+    """
+    from src.utils.skill_index import SkillIndex
+
+    started = time.perf_counter()
+    version = source.version(tenant)
+    warm = _WARM_STATE.get(tenant)
+    reused = warm is not None and warm["version"] == version
+    if reused:
+        _WARM_STATE.move_to_end(tenant)
+    else:
+        data = source.fetch(tenant, date_range)
+        warm = _WARM_STATE[tenant] = {
+            "version": version,
+            "data": data,
+            "skill_index": SkillIndex(data["resources"]),
+            "travel": None,
+        }
+        _WARM_STATE.move_to_end(tenant)
+        while len(_WARM_STATE) > WARM_TENANTS:
+            _WARM_STATE.popitem(last=False)
+    data = dict(warm["data"], date_range=dict(date_range))
+
+    if algorithm == "round_robin_with_skills":
+        from src.auto_scheduler import round_robin_with_skills_autoschedule
+        job_schedule, stats = round_robin_with_skills_autoschedule(data, warm["skill_index"]), {}
+    elif algorithm == "cp_sat":
+        from src.optimizer import optimized_autoschedule
+        # Every pool process runs its own solve, so one search worker each
+        options = dict(options)
+        options.setdefault("num_workers", 1)
+        job_schedule, stats = optimized_autoschedule(data, skill_index=warm["skill_index"], **options)
+    else:
+        from src.local_search import local_search_autoschedule
+        from src.utils.travel import build_travel_matrix
+        if warm["travel"] is None:
+            warm["travel"] = build_travel_matrix(data["jobs"], data["resources"])
+        job_schedule, stats = local_search_autoschedule(data, travel=warm["travel"], **options)
+
+    stats = dict(stats, warm=reused, worker=os.getpid(), worker_time=time.perf_counter() - started)
+    return job_schedule, stats
+
+
+class TenantLimits:
+    """
+    Per-tenant admission and budget limits.
+
+    Parameters:
+    - max_queued: Most requests a tenant may have queued or running at once
+    - max_running: Most requests of the tenant running at once
+    - time_budget: Wall-clock seconds a request may run once it has a worker
+    """
+
+    __slots__ = ("max_queued", "max_running", "time_budget")
+
+    def __init__(self, max_queued: int = 10, max_running: int = 1, time_budget: float = 60.0):
+        self.max_queued = max_queued
+        self.max_running = max_running
+        self.time_budget = time_budget
+
+
+class _Request:
+    __slots__ = ("request_id", "tenant", "algorithm", "date_range", "options", "status", "task", "submitted",
+                 "started", "finished", "schedule", "stats", "error")
+
+    def __init__(self, request_id: str, tenant: str, algorithm: str, date_range: Dict, options: Dict):
+        self.request_id = request_id
+        self.tenant = tenant
+        self.algorithm = algorithm
+        self.date_range = date_range
+        self.options = options
+        self.status = QUEUED
+        self.task: Optional[asyncio.Task] = None
+        self.submitted = time.perf_counter()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.schedule: Optional[Schedule] = None
+        self.stats: Optional[Dict] = None
+        self.error: Optional[str] = None
+
+
+class SchedulingService:
+    """
+    Asyncio front end running scheduling requests of many tenants on a process pool.
+
+    Requests are admitted against per-tenant and service-wide queue limits,
+    then wait for a free slot: at most `max_running` per tenant and one per
+    worker overall, so a tenant with a long backlog cannot take every worker.
+    A running request that exceeds its tenant's time budget is reported as
+    timed out and its result discarded; the CP-SAT and local-search paths also
+    get the budget as their time limit so their workers free up on time. The
+    worker slot of a timed-out or cancelled request is only released once its
+    worker process has actually finished, so the next request does not spend
+    its own budget waiting behind the abandoned one.
+    Workers keep each tenant's loaded data, skill index and travel matrix warm
+    between requests until the source reports a new version.
+
+    Use as `async with SchedulingService(source) as service:`.
+
+    Parameters:
+    - source: Data source with version(tenant) and fetch(tenant, date_range), e.g. FileSObjectSource
+    - max_workers: Worker processes; defaults to the number of CPUs
+    - max_queued: Most requests queued or running across all tenants
+    - limits: TenantLimits per tenant
+    - default_limits: TenantLimits of tenants not in `limits`
+    - executor: Executor to run requests on instead of a new process pool
+    """
+
+    def __init__(self, source, max_workers: Optional[int] = None, max_queued: int = 1000,
+                 limits: Optional[Dict[str, TenantLimits]] = None, default_limits: Optional[TenantLimits] = None,
+                 executor: Optional[Executor] = None):
+        self.source = source
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queued = max_queued
+        self.limits = dict(limits or {})
+        self.default_limits = default_limits or TenantLimits()
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._requests: Dict[str, _Request] = {}
+        self._active: Dict[str, int] = {}  # tenant -> queued or running requests
+        self._worker_slots: Optional[asyncio.Semaphore] = None
+        self._tenant_slots: Dict[str, asyncio.Semaphore] = {}
+        self._ids = itertools.count(1)
+
+    async def __aenter__(self) -> "SchedulingService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _limits(self, tenant: str) -> TenantLimits:
+        return self.limits.get(tenant, self.default_limits)
+
+    def submit(self, tenant: str, date_range: Dict, algorithm: str = "round_robin_with_skills",
+               options: Optional[Dict] = None) -> str:
+        """
+        Queue a scheduling request; must be called from the event loop.
+
+        Parameters:
+        - tenant: Tenant to schedule
+        - date_range: Dictionary with start_date and end_date
+        - algorithm: "round_robin_with_skills", "cp_sat" or "local_search"
+        - options: Extra keyword arguments for the algorithm
+
+        Returns:
+        - The request id
+
+        Raises:
+        - ServiceBusy if the tenant or the service has too many requests outstanding
+        """
+        if algorithm not in SERVICE_ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if self._worker_slots is None:
+            self._worker_slots = asyncio.Semaphore(self.max_workers)
+        if sum(self._active.values()) >= self.max_queued:
+            raise ServiceBusy(f"Service queue is full ({self.max_queued} requests)")
+        limits = self._limits(tenant)
+        if self._active.get(tenant, 0) >= limits.max_queued:
+            raise ServiceBusy(f"Tenant {tenant} has {limits.max_queued} requests outstanding")
+
+        options = dict(options or {})
+        if algorithm in ("cp_sat", "local_search"):
+            budget = limits.time_budget * SOLVER_BUDGET_SHARE
+            options["time_limit"] = min(options.get("time_limit", budget), budget)
+        request = _Request(f"{tenant}-{next(self._ids)}", tenant, algorithm, dict(date_range), options)
+        self._requests[request.request_id] = request
+        self._active[tenant] = self._active.get(tenant, 0) + 1
+        request.task = asyncio.get_running_loop().create_task(self._execute(request))
+        request.task.add_done_callback(lambda task: self._finish(request))
+        return request.request_id
+
+    def _finish(self, request: _Request) -> None:
+        # Runs for every request, including ones cancelled before their task started
+        if request.status not in FINISHED:
+            request.status = CANCELLED
+        request.finished = time.perf_counter()
+        self._active[request.tenant] -= 1
+
+    def _release_worker_slot(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._worker_slots.release)
+        except RuntimeError:
+            pass  # The event loop is already closed
+
+    async def _execute(self, request: _Request) -> None:
+        limits = self._limits(request.tenant)
+        tenant_slots = self._tenant_slots.get(request.tenant)
+        if tenant_slots is None:
+            tenant_slots = self._tenant_slots[request.tenant] = asyncio.Semaphore(limits.max_running)
+        loop = asyncio.get_running_loop()
+        try:
+            async with tenant_slots:
+                await self._worker_slots.acquire()
+                try:
+                    request.status = RUNNING
+                    request.started = time.perf_counter()
+                    if self._executor is None:
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    work: Future = self._executor.submit(_run_request, self.source, request.tenant,
+                                                         request.algorithm, request.date_range, request.options)
+                except BaseException:
+                    self._worker_slots.release()
+                    raise
+                # A timed-out or cancelled request keeps its worker busy until it returns
+                work.add_done_callback(lambda _: self._release_worker_slot(loop))
+                try:
+                    request.schedule, request.stats = await asyncio.wait_for(asyncio.wrap_future(work),
+                                                                             limits.time_budget)
+                    request.status = DONE
+                except asyncio.TimeoutError:
+                    request.status = TIMED_OUT
+                    request.error = f"Exceeded the time budget of {limits.time_budget}s"
+        except Exception as error:
+            request.status = FAILED
+            request.error = f"{type(error).__name__}: {error}"
+
+    def status(self, request_id: str) -> str:
+        """
+        Return the state of a request: queued, running, done, failed, cancelled or timed_out.
+        """
+        return self._requests[request_id].status
+
+    def cancel(self, request_id: str) -> bool:
+        """
+        Cancel a request. A queued request never runs; a running one has its result discarded.
+
+        Returns:
+        - False if the request had already finished
+        """
+        request = self._requests[request_id]
+        if request.status in FINISHED:
+            return False
+        request.task.cancel()
+        return True
+
+    async def result(self, request_id: str) -> Dict:
+        """
+        Wait for a request to finish and return its outcome.
+
+        Returns:
+        - Dictionary with request_id, tenant, algorithm, status, error, queue_time,
+          run_time, scheduled (number of assignments), skipped jobs and stats
+        """
+        request = self._requests[request_id]
+        await asyncio.wait([request.task])
+        return {
+            "request_id": request.request_id,
+            "tenant": request.tenant,
+            "algorithm": request.algorithm,
+            "status": request.status,
+            "error": request.error,
+            "queue_time": (request.started or request.finished) - request.submitted,
+            "run_time": request.finished - request.started if request.started is not None else 0.0,
+            "scheduled": len(request.schedule) if request.schedule is not None else 0,
+            "skipped": request.schedule.skipped if request.schedule is not None else [],
+            "stats": request.stats,
+        }
+
+    async def stream(self, request_id: str, chunk_size: int = 1000) -> AsyncIterator[Dict]:
+        """
+        Yield a finished request's assignments in the export_job_schedule_to_json record format.
+
+        Control returns to the event loop every `chunk_size` records, so streaming a
+        large schedule does not hold up other requests.
+        """
+        request = self._requests[request_id]
+        await asyncio.wait([request.task])
+        if request.status != DONE:
+            raise RuntimeError(f"Request {request_id} is {request.status}")
+        for position, record in enumerate(iter_export_records(request.schedule), 1):
+            yield record
+            if position % chunk_size == 0:
+                await asyncio.sleep(0)
+
+    def pending(self) -> Dict[str, int]:
+        """
+        Return the number of queued or running requests per tenant.
+        """
+        return {tenant: count for tenant, count in self._active.items() if count}
+
+    async def close(self) -> None:
+        """
+        Cancel outstanding requests and shut the worker pool down.
+        """
+        tasks = [request.task for request in self._requests.values() if request.status not in FINISHED]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        if self._executor is not None and self._owns_executor:
+            # A worker may still be finishing a discarded request; wait for it off the event loop
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(
+                None, lambda: executor.shutdown(wait=True, cancel_futures=True))
@@ -0,0 +1,103 @@
+from typing import List, Optional, Sequence
+
+def first_free_day(booked: int) -> int:
+    """
+    Return the lowest day offset not set in a bitmask of booked days.
+    """
+    return (~booked & (booked + 1)).bit_length() - 1
+
+
+class RoundRobinQueue:
+    """
+    Round-robin cursor over the eligible resources of one skill group.
+
+    Resources whose next free day has moved past the end of the date range are
+    dropped from the queue the first time they are probed, so each job costs an
+    amortized near-constant number of probes instead of a scan over the group.
+    The order in which resources are handed out is exactly the cyclic order of
+    `members`, starting after the previously chosen resource.
+
+    `probes` counts the resources examined over all calls, for instrumentation.
+
+    Parameters:
+    - members: Resource positions in round-robin order
+    """
+
+    __slots__ = ("members", "pointer", "probes", "_next")
+
+    def __init__(self, members: Sequence[int]):
+        self.members = members
+        self.pointer = 0
+        self.probes = 0
+        # Disjoint-set "next live position" links; position len(members) is a sentinel
+        self._next = list(range(len(members) + 1))
+
+    def _find(self, position: int) -> int:
+        links = self._next
+        while links[position] != position:
+            links[position] = links[links[position]]
+            position = links[position]
+        return position
+
+    def next_available(self, next_free: List, last_day) -> Optional[int]:
+        """
+        Return the next resource position whose next free day is within range.
+
+        Parameters:
+        - next_free: Next free day of every resource, indexed by resource position
+        - last_day: Last schedulable day
+
+        Returns:
+        - The chosen resource position, or None if every member is booked up
+        """
+        members = self.members
+        size = len(members)
+        position = self._find(self.pointer)
+        probes = 0
+        while True:
+            if position == size:
+                position = self._find(0)
+                if position == size:
+                    self.probes += probes
+                    return None
+            probes += 1
+            resource = members[position]
+            if next_free[resource] <= last_day:
+                self.pointer = position + 1 if position + 1 < size else 0
+                self.probes += probes
+                return resource
+            # Booked up for the rest of the date range: drop it for good
+            self._next[position] = position + 1
+            position = self._find(position)
+
+    def next_free_on(self, booked: List[int], day: int) -> Optional[int]:
+        """
+        Return the next resource position, in round-robin order, that is free on `day`.
+
+        Dropped resources are still considered: a resource booked up from its
+        next free day on can have an earlier day free again.
+
+        Parameters:
+        - booked: Bitmask of booked days of every resource, indexed by resource position
+        - day: Day offset the resource must be free on
+
+        Returns:
+        - The chosen resource position, or None if every member is booked on `day`
+        """
+        members = self.members
+        size = len(members)
+        for step in range(size):
+            position = (self.pointer + step) % size
+            if not booked[members[position]] >> day & 1:
+                self.pointer = position + 1 if position + 1 < size else 0
+                self.probes += step + 1
+                return members[position]
+        self.probes += size
+        return None
+
+    def reset(self) -> None:
+        """
+        Bring dropped resources back, e.g. after a day was freed or the date range was extended.
+        """
+        self._next = list(range(len(self.members) + 1))
+
@@ -0,0 +1,65 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Number of set bits in every byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+class AvailabilityBitmap:
+    """
+    Free/booked state of every resource on every day as a packed bit matrix.
+
+    Each day is a row of bits, one per resource position, packed eight to a
+    byte, so "how many of these resources are free on each day" is a vectorized
+    AND with a packed resource mask followed by a byte popcount, over all days
+    at once.
+
+    Parameters:
+    - num_resources: Number of resources
+    - num_days: Number of days in the range
+    """
+
+    __slots__ = ("num_resources", "bits")
+
+    def __init__(self, num_resources: int, num_days: int):
+        self.num_resources = num_resources
+        self.bits = np.packbits(np.ones((max(num_days, 0), num_resources), dtype=bool), axis=1)
+
+    def pack(self, positions: Sequence[int]) -> np.ndarray:
+        """
+        Build the packed mask of a set of resource positions.
+        """
+        selected = np.zeros(self.num_resources, dtype=bool)
+        selected[list(positions)] = True
+        return np.packbits(selected)
+
+    def free_counts(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Return the number of resources in `mask` that are free on each day.
+        """
+        return _POPCOUNT[self.bits & mask].sum(axis=1, dtype=np.int64)
+
+    def earliest_day(self, mask: np.ndarray, count: int) -> Optional[int]:
+        """
+        Return the first day on which at least `count` resources in `mask` are free.
+        """
+        enough = self.free_counts(mask) >= count
+        day = int(enough.argmax()) if len(enough) else 0
+        if not len(enough) or not enough[day]:
+            return None
+        return day
+
+    def free_resources(self, mask: np.ndarray, day: int) -> np.ndarray:
+        """
+        Return the positions of the resources in `mask` that are free on `day`, in order.
+        """
+        return np.flatnonzero(np.unpackbits(self.bits[day] & mask, count=self.num_resources))
+
+    def book(self, positions: Sequence[int], day: int) -> None:
+        """
+        Mark resources as booked on a day.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        np.bitwise_and.at(self.bits[day], positions >> 3,
+                          ~(np.uint8(0x80) >> (positions & 7).astype(np.uint8)))
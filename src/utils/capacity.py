@@ -0,0 +1,144 @@
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def daily_capacity(resources: List[Dict], day_minutes: int) -> List[int]:
+    """
+    Return the working minutes per day of every resource: the working day, capped at max_hours when given.
+    """
+    return [
+        min(day_minutes, int(round(60 * res["max_hours"]))) if res.get("max_hours") else day_minutes
+        for res in resources
+    ]
+
+def _pick(candidates: np.ndarray, start: int) -> int:
+    # First candidate position at or after `start`, wrapping around
+    after = candidates[candidates >= start]
+    return int(after[0] if len(after) else candidates[0])
+
+
+class CapacityCalendar:
+    """
+    Remaining working minutes of every resource on every day.
+
+    Capacity is a dense (resource, day) integer array, so finding a slot for a
+    job is a handful of vectorized comparisons over the eligible rows instead
+    of a Python scan over resources and days. Jobs are packed back to back
+    from the start of the day, so a slot's start offset is simply the minutes
+    already used that day.
+
+    Queries take the eligible resource positions as `rows` and a `start`
+    position in `rows`: when several resources fit on the same day, the first
+    one at or after `start` (wrapping around) wins, which lets callers keep a
+    round-robin order among equally good resources.
+
+    Parameters:
+    - capacity: Working minutes per day of every resource
+    - num_days: Number of days in the range
+    """
+
+    __slots__ = ("capacity", "remaining")
+
+    def __init__(self, capacity: Sequence[int], num_days: int):
+        self.capacity = np.asarray(capacity, dtype=np.int32)
+        self.remaining = np.repeat(self.capacity[:, np.newaxis], max(num_days, 0), axis=1)
+
+    @property
+    def num_days(self) -> int:
+        return self.remaining.shape[1]
+
+    def first_fit(self, rows: np.ndarray, minutes: int, start: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Find the earliest day on which one of `rows` has `minutes` left.
+
+        Returns:
+        - (resource position, day), or None if no resource has room on any day
+        """
+        fits = self.remaining[rows] >= minutes
+        days = fits.any(axis=0)
+        day = int(days.argmax()) if len(days) else 0
+        if not len(days) or not days[day]:
+            return None
+        return int(rows[_pick(np.flatnonzero(fits[:, day]), start)]), day
+
+    def best_fit(self, rows: np.ndarray, minutes: int, start: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Find the slot that leaves the fewest minutes unused, earliest day first on ties.
+
+        Returns:
+        - (resource position, day), or None if no resource has room on any day
+        """
+        leftover = self.remaining[rows] - minutes
+        if not leftover.size:
+            return None
+        leftover[leftover < 0] = np.iinfo(leftover.dtype).max
+        best = leftover.min()
+        if best == np.iinfo(leftover.dtype).max:
+            return None
+        tied = leftover == best
+        day = int(tied.any(axis=0).argmax())
+        return int(rows[_pick(np.flatnonzero(tied[:, day]), start)]), day
+
+    def first_free_span(self, rows: np.ndarray, minutes: Optional[int],
+                        start: int = 0) -> Optional[Tuple[int, int]]:
+        """
+        Find the earliest run of completely free days long enough for a multi-day job.
+
+        A resource needs ceil(minutes / daily capacity) consecutive untouched days;
+        with `minutes` None the job takes one whole day.
+
+        Returns:
+        - (resource position, first day), or None if no resource has such a run
+        """
+        capacity = self.capacity[rows]
+        free = self.remaining[rows] == capacity[:, np.newaxis]
+        # Running count of free days, so a window of k days is free when its count is k
+        counts = np.zeros((len(rows), self.num_days + 1), dtype=np.int32)
+        np.cumsum(free, axis=1, out=counts[:, 1:])
+        spans = np.ones(len(rows), dtype=np.int64) if minutes is None else \
+            -(-minutes // np.maximum(capacity, 1))
+
+        best = None
+        for span in np.unique(spans):
+            if span > self.num_days:
+                continue
+            span_rows = np.flatnonzero((spans == span) & (capacity > 0))
+            windows = (counts[span_rows, span:] - counts[span_rows, :-span]) == span
+            days = windows.any(axis=0)
+            if not len(days) or not days.any():
+                continue
+            day = int(days.argmax())
+            if best is None or day < best[1]:
+                best = (span_rows[windows[:, day]], day)
+            elif day == best[1]:
+                best = (np.union1d(best[0], span_rows[windows[:, day]]), day)
+        if best is None:
+            return None
+        return int(rows[_pick(best[0], start)]), best[1]
+
+    def book(self, resource: int, day: int, minutes: Optional[int]) -> Tuple[int, int, int]:
+        """
+        Book `minutes` for a resource from `day`, spilling over to the following days.
+
+        A job longer than the resource's day fills whole days and ends on the
+        remainder of the last one; with `minutes` None the job takes the whole day.
+
+        Returns:
+        - (last day, start offset on the first day, end offset on the last day) in minutes
+          from the start of the working day
+        """
+        capacity = int(self.capacity[resource])
+        remaining = self.remaining[resource]
+        if minutes is None:
+            minutes = int(remaining[day])
+        start_offset = capacity - int(remaining[day])
+        if minutes <= remaining[day]:
+            remaining[day] -= minutes
+            return day, start_offset, start_offset + minutes
+        span = math.ceil(minutes / capacity)
+        last_minutes = minutes - (span - 1) * capacity
+        remaining[day:day + span - 1] = 0
+        remaining[day + span - 1] -= last_minutes
+        return day + span - 1, start_offset, last_minutes
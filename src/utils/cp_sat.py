@@ -0,0 +1,48 @@
+import os
+from typing import Dict, Optional
+
+from ortools.sat.python import cp_model
+
+def configure_solver(solver: cp_model.CpSolver,
+                     time_limit: float,
+                     num_workers: Optional[int] = None,
+                     relative_gap: Optional[float] = None) -> cp_model.CpSolver:
+    """
+    Apply the wall-clock budget, parallelism and early-stop settings to a solver.
+
+    Parameters:
+    - solver: The CP-SAT solver
+    - time_limit: Wall-clock budget in seconds
+    - num_workers: Parallel search workers; defaults to the number of CPUs
+    - relative_gap: Stop once (bound - objective) / objective is within this gap
+
+    Returns:
+    - The configured solver
+    """
+    solver.parameters.max_time_in_seconds = max(time_limit, 0.0)
+    solver.parameters.num_workers = num_workers or os.cpu_count() or 1
+    if relative_gap is not None:
+        solver.parameters.relative_gap_limit = relative_gap
+    return solver
+
+def solver_stats(solver: cp_model.CpSolver, status: int) -> Dict:
+    """
+    Collect solver statistics after a solve.
+    """
+    stats = {
+        "status": solver.StatusName(status),
+        "objective": None,
+        "best_bound": None,
+        "relative_gap": None,
+        "wall_time": solver.WallTime(),
+        "num_workers": solver.parameters.num_workers,
+        "num_conflicts": solver.NumConflicts(),
+        "num_branches": solver.NumBranches(),
+    }
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        objective = solver.ObjectiveValue()
+        bound = solver.BestObjectiveBound()
+        stats["objective"] = objective
+        stats["best_bound"] = bound
+        stats["relative_gap"] = abs(bound - objective) / max(abs(objective), 1.0)
+    return stats
@@ -0,0 +1,46 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class DayCalendar:
+    """
+    Integer day calendar over a scheduling date range.
+
+    Days are represented as integer offsets from `date_range["start_date"]` so the
+    scheduling loops only do integer arithmetic. ISO date strings for the range are
+    formatted once up front and looked up by day offset when output is built.
+
+    Parameters:
+    - date_range: Dictionary with start_date and end_date ("YYYY-MM-DD")
+    """
+
+    __slots__ = ("start_date", "end_date", "num_days", "_iso_dates")
+
+    def __init__(self, date_range: Dict):
+        self.start_date: date = datetime.strptime(date_range["start_date"], DATE_FORMAT).date()
+        self.end_date: date = datetime.strptime(date_range["end_date"], DATE_FORMAT).date()
+        self.num_days = max((self.end_date - self.start_date).days + 1, 0)
+        self._iso_dates: List[str] = [
+            (self.start_date + timedelta(days=day)).isoformat() for day in range(self.num_days)
+        ]
+
+    @property
+    def last_day(self) -> int:
+        """Offset of the last day in the range (-1 for an empty range)."""
+        return self.num_days - 1
+
+    def iso(self, day: int) -> str:
+        """
+        Return the "YYYY-MM-DD" string for a day offset.
+        """
+        if 0 <= day < self.num_days:
+            return self._iso_dates[day]
+        return (self.start_date + timedelta(days=day)).isoformat()
+
+    def day_of(self, iso_date: str) -> int:
+        """
+        Return the day offset of a "YYYY-MM-DD" string.
+        """
+        return (datetime.strptime(iso_date, DATE_FORMAT).date() - self.start_date).days
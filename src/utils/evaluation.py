@@ -0,0 +1,229 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.capacity import daily_capacity
+from src.utils.dates import DayCalendar
+from src.utils.schedule import Schedule, parse_minute
+from src.utils.skill_index import SkillIndex
+from src.utils.travel import TravelMatrix
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class ScheduleEvaluator:
+    """
+    Vectorized scoring of schedules for one problem instance.
+
+    Everything that only depends on the input data (skill bitmaps, durations,
+    capacities, travel nodes) is prepared once, so scoring a schedule is a fixed
+    number of NumPy operations over its assignment columns. Schedules from every
+    algorithm can be scored, as a `Schedule` or as a list of (event,
+    event_assignment) tuples, and improvement passes can score raw columns with
+    `evaluate_columns`.
+
+    Parameters:
+    - data: Input data containing jobs, resources and date range
+    - travel: Travel matrix over the jobs and resources, or None to skip travel
+    - day_start: Start of the working day ("HH:MM")
+    - day_end: End of the working day ("HH:MM")
+    """
+
+    def __init__(self, data: Dict, travel: Optional[TravelMatrix] = None,
+                 day_start: str = "08:00", day_end: str = "17:00"):
+        jobs = data["jobs"]
+        resources = data["resources"]
+        self.calendar = DayCalendar(data["date_range"])
+        self.job_ids = [job["id"] for job in jobs]
+        self.resource_ids = [res["id"] for res in resources]
+        self._job_position = {job_id: j for j, job_id in enumerate(self.job_ids)}
+        self._resource_position = {res_id: r for r, res_id in enumerate(self.resource_ids)}
+
+        # Required and available skills as packed bit rows
+        skill_index = SkillIndex(resources)
+        job_masks = [skill_index.mask_for(job["required_skills"]) for job in jobs]
+        num_skills = max(len(skill_index.skill_bits), 1)
+        self._job_skills = _pack_masks(job_masks, num_skills)
+        self._resource_skills = _pack_masks(skill_index.resource_masks, num_skills)
+
+        self.capacity = np.asarray(daily_capacity(resources, parse_minute(day_end) - parse_minute(day_start)),
+                                   dtype=np.float64)
+        self._duration = np.array([60.0 * (job.get("estimated_duration") or 0.0) for job in jobs])
+
+        self.travel = travel
+        if travel is not None:
+            self._job_nodes = np.array([travel.job_node(job_id) for job_id in self.job_ids], dtype=np.intp)
+            self._home_nodes = np.array([travel.home_node(res_id) for res_id in self.resource_ids], dtype=np.intp)
+
+    def columns(self, schedule) -> Tuple[np.ndarray, ...]:
+        """
+        Return (job, resource, day, end day, start minute, end minute) arrays for a schedule.
+
+        Positions and days are relative to this evaluator's jobs, resources and date range.
+        """
+        if isinstance(schedule, Schedule):
+            job_index = np.frombuffer(schedule.job_index, dtype=np.int32).astype(np.intp)
+            if schedule.job_ids is not self.job_ids and schedule.job_ids != self.job_ids:
+                remap = np.array([self._job_position[job_id] for job_id in schedule.job_ids], dtype=np.intp)
+                job_index = remap[job_index]
+            resource_index = np.frombuffer(schedule.resource_index, dtype=np.int32).astype(np.intp)
+            if schedule.resource_ids is not self.resource_ids and schedule.resource_ids != self.resource_ids:
+                remap = np.array([self._resource_position[res_id] for res_id in schedule.resource_ids],
+                                 dtype=np.intp)
+                resource_index = remap[resource_index]
+            shift = (schedule.calendar.start_date - self.calendar.start_date).days
+            return (job_index, resource_index,
+                    np.frombuffer(schedule.day, dtype=np.int32) + shift,
+                    np.frombuffer(schedule.end_day, dtype=np.int32) + shift,
+                    np.frombuffer(schedule.start_minute, dtype=np.int32),
+                    np.frombuffer(schedule.end_minute, dtype=np.int32))
+        return self._columns_from_tuples(schedule)
+
+    def _columns_from_tuples(self, schedule: Iterable[Tuple[Dict, Dict]]) -> Tuple[np.ndarray, ...]:
+        day_of = {}
+        rows = []
+        for event, assignment in schedule:
+            for iso_date in (event["start_date"], event["end_date"]):
+                if iso_date not in day_of:
+                    day_of[iso_date] = self.calendar.day_of(iso_date)
+            rows.append((
+                self._job_position[event["job_id"]],
+                self._resource_position[assignment["resource_id"]],
+                day_of[event["start_date"]],
+                day_of[event["end_date"]],
+                parse_minute(event["start_time"]) if event.get("start_time") else -1,
+                parse_minute(event["end_time"]) if event.get("end_time") else -1,
+            ))
+        table = np.array(rows, dtype=np.int64).reshape(-1, 6)
+        return tuple(table[:, k].astype(np.intp) for k in range(6))
+
+    def evaluate(self, schedule) -> Dict:
+        """
+        Score a schedule.
+
+        Parameters:
+        - schedule: Schedule or list of (event, event_assignment) tuples
+
+        Returns:
+        - Metrics dictionary, see `evaluate_columns`
+        """
+        return self.evaluate_columns(*self.columns(schedule))
+
+    def evaluate_columns(self, job_index: np.ndarray, resource_index: np.ndarray, day: np.ndarray,
+                         end_day: Optional[np.ndarray] = None, start_minute: Optional[np.ndarray] = None,
+                         end_minute: Optional[np.ndarray] = None) -> Dict:
+        """
+        Score a schedule given as assignment columns.
+
+        A job without a duration counts as a whole day of work per day it spans.
+        Two assignments of one resource on the same day are a double booking when
+        their times overlap; an assignment without times occupies the whole day.
+
+        Parameters:
+        - job_index, resource_index, day: Assignment columns
+        - end_day: Last day of each assignment; defaults to `day`
+        - start_minute, end_minute: Minutes since midnight, -1 when there is no time
+
+        Returns:
+        - Dictionary with assignments, scheduled_jobs, unscheduled_jobs, utilization
+          (per resource), mean_utilization, day_load (minutes per day), day_load_cv
+          (coefficient of variation of day_load), skill_violations, out_of_range,
+          double_bookings and travel_km (None without a travel matrix)
+        """
+        num_days = self.calendar.num_days
+        job_index = np.asarray(job_index, dtype=np.intp)
+        resource_index = np.asarray(resource_index, dtype=np.intp)
+        day = np.asarray(day, dtype=np.int64)
+        end_day = day if end_day is None else np.asarray(end_day, dtype=np.int64)
+        count = len(day)
+        if start_minute is None:
+            start_minute = np.full(count, -1, dtype=np.int64)
+        if end_minute is None:
+            end_minute = np.full(count, -1, dtype=np.int64)
+
+        out_of_range = (day < 0) | (end_day > num_days - 1)
+        violation = (self._job_skills[job_index] & ~self._resource_skills[resource_index]).any(axis=1)
+
+        # One piece per (assignment, day) it covers
+        span = np.maximum(end_day - day + 1, 1)
+        piece_row = np.repeat(np.arange(count), span)
+        first_piece = np.concatenate(([0], np.cumsum(span)[:-1])).astype(np.int64) if count else span
+        piece_offset = np.arange(len(piece_row)) - np.repeat(first_piece, span)
+        piece_day = day[piece_row] + piece_offset
+        piece_resource = resource_index[piece_row]
+        is_first = piece_offset == 0
+        is_last = piece_offset == span[piece_row] - 1
+
+        timed = start_minute[piece_row] >= 0
+        piece_start = np.where(timed & is_first, start_minute[piece_row], 0)
+        piece_end = np.where(timed & is_last, end_minute[piece_row], MINUTES_PER_DAY)
+
+        # Work: the job's duration spread over its days, or whole days when it has none
+        duration = self._duration[job_index[piece_row]]
+        piece_work = np.where(duration > 0, duration / span[piece_row], self.capacity[piece_resource])
+
+        in_range = (piece_day >= 0) & (piece_day < num_days)
+        # bincount of no pieces is integer; keep the sums float so empty schedules score too
+        worked = np.bincount(piece_resource, weights=piece_work, minlength=len(self.resource_ids)).astype(np.float64)
+        available = self.capacity * max(num_days, 1)
+        utilization = np.divide(worked, available, out=np.zeros_like(worked), where=available > 0)
+        day_load = np.bincount(piece_day[in_range], weights=piece_work[in_range],
+                               minlength=num_days)[:num_days].astype(np.float64)
+        mean_load = day_load.mean() if num_days else 0.0
+
+        # Sort pieces by (resource, day, start) to find overlaps and walk routes
+        order = np.lexsort((piece_start, piece_day, piece_resource))
+        sorted_resource = piece_resource[order]
+        sorted_day = piece_day[order]
+        same_slot = (sorted_resource[1:] == sorted_resource[:-1]) & (sorted_day[1:] == sorted_day[:-1])
+        group_start = np.concatenate(([True], ~same_slot)) if len(order) else np.zeros(0, dtype=bool)
+        # Running max of end times within each (resource, day) group
+        group_id = np.cumsum(group_start)
+        shifted_end = group_id * (2 * MINUTES_PER_DAY) + piece_end[order]
+        running_end = np.maximum.accumulate(shifted_end) - group_id * (2 * MINUTES_PER_DAY)
+        double_bookings = int((same_slot & (piece_start[order][1:] < running_end[:-1])).sum())
+
+        travel_km = None
+        if self.travel is not None:
+            distance = self.travel.distance_km
+            nodes = self._job_nodes[job_index[piece_row][order]]
+            homes = self._home_nodes[sorted_resource]
+            group_end = np.concatenate((~same_slot, [True])) if len(order) else np.zeros(0, dtype=bool)
+            legs = float(distance[homes[group_start], nodes[group_start]].sum())
+            legs += float(distance[nodes[:-1][same_slot], nodes[1:][same_slot]].sum())
+            legs += float(distance[nodes[group_end], homes[group_end]].sum())
+            travel_km = legs
+
+        scheduled_jobs = int(np.unique(job_index).size)
+        return {
+            "assignments": count,
+            "scheduled_jobs": scheduled_jobs,
+            "unscheduled_jobs": len(self.job_ids) - scheduled_jobs,
+            "utilization": utilization,
+            "mean_utilization": float(utilization.mean()) if len(utilization) else 0.0,
+            "day_load": day_load,
+            "day_load_cv": float(day_load.std() / mean_load) if mean_load > 0 else 0.0,
+            "skill_violations": int(violation.sum()),
+            "out_of_range": int(out_of_range.sum()),
+            "double_bookings": double_bookings,
+            "travel_km": travel_km,
+        }
+
+def _pack_masks(masks: List[int], num_skills: int) -> np.ndarray:
+    # One row of packed skill bits per mask
+    bits = np.array([[mask >> bit & 1 for bit in range(num_skills)] for mask in masks], dtype=bool)
+    return np.packbits(bits.reshape(len(masks), num_skills), axis=1)
+
+def evaluate_schedule(schedule, data: Dict, travel: Optional[TravelMatrix] = None) -> Dict:
+    """
+    Score one schedule; see `ScheduleEvaluator` to score many schedules of the same instance.
+
+    Parameters:
+    - schedule: Schedule or list of (event, event_assignment) tuples
+    - data: Input data containing jobs, resources and date range
+    - travel: Travel matrix over the jobs and resources, or None to skip travel
+
+    Returns:
+    - Metrics dictionary
+    """
+    return ScheduleEvaluator(data, travel).evaluate(schedule)
@@ -0,0 +1,174 @@
+import hashlib
+import os
+import pickle
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.instrumentation import current_instrumentation
+from src.utils.io import DEFAULT_CACHE_DIR, iter_json_array
+
+# Bump when the projected record layout changes so stale caches are ignored
+CACHE_VERSION = 2
+
+# Hours per strk__Duration_Unit__c value; a "Day" is one working day
+DURATION_UNIT_HOURS = {"minute": 1 / 60, "hour": 1.0, "day": 8.0, "week": 40.0}
+
+def iter_sobjects(filename: str, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """
+    Stream sObject records from a Salesforce JSON export (a top-level array).
+
+    Parameters:
+    - filename: Path to the export
+    - chunk_size: Number of characters read at a time
+    """
+    with open(filename, encoding="utf-8") as export_file:
+        yield from iter_json_array(export_file, chunk_size)
+
+def _split_skills(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [skill.strip() for skill in value.split(";") if skill.strip()]
+    return list(value)
+
+def _duration_hours(record: Dict) -> Optional[float]:
+    duration = record.get("strk__Estimated_Duration__c")
+    if duration is None:
+        return None
+    unit = (record.get("strk__Duration_Unit__c") or "Hour").strip().lower().rstrip("s")
+    if unit not in DURATION_UNIT_HOURS:
+        raise ValueError(f"Unknown duration unit {record.get('strk__Duration_Unit__c')!r} on job {record['Id']}")
+    return float(duration) * DURATION_UNIT_HOURS[unit]
+
+def _location(record: Dict, compound_field: str) -> Tuple[Optional[float], Optional[float]]:
+    # Location fields are compound ({"latitude": ..., "longitude": ...}); some exports
+    # flatten them into <name>__Latitude__s / <name>__Longitude__s instead
+    location = record.get(compound_field)
+    if location:
+        return location.get("latitude"), location.get("longitude")
+    prefix = compound_field[:-len("__c")]
+    return record.get(f"{prefix}__Latitude__s"), record.get(f"{prefix}__Longitude__s")
+
+def project_job(record: Dict, skill_field: Optional[str] = None) -> Dict:
+    """
+    Keep only the fields the schedulers use from a strk__Job__c record.
+
+    Parameters:
+    - record: Raw sObject record
+    - skill_field: Field holding the required skills (a list or a ";"-separated picklist)
+
+    Returns:
+    - Job dictionary with id, required_skills, estimated_duration (hours), resource_count,
+      latitude and longitude
+    """
+    latitude, longitude = _location(record, "strk__Location__c")
+    return {
+        "id": record["Id"],
+        "required_skills": _split_skills(record.get(skill_field)) if skill_field else [],
+        "estimated_duration": _duration_hours(record),
+        "resource_count": record.get("strk__Number_Of_Resources__c"),
+        "latitude": latitude,
+        "longitude": longitude,
+    }
+
+def project_resource(record: Dict, skill_field: Optional[str] = None) -> Optional[Dict]:
+    """
+    Keep only the fields the schedulers use from a strk__Timesheet_User__c record.
+
+    Parameters:
+    - record: Raw sObject record
+    - skill_field: Field holding the resource skills (a list or a ";"-separated picklist)
+
+    Returns:
+    - Resource dictionary with id, skills, latitude and longitude, or None for inactive resources
+    """
+    if not record.get("strk__Active__c", True):
+        return None
+    latitude, longitude = _location(record, "strk__Last_Known_Location__c")
+    return {
+        "id": record["Id"],
+        "skills": _split_skills(record.get(skill_field)) if skill_field else [],
+        "latitude": latitude,
+        "longitude": longitude,
+    }
+
+def _file_digest(filename: str, digest) -> None:
+    with open(filename, "rb") as source_file:
+        for block in iter(lambda: source_file.read(1 << 20), b""):
+            digest.update(block)
+
+def _cache_key(jobs_filename: str, resources_filename: str, job_skill_field: Optional[str],
+               resource_skill_field: Optional[str]) -> str:
+    digest = hashlib.sha256()
+    digest.update(repr((CACHE_VERSION, job_skill_field, resource_skill_field)).encode())
+    _file_digest(jobs_filename, digest)
+    digest.update(b"\0")
+    _file_digest(resources_filename, digest)
+    return digest.hexdigest()
+
+def _project_exports(jobs_filename: str, resources_filename: str, job_skill_field: Optional[str],
+                     resource_skill_field: Optional[str]) -> Tuple[List[Dict], List[Dict]]:
+    jobs = [project_job(record, job_skill_field) for record in iter_sobjects(jobs_filename)]
+    resources = []
+    for record in iter_sobjects(resources_filename):
+        resource = project_resource(record, resource_skill_field)
+        if resource is not None:
+            resources.append(resource)
+    return jobs, resources
+
+def load_salesforce_exports(jobs_filename: str,
+                            resources_filename: str,
+                            date_range: Dict,
+                            job_skill_field: Optional[str] = None,
+                            resource_skill_field: Optional[str] = None,
+                            cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Dict:
+    """
+    Load raw strk__Job__c / strk__Timesheet_User__c exports as scheduler input.
+
+    The exports are streamed and projected down to the fields the schedulers use.
+    The projected records are cached in a binary file keyed by the hash of both
+    source files, so repeat runs on unchanged exports skip JSON parsing entirely.
+
+    Parameters:
+    - jobs_filename: Path to the strk__Job__c export
+    - resources_filename: Path to the strk__Timesheet_User__c export
+    - date_range: Dictionary with start_date and end_date
+    - job_skill_field: Job field holding the required skills, if any
+    - resource_skill_field: Resource field holding the skills, if any
+    - cache_dir: Cache directory, or None to disable caching
+
+    Returns:
+    - Input data with job_ids, jobs, resource_ids, resources and date_range
+    """
+    instrumentation = current_instrumentation()
+    with instrumentation.phase("load"):
+        cache_path = None
+        jobs = resources = None
+        if cache_dir is not None:
+            key = _cache_key(jobs_filename, resources_filename, job_skill_field, resource_skill_field)
+            cache_path = os.path.join(cache_dir, f"ingest-{key}.pickle")
+            try:
+                with open(cache_path, "rb") as cache_file:
+                    jobs, resources = pickle.load(cache_file)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+            instrumentation.count("ingest_cache", result="miss" if jobs is None else "hit")
+
+        if jobs is None:
+            jobs, resources = _project_exports(jobs_filename, resources_filename, job_skill_field,
+                                               resource_skill_field)
+            if cache_path is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                temp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as cache_file:
+                    pickle.dump((jobs, resources), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
+    instrumentation.count("jobs_loaded", len(jobs))
+    instrumentation.count("resources_loaded", len(resources))
+
+    return {
+        "job_ids": [job["id"] for job in jobs],
+        "jobs": jobs,
+        "resource_ids": [res["id"] for res in resources],
+        "resources": resources,
+        "date_range": dict(date_range),
+    }
@@ -0,0 +1,294 @@
+import contextlib
+import contextvars
+import functools
+import io
+import json
+import time
+from typing import Dict, IO, Iterator, List, Optional, Union
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+# Prefix of the metric names in the Prometheus text dump
+METRIC_PREFIX = "auto_scheduler"
+
+
+class Instrumentation:
+    """
+    Collects phase timings, counters, value summaries and solver records for a run.
+
+    Schedulers, loaders and exporters look up the active recorder with
+    `current_instrumentation()`; activate one with `instrument()`. Phases nest,
+    and a nested phase is named after its parents ("optimized/solve"). Counters
+    can carry labels, e.g. the reason a job was skipped. Observed values (such as
+    eligible-set sizes per job) are kept as count/sum/min/max summaries, so memory
+    does not grow with the number of jobs.
+
+    Parameters:
+    - profile: None, "cprofile" or "tracemalloc" to also capture a profile of the run
+    """
+
+    enabled = True
+
+    def __init__(self, profile: Optional[str] = None):
+        if profile is not None and profile not in PROFILE_MODES:
+            raise ValueError(f"Unsupported profile mode: {profile}")
+        self.profile = profile
+        self.phases: Dict[str, List[float]] = {}     # name -> [calls, seconds]
+        self.counters: Dict[tuple, float] = {}       # (name, labels) -> value
+        self.summaries: Dict[str, List[float]] = {}  # name -> [count, sum, min, max]
+        self.events: List[Dict] = []
+        # Profilers are imported on first use, they are not needed to collect metrics
+        self.profile_stats = None  # pstats.Stats of a cProfile capture
+        self.memory: Optional[Dict] = None
+        self._stack: List[str] = []
+        self._profiler = None
+        self._started_tracemalloc = False
+        self._snapshot = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block of work under `name`.
+        """
+        self._stack.append(name)
+        path = "/".join(self._stack)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            totals = self.phases.get(path)
+            if totals is None:
+                self.phases[path] = [1, elapsed]
+            else:
+                totals[0] += 1
+                totals[1] += elapsed
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        """
+        Add `value` to a counter, optionally labelled (e.g. reason="no_eligible_resources").
+        """
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Add a value to the count/sum/min/max summary `name`.
+        """
+        summary = self.summaries.get(name)
+        if summary is None:
+            self.summaries[name] = [1, value, value, value]
+        else:
+            summary[0] += 1
+            summary[1] += value
+            if value < summary[2]:
+                summary[2] = value
+            if value > summary[3]:
+                summary[3] = value
+
+    def record(self, kind: str, **fields) -> None:
+        """
+        Keep a structured record, e.g. the statistics of one solver run.
+        """
+        self.events.append({"type": kind, **fields})
+
+    def count_schedule(self, algorithm: str, job_schedule) -> None:
+        """
+        Count the scheduled jobs, assignments and skipped jobs (by reason) of a schedule.
+        """
+        self.count("jobs_scheduled", len(set(job_schedule.job_index)), algorithm=algorithm)
+        self.count("assignments", len(job_schedule), algorithm=algorithm)
+        for skipped in job_schedule.skipped:
+            self.count("jobs_skipped", algorithm=algorithm, reason=skipped["reason"])
+
+    def start_profile(self) -> None:
+        if self.profile == "cprofile":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.profile == "tracemalloc":
+            import tracemalloc
+            # Leave an outer trace (e.g. the benchmark's) running
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def stop_profile(self, limit: int = 20) -> None:
+        if self._profiler is not None:
+            self._profiler.disable()
+            import pstats
+            self.profile_stats = pstats.Stats(self._profiler)
+            self._profiler = None
+        elif self.profile == "tracemalloc":
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")[:limit]
+            self.memory = {
+                "current_bytes": current,
+                "peak_bytes": peak,
+                "top": [{"location": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                        for stat in top],
+            }
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+    def profile_report(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """
+        Return the cProfile report as text ("" without a cProfile capture).
+        """
+        if self.profile_stats is None:
+            return ""
+        output = io.StringIO()
+        self.profile_stats.stream = output
+        self.profile_stats.sort_stats(sort).print_stats(limit)
+        return output.getvalue()
+
+    def records(self) -> List[Dict]:
+        """
+        Return everything collected as a list of JSON-serializable records.
+        """
+        records = [{"type": "phase", "name": name, "calls": calls, "seconds": seconds}
+                   for name, (calls, seconds) in self.phases.items()]
+        records += [{"type": "counter", "name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in self.counters.items()]
+        records += [{"type": "summary", "name": name, "count": count, "sum": total, "min": low, "max": high,
+                     "mean": total / count}
+                    for name, (count, total, low, high) in self.summaries.items()]
+        records += self.events
+        if self.memory is not None:
+            records.append({"type": "memory", **self.memory})
+        if self.profile_stats is not None:
+            records.append({"type": "profile", "report": self.profile_report()})
+        return records
+
+    def write_json_lines(self, target: Union[str, IO[str]]) -> int:
+        """
+        Write the records as JSON lines to a filename or text file.
+
+        Returns:
+        - Number of records written
+        """
+        records = self.records()
+        lines = "".join(json.dumps(record, separators=(",", ":"), default=str) + "\n" for record in records)
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8") as out_file:
+                out_file.write(lines)
+        else:
+            target.write(lines)
+        return len(records)
+
+    def prometheus_text(self, prefix: str = METRIC_PREFIX) -> str:
+        """
+        Return phases, counters and summaries in the Prometheus text exposition format.
+
+        Solver records and profiles are only part of `records()`.
+        """
+        lines = []
+        if self.phases:
+            lines.append(f"# TYPE {prefix}_phase_seconds summary")
+            for name, (calls, seconds) in self.phases.items():
+                lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {calls}')
+                lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {seconds:.6f}')
+        names = []
+        for name, _ in self.counters:
+            if name not in names:
+                names.append(name)
+        for name in names:
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            for (counter, labels), value in self.counters.items():
+                if counter == name:
+                    lines.append(f"{prefix}_{name}_total{_labels(dict(labels))} {value:g}")
+        for name, (count, total, low, high) in self.summaries.items():
+            lines.append(f"# TYPE {prefix}_{name} summary")
+            lines.append(f"{prefix}_{name}_count {count}")
+            lines.append(f"{prefix}_{name}_sum {total:g}")
+            for bound, value in (("min", low), ("max", high)):
+                lines.append(f"# TYPE {prefix}_{name}_{bound} gauge")
+                lines.append(f"{prefix}_{name}_{bound} {value:g}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class _DisabledInstrumentation:
+    """
+    Stand-in used when no recorder is active: every call is a no-op.
+
+    Hot loops check `enabled` once and skip per-job bookkeeping entirely.
+    """
+
+    enabled = False
+    _null_phase = contextlib.nullcontext()
+
+    def phase(self, name: str):
+        return self._null_phase
+
+    def count(self, name: str, value: float = 1, **labels) -> None:
+        pass
+
+    def observe(self, name: str, value: float) -> None:
+        pass
+
+    def record(self, kind: str, **fields) -> None:
+        pass
+
+    def count_schedule(self, algorithm: str, job_schedule) -> None:
+        pass
+
+
+DISABLED = _DisabledInstrumentation()
+
+_active = contextvars.ContextVar("instrumentation", default=DISABLED)
+
+def _labels(labels: Dict) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+def current_instrumentation() -> Union[Instrumentation, _DisabledInstrumentation]:
+    """
+    Return the active recorder, or a no-op one when instrumentation is off.
+    """
+    return _active.get()
+
+@contextlib.contextmanager
+def instrument(profile: Optional[str] = None) -> Iterator[Instrumentation]:
+    """
+    Record instrumentation for everything run inside the block.
+
+    Parameters:
+    - profile: None, "cprofile" or "tracemalloc" to also capture a profile
+
+    Returns:
+    - The Instrumentation collecting the records
+    """
+    instrumentation = Instrumentation(profile)
+    token = _active.set(instrumentation)
+    instrumentation.start_profile()
+    try:
+        yield instrumentation
+    finally:
+        instrumentation.stop_profile()
+        _active.reset(token)
+
+def instrumented(name: str):
+    """
+    Decorator timing a scheduler as phase `name` and counting its scheduled and skipped jobs.
+
+    The scheduler may return a Schedule or a (Schedule, stats) tuple. When
+    instrumentation is off, the only cost is looking up the active recorder.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            instrumentation = _active.get()
+            if not instrumentation.enabled:
+                return function(*args, **kwargs)
+            with instrumentation.phase(name):
+                result = function(*args, **kwargs)
+            instrumentation.count_schedule(name, result[0] if isinstance(result, tuple) else result)
+            return result
+        return wrapper
+    return decorate
@@ -1,6 +1,48 @@
+import gzip
 import json
+import os
 import random
-from typing import Dict, List, Tuple
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.instrumentation import current_instrumentation
+
+STREAM_FORMATS = ("ndjson", "json")
+GZIP_MAGIC = b"\x1f\x8b"
+
+JOB_NAMES = ["Inspection", "Repair", "Maintenance", "Installation", "Survey", "Configuration"]
+
+# Default location of on-disk caches for derived data
+DEFAULT_CACHE_DIR = os.environ.get(
+    "AUTO_SCHEDULER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "auto-scheduler")
+)
+
+def _export_record(event: Dict, assignment: Dict) -> Dict:
+    """
+    Build the exported representation of one (event, event_assignment) pair.
+    """
+    return {
+        "event": {
+            "name": event["name"],
+            "job_id": event["job_id"],
+            "start_date": event["start_date"],
+            "end_date": event["end_date"],
+            "start_time": event.get("start_time"),
+            "end_time": event.get("end_time"),
+        },
+        "event_assignment": {
+            "id": assignment.get("id"),
+            "event_id": assignment.get("event_id"),
+            "resource_id": assignment["resource_id"],
+            "key": assignment.get("key"),
+        }
+    }
+
+def iter_export_records(job_schedule: Iterable[Tuple[Dict, Dict]]) -> Iterator[Dict]:
+    """
+    Yield the exported representation of every assignment, as written by export_job_schedule_to_json.
+    """
+    for event, assignment in job_schedule:
+        yield _export_record(event, assignment)
 
 def export_job_schedule_to_json(job_schedule: List[Tuple[Dict, Dict]], filename: str) -> None:
     """
@@ -10,30 +52,164 @@ def export_job_schedule_to_json(job_schedule: List[Tuple[Dict, Dict]], filename:
     - job_schedule: The list containing job events and assignments
     - filename: The name of the output JSON file
     """
-    export_data = []
-    for event, assignment in job_schedule:
-        export_data.append({
-            "event": {
-                "name": event["name"],
-                "job_id": event["job_id"],
-                "start_date": event["start_date"],
-                "end_date": event["end_date"],
-                "start_time": event.get("start_time"),
-                "end_time": event.get("end_time"),
-            },
-            "event_assignment": {
-                "id": assignment.get("id"),
-                "event_id": assignment.get("event_id"),
-                "resource_id": assignment["resource_id"],
-                "key": assignment.get("key"),
-            }
-        })
-    
-    with open(filename, "w") as json_file:
-        json.dump(export_data, json_file, indent=4)
+    instrumentation = current_instrumentation()
+    with instrumentation.phase("export"):
+        export_data = []
+        for event, assignment in job_schedule:
+            export_data.append(_export_record(event, assignment))
+
+        with open(filename, "w") as json_file:
+            json.dump(export_data, json_file, indent=4)
+    instrumentation.count("records_exported", len(export_data))
     
     print(f"Job schedule exported successfully to {filename}")
 
+def _open_text(filename: str, mode: str, compress: Optional[str]) -> IO[str]:
+    if compress == "gzip":
+        return gzip.open(filename, mode + "t", encoding="utf-8")
+    if compress is not None:
+        raise ValueError(f"Unsupported compression: {compress}")
+    return open(filename, mode, encoding="utf-8")
+
+def stream_job_schedule_to_file(job_schedule: Iterable[Tuple[Dict, Dict]],
+                                filename: str,
+                                fmt: str = "ndjson",
+                                compress: Optional[str] = None,
+                                chunk_size: int = 1024) -> int:
+    """
+    Stream the job schedule to a file without building an intermediate export list.
+
+    Records are serialized one by one as the schedule yields them and written in
+    chunks of `chunk_size` records, so memory use does not grow with the schedule.
+
+    Parameters:
+    - job_schedule: Iterable of (event, event_assignment) tuples
+    - filename: The name of the output file
+    - fmt: "ndjson" for one compact record per line, or "json" for a compact
+           JSON array with one record per line
+    - compress: None or "gzip"; defaults to "gzip" when filename ends with ".gz"
+    - chunk_size: Number of records buffered between writes
+
+    Returns:
+    - Number of records written
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    if compress is None and filename.endswith(".gz"):
+        compress = "gzip"
+
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    separator = "\n" if fmt == "ndjson" else ",\n"
+    count = 0
+    instrumentation = current_instrumentation()
+    with instrumentation.phase("export"), _open_text(filename, "w", compress) as out_file:
+        if fmt == "json":
+            out_file.write("[\n")
+        chunk = []
+        for event, assignment in job_schedule:
+            chunk.append(encode(_export_record(event, assignment)))
+            if len(chunk) >= chunk_size:
+                out_file.write((separator if count else "") + separator.join(chunk))
+                count += len(chunk)
+                chunk.clear()
+        if chunk:
+            out_file.write((separator if count else "") + separator.join(chunk))
+            count += len(chunk)
+        if fmt == "json":
+            out_file.write("\n]\n")
+        elif count:
+            out_file.write("\n")
+    instrumentation.count("records_exported", count)
+
+    print(f"Job schedule exported successfully to {filename}")
+    return count
+
+def iter_json_array(text_file: IO[str], chunk_size: int = 1 << 16) -> Iterator:
+    """
+    Lazily yield the elements of a top-level JSON array read from a text file.
+
+    The file is read `chunk_size` characters at a time, so only the current
+    element has to fit in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = text_file.read(chunk_size)
+    position = 0
+    eof = not buffer
+    expect_open = True
+
+    while True:
+        # Skip whitespace and separators, reading more data when needed
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer = text_file.read(chunk_size)
+            position = 0
+            eof = not buffer
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON array")
+
+        if expect_open:
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array")
+            position += 1
+            expect_open = False
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = text_file.read(chunk_size)
+            eof = not more
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+        if not eof and (end >= len(buffer) or buffer[end] not in " \t\r\n,]"):
+            # A number cut by the chunk boundary ("123" of "12345") decodes too; only an
+            # element followed by a separator is known to be complete
+            more = text_file.read(chunk_size)
+            eof = not more
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+        yield item
+        position = end
+        if position >= chunk_size:
+            buffer = buffer[position:]
+            position = 0
+
+def iter_job_schedule_from_file(filename: str) -> Iterator[Tuple[Dict, Dict]]:
+    """
+    Lazily load an exported job schedule as (event, event_assignment) tuples.
+
+    Reads NDJSON and JSON array exports, gzip-compressed or not, including files
+    written by `export_job_schedule_to_json`.
+
+    Parameters:
+    - filename: The name of the exported file
+    """
+    with open(filename, "rb") as raw_file:
+        compress = "gzip" if raw_file.read(2) == GZIP_MAGIC else None
+
+    with _open_text(filename, "r", compress) as in_file:
+        first = in_file.read(1)
+        while first and first.isspace():
+            first = in_file.read(1)
+        if not first:
+            return
+        in_file.seek(0)
+        if first == "[":
+            records = iter_json_array(in_file)
+        else:
+            records = (json.loads(line) for line in in_file if line.strip())
+        for record in records:
+            yield record["event"], record["event_assignment"]
+
 def generate_random_name() -> str:
     """
     Generate a random job name.
@@ -41,5 +217,4 @@ def generate_random_name() -> str:
     Returns:
     - A randomly selected job name
     """
-    names = ["Inspection", "Repair", "Maintenance", "Installation", "Survey", "Configuration"]
-    return random.choice(names)
\ No newline at end of file
+    return random.choice(JOB_NAMES)
\ No newline at end of file
@@ -0,0 +1,209 @@
+from array import array
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.utils.dates import DayCalendar
+
+TIME_FORMAT = "%H:%M"
+
+# Reasons a scheduler leaves a job out, as recorded in Schedule.skipped
+SKIP_NO_ELIGIBLE_RESOURCES = "no_eligible_resources"
+SKIP_NOT_ENOUGH_RESOURCES = "not_enough_resources"
+SKIP_NO_AVAILABILITY = "no_availability_in_range"
+
+def format_minute(minute: int) -> Optional[str]:
+    """
+    Format minutes since midnight as "HH:MM" (None for a negative value, meaning no time).
+    """
+    if minute < 0:
+        return None
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+def parse_minute(time_string: str) -> int:
+    """
+    Parse an "HH:MM" string into minutes since midnight.
+    """
+    parsed = datetime.strptime(time_string, TIME_FORMAT)
+    return parsed.hour * 60 + parsed.minute
+
+def make_event(job_id, start_date: str, end_date: str,
+               start_time: Optional[str] = None, end_time: Optional[str] = None) -> Dict:
+    """
+    Build an event dictionary.
+    """
+    return {
+        "name": f"Job {job_id}",
+        "job_id": job_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "start_time": start_time,
+        "end_time": end_time
+    }
+
+def make_event_assignment(resource_id) -> Dict:
+    """
+    Build an event_assignment dictionary.
+    """
+    return {
+        "id": None,
+        "event_id": None,
+        "resource_id": resource_id,
+        "key": None
+    }
+
+
+class ScheduleRow:
+    """
+    Lightweight view of one assignment in a `Schedule`.
+    """
+
+    __slots__ = ("_schedule", "_position")
+
+    def __init__(self, schedule: "Schedule", position: int):
+        self._schedule = schedule
+        self._position = position
+
+    @property
+    def job_index(self) -> int:
+        return self._schedule.job_index[self._position]
+
+    @property
+    def resource_index(self) -> int:
+        return self._schedule.resource_index[self._position]
+
+    @property
+    def day(self) -> int:
+        return self._schedule.day[self._position]
+
+    @property
+    def end_day(self) -> int:
+        return self._schedule.end_day[self._position]
+
+    @property
+    def start_minute(self) -> int:
+        return self._schedule.start_minute[self._position]
+
+    @property
+    def end_minute(self) -> int:
+        return self._schedule.end_minute[self._position]
+
+    @property
+    def job_id(self):
+        return self._schedule.job_ids[self.job_index]
+
+    @property
+    def resource_id(self):
+        return self._schedule.resource_ids[self.resource_index]
+
+    @property
+    def start_date(self) -> str:
+        return self._schedule.calendar.iso(self.day)
+
+    @property
+    def end_date(self) -> str:
+        return self._schedule.calendar.iso(self.end_day)
+
+    def event(self) -> Dict:
+        """
+        Build the event dictionary for this row.
+        """
+        return make_event(self.job_id, self.start_date, self.end_date,
+                          format_minute(self.start_minute), format_minute(self.end_minute))
+
+    def event_assignment(self) -> Dict:
+        """
+        Build the event_assignment dictionary for this row.
+        """
+        return make_event_assignment(self.resource_id)
+
+    def as_tuple(self) -> Tuple[Dict, Dict]:
+        return self.event(), self.event_assignment()
+
+    def __repr__(self) -> str:
+        return f"ScheduleRow(job_id={self.job_id!r}, resource_id={self.resource_id!r}, date={self.start_date!r})"
+
+
+class Schedule(Sequence):
+    """
+    Columnar job schedule.
+
+    Assignments are stored as parallel integer arrays of job index, resource index,
+    first and last day offset and start/end minute (minutes since midnight, -1 when
+    the assignment has no time of day). Indexing or iterating the schedule yields the usual
+    (event, event_assignment) tuples, built on access, so it can be used wherever a
+    `List[Tuple[Dict, Dict]]` schedule is expected.
+
+    Jobs a scheduler could not place are listed in `skipped` as {"job_id",
+    "reason"} dictionaries, with one of the SKIP_* reasons.
+
+    Parameters:
+    - job_ids: Job ids referenced by the job index column
+    - resource_ids: Resource ids referenced by the resource index column
+    - calendar: Calendar the day column is relative to
+    """
+
+    __slots__ = ("job_ids", "resource_ids", "calendar", "job_index", "resource_index", "day", "end_day",
+                 "start_minute", "end_minute", "skipped")
+
+    def __init__(self, job_ids: List, resource_ids: List, calendar: DayCalendar):
+        self.job_ids = job_ids
+        self.resource_ids = resource_ids
+        self.calendar = calendar
+        self.job_index = array("i")
+        self.resource_index = array("i")
+        self.day = array("i")
+        self.end_day = array("i")
+        self.start_minute = array("i")
+        self.end_minute = array("i")
+        self.skipped: List[Dict] = []
+
+    def append(self, job_index: int, resource_index: int, day: int, end_day: Optional[int] = None,
+               start_minute: int = -1, end_minute: int = -1) -> None:
+        """
+        Record that job `job_index` is assigned to resource `resource_index` from `day`
+        to `end_day` (the same day by default), optionally between two times of day.
+        """
+        self.job_index.append(job_index)
+        self.resource_index.append(resource_index)
+        self.day.append(day)
+        self.end_day.append(day if end_day is None else end_day)
+        self.start_minute.append(start_minute)
+        self.end_minute.append(end_minute)
+
+    def skip(self, job_index: int, reason: str) -> None:
+        """
+        Record that job `job_index` was left out of the schedule, and why.
+        """
+        self.skipped.append({"job_id": self.job_ids[job_index], "reason": reason})
+
+    def row(self, position: int) -> ScheduleRow:
+        if position < 0:
+            position += len(self.day)
+        if not 0 <= position < len(self.day):
+            raise IndexError("schedule index out of range")
+        return ScheduleRow(self, position)
+
+    def rows(self) -> Iterator[ScheduleRow]:
+        for position in range(len(self.day)):
+            yield ScheduleRow(self, position)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.row(i).as_tuple() for i in range(*position.indices(len(self.day)))]
+        return self.row(position).as_tuple()
+
+    def __iter__(self) -> Iterator[Tuple[Dict, Dict]]:
+        for position in range(len(self.day)):
+            yield ScheduleRow(self, position).as_tuple()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Schedule, list, tuple)):
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Schedule({len(self)} assignments, {self.calendar.num_days} days)"
@@ -0,0 +1,61 @@
+from typing import Dict, Iterable, List, Tuple
+
+
+class SkillIndex:
+    """
+    Bitmask index over resource skills.
+
+    Every distinct skill is interned to a single integer bit and each resource's
+    skills are stored as a bitmask, so eligibility becomes `mask & required == required`.
+    The eligible resources for each distinct required-skill mask are computed once
+    and memoized.
+
+    Parameters:
+    - resources: List of resource dictionaries with "id" and "skills"
+    """
+
+    def __init__(self, resources: List[Dict]):
+        self.resources = resources
+        self.skill_bits: Dict[str, int] = {}
+        self.resource_masks: List[int] = [self.mask_for(res["skills"]) for res in resources]
+        self._eligible_cache: Dict[int, Tuple[int, ...]] = {}
+
+    def mask_for(self, skills: Iterable[str]) -> int:
+        """
+        Return the bitmask for a collection of skills, interning unseen skills.
+
+        A skill that no resource has still gets its own bit, which makes any mask
+        containing it match no resource.
+        """
+        mask = 0
+        skill_bits = self.skill_bits
+        for skill in skills:
+            bit = skill_bits.get(skill)
+            if bit is None:
+                bit = skill_bits[skill] = 1 << len(skill_bits)
+            mask |= bit
+        return mask
+
+    def eligible_indices_for_mask(self, mask: int) -> Tuple[int, ...]:
+        """
+        Return the positions (in resource order) of the resources covering `mask`.
+        """
+        eligible = self._eligible_cache.get(mask)
+        if eligible is None:
+            eligible = tuple(
+                i for i, res_mask in enumerate(self.resource_masks) if res_mask & mask == mask
+            )
+            self._eligible_cache[mask] = eligible
+        return eligible
+
+    def eligible_indices(self, required_skills: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Return the positions (in resource order) of the resources having all required skills.
+        """
+        return self.eligible_indices_for_mask(self.mask_for(required_skills))
+
+    def eligible_resources(self, required_skills: Iterable[str]) -> List[Dict]:
+        """
+        Return the resource dictionaries having all required skills, in resource order.
+        """
+        return [self.resources[i] for i in self.eligible_indices(required_skills)]
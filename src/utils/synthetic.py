@@ -0,0 +1,122 @@
+import math
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+
+from src.utils.dates import DATE_FORMAT
+from src.utils.io import JOB_NAMES
+
+# Benchmark tenant sizes: (jobs, resources, skills, horizon in days)
+TENANT_SIZES = {
+    "tiny": (10, 2, 3, 5),
+    "small": (100, 10, 5, 14),
+    "medium": (1_000, 100, 10, 30),
+    "large": (10_000, 500, 20, 60),
+    "xlarge": (100_000, 5_000, 40, 90),
+}
+
+def generate_tenant(num_jobs: int,
+                    num_resources: int,
+                    num_skills: int = 10,
+                    horizon_days: int = 30,
+                    seed: int = 0,
+                    start_date: str = "2024-01-01",
+                    center: tuple = (44.98, -93.27),
+                    radius_km: float = 150.0,
+                    num_towns: int = 8) -> Dict:
+    """
+    Generate a reproducible synthetic tenant in the schedulers' input format.
+
+    Skills follow a Zipf-like popularity, so a few skills are common and most
+    are specialist ones. Jobs and home bases are scattered around a handful of
+    towns within `radius_km` of `center`. Jobs get durations, priorities and
+    crew sizes; resources get daily hours and a cost per day.
+
+    Parameters:
+    - num_jobs: Number of jobs
+    - num_resources: Number of resources
+    - num_skills: Number of distinct skills
+    - horizon_days: Length of the date range in days
+    - seed: Random seed; the same arguments always give the same tenant
+    - start_date: First day of the date range ("YYYY-MM-DD")
+    - center: (latitude, longitude) of the service area
+    - radius_km: Radius of the service area
+    - num_towns: Number of towns jobs and home bases cluster around
+
+    Returns:
+    - Dictionary with job_ids, jobs, resources and date_range
+    """
+    rng = np.random.default_rng(seed)
+    skills = np.array([f"Skill_{k:03d}" for k in range(max(num_skills, 1))])
+    popularity = 1.0 / np.arange(1, len(skills) + 1)
+    popularity /= popularity.sum()
+
+    # Towns around the center, then points around the towns
+    km_per_degree = 111.32
+    town_angle = rng.uniform(0, 2 * math.pi, num_towns)
+    town_distance = radius_km * np.sqrt(rng.uniform(0, 1, num_towns))
+    town_lat = center[0] + town_distance * np.sin(town_angle) / km_per_degree
+    town_lon = center[1] + town_distance * np.cos(town_angle) / (km_per_degree * math.cos(math.radians(center[0])))
+
+    def scatter(count: int):
+        town = rng.integers(0, num_towns, count)
+        lat = town_lat[town] + rng.normal(0, 10 / km_per_degree, count)
+        lon = town_lon[town] + rng.normal(0, 10 / km_per_degree, count) / math.cos(math.radians(center[0]))
+        return np.round(lat, 6), np.round(lon, 6)
+
+    # Every resource has the most common skill plus a few others
+    resource_skill_counts = rng.integers(1, min(4, len(skills)) + 1, num_resources)
+    resource_lat, resource_lon = scatter(num_resources)
+    resources = []
+    for r in range(num_resources):
+        extra = rng.choice(len(skills), resource_skill_counts[r], replace=False, p=popularity)
+        resources.append({
+            "id": f"R{seed:03d}{r:06d}",
+            "skills": sorted({str(skills[0]), *(str(s) for s in skills[extra])}),
+            "latitude": float(resource_lat[r]),
+            "longitude": float(resource_lon[r]),
+            "max_hours": float(rng.choice([6.0, 8.0, 8.0, 9.0])),
+            "cost_per_day": int(rng.integers(100, 301)),
+        })
+
+    job_skill_counts = rng.choice([0, 1, 1, 1, 2], num_jobs)
+    job_skills = rng.choice(len(skills), (num_jobs, 2), p=popularity)
+    durations = rng.choice([0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 8.0, 16.0], num_jobs,
+                           p=[0.1, 0.25, 0.15, 0.2, 0.1, 0.1, 0.07, 0.03])
+    crew_sizes = rng.choice([1, 1, 1, 1, 2, 2, 3], num_jobs)
+    priorities = rng.random(num_jobs) < 0.3
+    customer_priorities = rng.random(num_jobs) < 0.2
+    names = rng.integers(0, len(JOB_NAMES), num_jobs)
+    job_lat, job_lon = scatter(num_jobs)
+    jobs = []
+    for j in range(num_jobs):
+        jobs.append({
+            "id": f"J{seed:03d}{j:07d}",
+            "name": JOB_NAMES[names[j]],
+            "required_skills": sorted({str(s) for s in skills[job_skills[j, :job_skill_counts[j]]]}),
+            "estimated_duration": float(durations[j]),
+            "latitude": float(job_lat[j]),
+            "longitude": float(job_lon[j]),
+            "priority": "high" if priorities[j] else "low",
+            "customer_priority": "high" if customer_priorities[j] else "low",
+            "resource_count": int(crew_sizes[j]),
+        })
+
+    first_day = datetime.strptime(start_date, DATE_FORMAT)
+    return {
+        "job_ids": [job["id"] for job in jobs],
+        "jobs": jobs,
+        "resources": resources,
+        "date_range": {
+            "start_date": first_day.strftime(DATE_FORMAT),
+            "end_date": (first_day + timedelta(days=max(horizon_days, 1) - 1)).strftime(DATE_FORMAT),
+        },
+    }
+
+def generate_sized_tenant(size: str, seed: int = 0) -> Dict:
+    """
+    Generate one of the TENANT_SIZES presets.
+    """
+    num_jobs, num_resources, num_skills, horizon_days = TENANT_SIZES[size]
+    return generate_tenant(num_jobs, num_resources, num_skills, horizon_days, seed=seed)
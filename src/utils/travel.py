@@ -0,0 +1,245 @@
+import hashlib
+import math
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.io import DEFAULT_CACHE_DIR
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Length of one degree of latitude
+KM_PER_DEGREE = math.radians(EARTH_RADIUS_KM)
+
+# Straight-line distance is scaled by a road detour factor to estimate driving
+DEFAULT_SPEED_KMH = 50.0
+DEFAULT_ROAD_FACTOR = 1.3
+
+def haversine_matrix(lat_a: np.ndarray, lon_a: np.ndarray,
+                     lat_b: Optional[np.ndarray] = None, lon_b: Optional[np.ndarray] = None,
+                     dtype=np.float32, block_size: int = 2048,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute great-circle distances (km) between two sets of coordinates.
+
+    Rows are computed `block_size` at a time so temporaries stay bounded for
+    large inputs, and written into `out` (e.g. a memmap) when given.
+
+    Parameters:
+    - lat_a, lon_a: Row coordinates in degrees
+    - lat_b, lon_b: Column coordinates in degrees; defaults to the row coordinates
+    - dtype: Output dtype
+    - block_size: Number of rows computed per block
+    - out: Optional preallocated (len(a), len(b)) output array
+
+    Returns:
+    - Distance matrix in kilometres; NaN where a coordinate is missing
+    """
+    lat_a = np.radians(np.asarray(lat_a, dtype=np.float64))
+    lon_a = np.radians(np.asarray(lon_a, dtype=np.float64))
+    if lat_b is None:
+        lat_b, lon_b = lat_a, lon_a
+    else:
+        lat_b = np.radians(np.asarray(lat_b, dtype=np.float64))
+        lon_b = np.radians(np.asarray(lon_b, dtype=np.float64))
+
+    if out is None:
+        out = np.empty((len(lat_a), len(lat_b)), dtype=dtype)
+    cos_b = np.cos(lat_b)[np.newaxis, :]
+
+    for start in range(0, len(lat_a), block_size):
+        stop = min(start + block_size, len(lat_a))
+        block_lat = lat_a[start:stop, np.newaxis]
+        block_lon = lon_a[start:stop, np.newaxis]
+        half_dlat = np.sin((lat_b[np.newaxis, :] - block_lat) * 0.5)
+        half_dlon = np.sin((lon_b[np.newaxis, :] - block_lon) * 0.5)
+        a = half_dlat * half_dlat + np.cos(block_lat) * cos_b * half_dlon * half_dlon
+        out[start:stop] = 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    return out
+
+def haversine_km(lat_a: float, lon_a: float, lat_b: float, lon_b: float) -> float:
+    """
+    Great-circle distance in km between two points given in degrees.
+    """
+    half_dlat = math.sin(math.radians(lat_b - lat_a) * 0.5)
+    half_dlon = math.sin(math.radians(lon_b - lon_a) * 0.5)
+    a = half_dlat * half_dlat + math.cos(math.radians(lat_a)) * math.cos(math.radians(lat_b)) * half_dlon * half_dlon
+    return 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+def node_coordinates(jobs: List[Dict], resources: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return latitude and longitude arrays for jobs followed by resource home bases.
+
+    Missing coordinates become NaN.
+    """
+    records = list(jobs) + list(resources)
+    lat = np.array([np.nan if rec.get("latitude") is None else rec["latitude"] for rec in records],
+                   dtype=np.float64)
+    lon = np.array([np.nan if rec.get("longitude") is None else rec["longitude"] for rec in records],
+                   dtype=np.float64)
+    return lat, lon
+
+class TravelMatrix:
+    """
+    All-pairs distances between jobs and technician home bases.
+
+    Nodes are the jobs in order followed by the resources' home bases, so
+    `distance_km[i][j]` uses the same layout as the routing solver's
+    distance_matrix. Distances involving a node without coordinates are 0.
+
+    Parameters:
+    - job_ids: Job ids, in node order
+    - resource_ids: Resource ids, in home-base node order
+    - distance_km: (N, N) distance matrix, possibly a read-only memmap
+    - speed_kmh: Average driving speed used for drive times
+    - road_factor: Detour factor applied to straight-line distance for drive times
+    """
+
+    __slots__ = ("job_ids", "resource_ids", "distance_km", "speed_kmh", "road_factor", "_job_nodes",
+                 "_home_nodes")
+
+    def __init__(self, job_ids: List, resource_ids: List, distance_km: np.ndarray,
+                 speed_kmh: float = DEFAULT_SPEED_KMH, road_factor: float = DEFAULT_ROAD_FACTOR):
+        self.job_ids = job_ids
+        self.resource_ids = resource_ids
+        self.distance_km = distance_km
+        self.speed_kmh = speed_kmh
+        self.road_factor = road_factor
+        self._job_nodes = {job_id: i for i, job_id in enumerate(job_ids)}
+        self._home_nodes = {res_id: len(job_ids) + i for i, res_id in enumerate(resource_ids)}
+
+    def job_node(self, job_id) -> int:
+        return self._job_nodes[job_id]
+
+    def home_node(self, resource_id) -> int:
+        return self._home_nodes[resource_id]
+
+    def drive_minutes(self, rows=slice(None), cols=slice(None)) -> np.ndarray:
+        """
+        Estimated drive time in minutes for a block of the matrix (all of it by default).
+        """
+        scale = np.float32(60.0 * self.road_factor / self.speed_kmh)
+        return self.distance_km[rows, cols] * scale
+
+def _coordinate_key(lat: np.ndarray, lon: np.ndarray, dtype) -> str:
+    digest = hashlib.sha256()
+    digest.update(np.dtype(dtype).str.encode())
+    digest.update(np.ascontiguousarray(lat).tobytes())
+    digest.update(np.ascontiguousarray(lon).tobytes())
+    return digest.hexdigest()
+
+def build_travel_matrix(jobs: List[Dict],
+                        resources: List[Dict],
+                        speed_kmh: float = DEFAULT_SPEED_KMH,
+                        road_factor: float = DEFAULT_ROAD_FACTOR,
+                        dtype=np.float32,
+                        block_size: int = 2048,
+                        cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> TravelMatrix:
+    """
+    Build the travel matrix over jobs and resource home bases.
+
+    The distance matrix is cached on disk as a raw `np.memmap` keyed by the hash
+    of the coordinate set, so later runs (and other processes) over the same
+    locations map the file instead of recomputing it.
+
+    Parameters:
+    - jobs: Job dictionaries with "id", "latitude" and "longitude"
+    - resources: Resource dictionaries with "id" and home-base "latitude"/"longitude"
+    - speed_kmh: Average driving speed used for drive times
+    - road_factor: Detour factor applied to straight-line distance for drive times
+    - dtype: Storage dtype of the matrix
+    - block_size: Number of rows computed per block
+    - cache_dir: Cache directory, or None to keep the matrix in memory only
+
+    Returns:
+    - TravelMatrix
+    """
+    lat, lon = node_coordinates(jobs, resources)
+    size = len(lat)
+    job_ids = [job["id"] for job in jobs]
+    resource_ids = [res["id"] for res in resources]
+
+    if cache_dir is None or size == 0:
+        distance = haversine_matrix(lat, lon, dtype=dtype, block_size=block_size)
+        np.nan_to_num(distance, copy=False)
+        return TravelMatrix(job_ids, resource_ids, distance, speed_kmh, road_factor)
+
+    cache_path = os.path.join(cache_dir, f"travel-{_coordinate_key(lat, lon, dtype)}-{size}.bin")
+    if not os.path.exists(cache_path):
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        distance = np.memmap(temp_path, dtype=dtype, mode="w+", shape=(size, size))
+        haversine_matrix(lat, lon, dtype=dtype, block_size=block_size, out=distance)
+        np.nan_to_num(distance, copy=False)
+        distance.flush()
+        del distance
+        os.replace(temp_path, cache_path)
+
+    distance = np.memmap(cache_path, dtype=dtype, mode="r", shape=(size, size))
+    return TravelMatrix(job_ids, resource_ids, distance, speed_kmh, road_factor)
+
+
+class SpatialGrid:
+    """
+    Uniform grid index over points, for finding the points near a location.
+
+    Coordinates are projected equirectangularly around `reference_lat` and
+    bucketed into square cells of `cell_km`. `rings` walks the cells outwards
+    from a location one ring at a time, so callers look at nearby points first
+    and stop as soon as they have enough, instead of scanning every point.
+
+    Parameters:
+    - cell_km: Cell side in km
+    - reference_lat: Latitude at which the projection is true to scale
+    """
+
+    __slots__ = ("cell_km", "cells", "_x_scale", "_y_scale", "_bounds")
+
+    def __init__(self, cell_km: float, reference_lat: float):
+        self.cell_km = cell_km
+        self.cells: Dict[Tuple[int, int], List] = {}
+        self._x_scale = KM_PER_DEGREE * max(math.cos(math.radians(reference_lat)), 1e-6) / cell_km
+        self._y_scale = KM_PER_DEGREE / cell_km
+        self._bounds = None  # (min x, max x, min y, max y) of the occupied cells
+
+    def cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lon * self._x_scale), math.floor(lat * self._y_scale)
+
+    def add(self, item, lat: float, lon: float) -> None:
+        """
+        Index `item` at a location.
+        """
+        cell = self.cell_of(lat, lon)
+        self.cells.setdefault(cell, []).append(item)
+        x, y = cell
+        if self._bounds is None:
+            self._bounds = (x, x, y, y)
+        else:
+            min_x, max_x, min_y, max_y = self._bounds
+            self._bounds = (min(min_x, x), max(max_x, x), min(min_y, y), max(max_y, y))
+
+    def rings(self, lat: float, lon: float) -> Iterator[List]:
+        """
+        Yield the items of the cells around a location, ring by ring outwards.
+
+        Ring k holds the cells k steps away from the location's cell, so its
+        items are at least (k - 1) * cell_km away. Iteration ends once the rings
+        cover every occupied cell.
+        """
+        if self._bounds is None:
+            return
+        cx, cy = self.cell_of(lat, lon)
+        min_x, max_x, min_y, max_y = self._bounds
+        last_ring = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy)
+        cells = self.cells
+        yield list(cells.get((cx, cy), ()))
+        for k in range(1, last_ring + 1):
+            items = []
+            for x in range(cx - k, cx + k + 1):
+                for y in (cy - k, cy + k):
+                    items.extend(cells.get((x, y), ()))
+            for y in range(cy - k + 1, cy + k):
+                for x in (cx - k, cx + k):
+                    items.extend(cells.get((x, y), ()))
+            yield items
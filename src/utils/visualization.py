@@ -1,16 +1,32 @@
-import matplotlib.pyplot as plt
-import pandas as pd
+import html
+import json
+import os
+import numpy as np
 import textwrap
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from src.utils.dates import DayCalendar
+from src.utils.schedule import Schedule
+
+HEADLESS_FORMATS = ("png", "svg", "html")
 
 def visualize_job_assignments(job_schedule: List[Tuple[Dict, Dict]], 
                             resources: List[Dict], 
                             date_range: Dict, 
                             jobs: List[Dict], 
-                            title: str) -> None:
+                            title: str,
+                            output_dir: Optional[str] = None,
+                            formats: Sequence[str] = ("png", "html")) -> Optional[List[str]]:
     """
     Create a visualization of job assignments with enhanced labels.
+
+    With `output_dir`, runs headless instead: the schedule is rendered to files
+    (an occupancy heatmap and/or a paged HTML table) without opening a window,
+    which scales to hundreds of resources over long date ranges.
     
     Parameters:
     - job_schedule: List of (event, event_assignment) tuples
@@ -18,7 +34,19 @@ def visualize_job_assignments(job_schedule: List[Tuple[Dict, Dict]],
     - date_range: Dictionary with start_date and end_date
     - jobs: List of job dictionaries
     - title: Title for the visualization
+    - output_dir: Directory to write files to instead of showing the figure
+    - formats: Files to write in headless mode: "png", "svg" and/or "html"
+
+    Returns:
+    - Paths of the written files in headless mode, otherwise None
     """
+    if output_dir is not None:
+        return render_job_assignments(job_schedule, resources, date_range, jobs, title, output_dir, formats)
+
+    # pyplot (and its GUI backend) and pandas are only needed to show the figure
+    import matplotlib.pyplot as plt
+    import pandas as pd
+
     start_date = datetime.strptime(date_range["start_date"], "%Y-%m-%d")
     end_date = datetime.strptime(date_range["end_date"], "%Y-%m-%d")
     dates = pd.date_range(start=start_date, end=end_date)
@@ -71,4 +99,249 @@ def visualize_job_assignments(job_schedule: List[Tuple[Dict, Dict]],
         cell.set_height(0.08)
         cell.set_width(0.1)
 
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def _schedule_cells(job_schedule, resource_ids: List, calendar: DayCalendar,
+                    job_ids: Optional[List] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return (resource position, day, job position) arrays with one entry per day an assignment covers.
+    """
+    if isinstance(job_schedule, Schedule) and job_schedule.resource_ids == resource_ids and \
+            (job_ids is None or job_schedule.job_ids == job_ids):
+        shift = (job_schedule.calendar.start_date - calendar.start_date).days
+        resource_index = np.frombuffer(job_schedule.resource_index, dtype=np.int32)
+        job_index = np.frombuffer(job_schedule.job_index, dtype=np.int32)
+        day = np.frombuffer(job_schedule.day, dtype=np.int32) + shift
+        end_day = np.frombuffer(job_schedule.end_day, dtype=np.int32) + shift
+    else:
+        resource_position = {res_id: r for r, res_id in enumerate(resource_ids)}
+        job_position = {job_id: j for j, job_id in enumerate(job_ids or [])}
+        day_of = {}
+        rows = []
+        for event, assignment in job_schedule:
+            for iso_date in (event["start_date"], event["end_date"]):
+                if iso_date not in day_of:
+                    day_of[iso_date] = calendar.day_of(iso_date)
+            rows.append((resource_position[assignment["resource_id"]], day_of[event["start_date"]],
+                         day_of[event["end_date"]], job_position.get(event["job_id"], -1)))
+        table = np.array(rows, dtype=np.int64).reshape(-1, 4)
+        resource_index, day, end_day, job_index = table.T
+
+    span = np.maximum(end_day - day + 1, 1)
+    row = np.repeat(np.arange(len(day)), span)
+    offset = np.arange(len(row)) - np.repeat(np.cumsum(span) - span, span)
+    return (np.asarray(resource_index, dtype=np.intp)[row], np.asarray(day, dtype=np.int64)[row] + offset,
+            np.asarray(job_index, dtype=np.intp)[row])
+
+def occupancy_grid(job_schedule, resource_ids: List, date_range: Dict) -> np.ndarray:
+    """
+    Count the jobs of every resource on every day.
+
+    Parameters:
+    - job_schedule: Schedule or list of (event, event_assignment) tuples
+    - resource_ids: Resource ids, in row order
+    - date_range: Dictionary with start_date and end_date
+
+    Returns:
+    - (resources, days) integer matrix; days outside the range are ignored
+    """
+    calendar = DayCalendar(date_range)
+    resource_index, day, _ = _schedule_cells(job_schedule, resource_ids, calendar)
+    grid = np.zeros((len(resource_ids), calendar.num_days), dtype=np.int32)
+    in_range = (day >= 0) & (day < calendar.num_days)
+    np.add.at(grid, (resource_index[in_range], day[in_range]), 1)
+    return grid
+
+def render_occupancy_heatmap(grid: np.ndarray, filename: str, resource_labels: Optional[List[str]] = None,
+                             date_labels: Optional[List[str]] = None, title: str = "",
+                             max_labels: int = 40) -> str:
+    """
+    Render an occupancy grid as a heatmap image without a display.
+
+    The figure size is capped, so very large grids are downsampled by the image
+    rather than producing an enormous figure. The format follows the file extension.
+
+    Parameters:
+    - grid: (resources, days) matrix from occupancy_grid
+    - filename: Output path ending in .png or .svg
+    - resource_labels: Row labels
+    - date_labels: Column labels
+    - title: Figure title
+    - max_labels: Maximum number of tick labels per axis
+
+    Returns:
+    - The output path
+    """
+    num_resources, num_days = grid.shape
+    width = min(max(6.0, 2.0 + 0.15 * num_days), 30.0)
+    height = min(max(4.0, 1.5 + 0.12 * num_resources), 40.0)
+    figure = Figure(figsize=(width, height))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(1, 1, 1)
+    image = ax.imshow(grid, aspect="auto", interpolation="nearest", cmap="Blues",
+                      vmin=0, vmax=max(int(grid.max()) if grid.size else 1, 1))
+    figure.colorbar(image, ax=ax, label="Jobs")
+    ax.set_title(title, fontsize=12, weight="bold")
+    for labels, count, set_ticks, set_labels, rotation in (
+            (date_labels, num_days, ax.set_xticks, ax.set_xticklabels, 90),
+            (resource_labels, num_resources, ax.set_yticks, ax.set_yticklabels, 0)):
+        if labels is None or not count:
+            continue
+        ticks = np.arange(0, count, max(1, -(-count // max_labels)))
+        set_ticks(ticks)
+        set_labels([str(labels[t]) for t in ticks], fontsize=7, rotation=rotation)
+    figure.tight_layout()
+    figure.savefig(filename)
+    return filename
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 1em; }}
+table {{ border-collapse: collapse; font-size: 12px; }}
+th, td {{ border: 1px solid #ccc; padding: 2px 4px; vertical-align: top; white-space: pre-line; }}
+th {{ background: #eee; position: sticky; top: 0; }}
+td.busy {{ background: lightblue; }}
+td.free {{ background: beige; }}
+#controls {{ margin: 0.5em 0; }}
+</style>
+</head>
+<body>
+<h2>{title}</h2>
+<div id="controls">
+<button id="prev">&larr; Previous</button>
+<span id="page"></span>
+<button id="next">Next &rarr;</button>
+<input id="filter" placeholder="Filter resources"/>
+</div>
+<table><thead id="head"></thead><tbody id="body"></tbody></table>
+<script id="schedule-data" type="application/json">{data}</script>
+<script>
+(function () {{
+  var data = JSON.parse(document.getElementById("schedule-data").textContent);
+  var pageSize = data.page_size, page = 0, rows = data.resources.map(function (_, r) {{ return r; }});
+  // Cells grouped by resource once, so each page only renders its own rows
+  var cells = data.resources.map(function () {{ return {{}}; }});
+  data.cells.forEach(function (cell) {{
+    var byDay = cells[cell[0]];
+    (byDay[cell[1]] = byDay[cell[1]] || []).push(cell[2]);
+  }});
+  function esc(text) {{
+    var node = document.createElement("span"); node.textContent = text; return node.innerHTML;
+  }}
+  document.getElementById("head").innerHTML = "<tr><th>Resource</th>" +
+    data.dates.map(function (d) {{ return "<th>" + d + "</th>"; }}).join("") + "</tr>";
+  function render() {{
+    var pages = Math.max(1, Math.ceil(rows.length / pageSize));
+    page = Math.min(Math.max(page, 0), pages - 1);
+    var html = [];
+    rows.slice(page * pageSize, (page + 1) * pageSize).forEach(function (r) {{
+      var res = data.resources[r], line = ["<tr><th>" + esc(res[0]) + "<br/>(" + esc(res[1]) + ")</th>"];
+      for (var d = 0; d < data.dates.length; d++) {{
+        var jobs = cells[r][d];
+        line.push(jobs ? "<td class=busy>" + jobs.map(function (j) {{
+          return esc(data.jobs[j][0] + " (" + data.jobs[j][1] + ")");
+        }}).join("\n") + "</td>" : "<td class=free></td>");
+      }}
+      html.push(line.join("") + "</tr>");
+    }});
+    document.getElementById("body").innerHTML = html.join("");
+    document.getElementById("page").textContent = "Page " + (page + 1) + " of " + pages +
+      " (" + rows.length + " resources)";
+  }}
+  document.getElementById("prev").onclick = function () {{ page--; render(); }};
+  document.getElementById("next").onclick = function () {{ page++; render(); }};
+  document.getElementById("filter").oninput = function (e) {{
+    var needle = e.target.value.toLowerCase();
+    rows = [];
+    data.resources.forEach(function (res, r) {{
+      if ((res[0] + " " + res[1]).toLowerCase().indexOf(needle) >= 0) rows.push(r);
+    }});
+    page = 0; render();
+  }};
+  render();
+}})();
+</script>
+</body>
+</html>
+"""
+
+def write_schedule_html(job_schedule, resources: List[Dict], date_range: Dict, jobs: List[Dict],
+                        filename: str, title: str = "", page_size: int = 50) -> str:
+    """
+    Write a paged HTML view of the schedule.
+
+    The schedule is embedded once as compact JSON (one [resource, day, job]
+    triple per occupied cell) and the page renders only the rows of the current
+    page, so the file stays small and the browser stays responsive for
+    thousands of resources. Resources can be filtered by id or skill.
+
+    Parameters:
+    - job_schedule: Schedule or list of (event, event_assignment) tuples
+    - resources: List of resource dictionaries
+    - date_range: Dictionary with start_date and end_date
+    - jobs: List of job dictionaries
+    - filename: Output path
+    - title: Page title
+    - page_size: Resources per page
+
+    Returns:
+    - The output path
+    """
+    calendar = DayCalendar(date_range)
+    resource_ids = [res["id"] for res in resources]
+    job_ids = [job["id"] for job in jobs]
+    resource_index, day, job_index = _schedule_cells(job_schedule, resource_ids, calendar, job_ids)
+    keep = (day >= 0) & (day < calendar.num_days) & (job_index >= 0)
+    data = {
+        "page_size": page_size,
+        "dates": [calendar.iso(d) for d in range(calendar.num_days)],
+        "resources": [[str(res["id"]), ", ".join(res["skills"])] for res in resources],
+        "jobs": [[str(job["id"]), ", ".join(job["required_skills"])] for job in jobs],
+        "cells": np.column_stack((resource_index[keep], day[keep], job_index[keep])).tolist(),
+    }
+    # "</" cannot appear inside a script element
+    payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    with open(filename, "w", encoding="utf-8") as html_file:
+        html_file.write(_HTML_TEMPLATE.format(title=html.escape(title), data=payload))
+    return filename
+
+def render_job_assignments(job_schedule, resources: List[Dict], date_range: Dict, jobs: List[Dict], title: str,
+                           output_dir: str, formats: Sequence[str] = ("png", "html")) -> List[str]:
+    """
+    Write the headless views of a schedule to `output_dir`.
+
+    Parameters:
+    - job_schedule: Schedule or list of (event, event_assignment) tuples
+    - resources: List of resource dictionaries
+    - date_range: Dictionary with start_date and end_date
+    - jobs: List of job dictionaries
+    - title: Title of the views, also used for the file names
+    - output_dir: Output directory, created if needed
+    - formats: Any of "png", "svg" and "html"
+
+    Returns:
+    - Paths of the written files
+    """
+    unknown = set(formats) - set(HEADLESS_FORMATS)
+    if unknown:
+        raise ValueError(f"Unsupported formats: {sorted(unknown)}")
+    os.makedirs(output_dir, exist_ok=True)
+    stem = "".join(c if c.isalnum() or c in "-_" else "-" for c in title) or "schedule"
+    resource_ids = [res["id"] for res in resources]
+    paths = []
+    image_formats = [fmt for fmt in formats if fmt != "html"]
+    if image_formats:
+        grid = occupancy_grid(job_schedule, resource_ids, date_range)
+        calendar = DayCalendar(date_range)
+        dates = [calendar.iso(d) for d in range(calendar.num_days)]
+        for fmt in image_formats:
+            paths.append(render_occupancy_heatmap(grid, os.path.join(output_dir, f"{stem}.{fmt}"),
+                                                  resource_ids, dates, title))
+    if "html" in formats:
+        paths.append(write_schedule_html(job_schedule, resources, date_range, jobs,
+                                         os.path.join(output_dir, f"{stem}.html"), title))
+    return paths
@@ -0,0 +1,47 @@
+import pytest
+
+def _record(item, skills_field: str) -> dict:
+    # ("job1", ["skill1"]) is shorthand for {"id": "job1", <skills_field>: ["skill1"]}
+    if isinstance(item, dict):
+        return item
+    record_id, skills = item
+    return {"id": record_id, skills_field: list(skills)}
+
+@pytest.fixture
+def make_input():
+    """
+    Build scheduler input (job_ids, jobs, resources, date_range).
+
+    Jobs and resources are dictionaries or (id, skills) shorthands; the date
+    range is a single day unless `end_date` is given.
+    """
+    def build(jobs=(), resources=(), start_date: str = "2024-01-01", end_date: str = None) -> dict:
+        jobs = [_record(job, "required_skills") for job in jobs]
+        return {
+            "date_range": {"start_date": start_date, "end_date": end_date or start_date},
+            "job_ids": [job["id"] for job in jobs],
+            "jobs": jobs,
+            "resources": [_record(resource, "skills") for resource in resources],
+        }
+    return build
+
+@pytest.fixture
+def stalled_solver(monkeypatch):
+    """
+    Make CP-SAT return a valid but empty solution, like a solve cut short before it caught up with its hint.
+
+    Call the fixture with the name prefix of the variables to pin to zero.
+    """
+    from ortools.sat.python import cp_model
+
+    def stall(prefix: str) -> None:
+        class StalledSolver(cp_model.CpSolver):
+            def Solve(self, model, *args, **kwargs):
+                stalled = model.clone()
+                for var in stalled.Proto().variables:
+                    if var.name.startswith(prefix):
+                        var.domain[0] = var.domain[1] = 0
+                return super().Solve(stalled, *args, **kwargs)
+
+        monkeypatch.setattr(cp_model, "CpSolver", StalledSolver)
+    return stall
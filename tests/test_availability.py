@@ -0,0 +1,26 @@
+from src.utils.availability import RoundRobinQueue
+from src.utils.bitmap import AvailabilityBitmap
+
+def test_round_robin_queue_cycles_and_skips_booked_up_resources():
+    queue = RoundRobinQueue([0, 2, 3])
+    next_free = [0, 0, 0, 0]
+    assert [queue.next_available(next_free, 1) for _ in range(3)] == [0, 2, 3]
+
+    next_free[2] = 2  # past the last day: dropped when probed
+    assert queue.next_available(next_free, 1) == 0
+    assert queue.next_available(next_free, 1) == 3
+    assert queue.next_available(next_free, 1) == 0
+
+    next_free[0] = next_free[3] = 2
+    assert queue.next_available(next_free, 1) is None
+
+def test_availability_bitmap_counts_free_resources_per_day():
+    bitmap = AvailabilityBitmap(10, 3)
+    mask = bitmap.pack([1, 8, 9])
+    bitmap.book([8, 9], 0)
+    bitmap.book([1], 1)
+
+    assert list(bitmap.free_counts(mask)) == [1, 2, 3]
+    assert bitmap.earliest_day(mask, 2) == 1
+    assert bitmap.earliest_day(mask, 4) is None
+    assert list(bitmap.free_resources(mask, 1)) == [8, 9]
@@ -0,0 +1,28 @@
+from src.benchmark import BENCHMARKS, compare_to_baseline, run_suite
+from src.cli import ALGORITHMS
+from src.utils.synthetic import generate_tenant
+
+def test_synthetic_tenants_are_reproducible():
+    first = generate_tenant(50, 5, num_skills=4, horizon_days=7, seed=3)
+    second = generate_tenant(50, 5, num_skills=4, horizon_days=7, seed=3)
+
+    assert first == second
+    assert len(first["jobs"]) == 50 and len(first["resources"]) == 5
+    assert first["date_range"] == {"start_date": "2024-01-01", "end_date": "2024-01-07"}
+    assert generate_tenant(50, 5, seed=4)["jobs"] != first["jobs"]
+
+def test_suite_records_metrics_and_flags_regressions():
+    results = run_suite(["tiny"], ["round_robin", "export", "export_json"], repeat=1)
+
+    result = results["results"]["round_robin[tiny]"]
+    assert result["jobs"] == 10 and result["wall_time"] > 0 and result["peak_memory"] > 0
+    assert compare_to_baseline(results, results) == []
+
+    slower = {"results": {key: dict(value, wall_time=value["wall_time"] + 1.0)
+                          for key, value in results["results"].items()}}
+    regressions = compare_to_baseline(slower, results)
+    assert {regression["key"] for regression in regressions} == {"round_robin[tiny]", "export[tiny]",
+                                                                 "export_json[tiny]"}
+
+def test_every_scheduler_entry_point_is_benchmarked():
+    assert set(ALGORITHMS) <= set(BENCHMARKS)
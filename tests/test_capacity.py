@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from src.auto_scheduler import capacity_autoschedule
+from src.utils.capacity import CapacityCalendar
+
+@pytest.fixture
+def data(make_input):
+    def build(durations):
+        return make_input(
+            [{"id": f"job{i}", "required_skills": ["skill1"], "estimated_duration": duration}
+             for i, duration in enumerate(durations)],
+            [("res1", ["skill1"]), {"id": "res2", "skills": ["skill1"], "max_hours": 4}],
+            end_date="2024-01-03",
+        )
+    return build
+
+def test_short_jobs_share_a_day(data):
+    schedule = capacity_autoschedule(data([2, 2, 3, 1]))
+
+    times = [(e["job_id"], e["start_date"], e["start_time"], e["end_time"], a["resource_id"]) for e, a in schedule]
+    assert times == [
+        ("job0", "2024-01-01", "08:00", "10:00", "res1"),
+        ("job1", "2024-01-01", "08:00", "10:00", "res2"),
+        ("job2", "2024-01-01", "10:00", "13:00", "res1"),
+        ("job3", "2024-01-01", "10:00", "11:00", "res2"),
+    ]
+
+def test_long_jobs_span_free_days_and_missing_durations_fill_a_day(data):
+    schedule = capacity_autoschedule(data([1, 12, None]))
+
+    events = {event["job_id"]: (event, assignment["resource_id"]) for event, assignment in schedule}
+    event, resource_id = events["job1"]
+    assert (event["start_date"], event["end_date"], event["end_time"], resource_id) == \
+        ("2024-01-01", "2024-01-03", "12:00", "res2")
+    event, resource_id = events["job2"]
+    assert (event["start_date"], event["start_time"], event["end_time"], resource_id) == \
+        ("2024-01-02", "08:00", "17:00", "res1")
+
+def test_best_fit_prefers_the_tightest_slot():
+    calendar = CapacityCalendar([480, 480], 2)
+    calendar.book(1, 0, 420)
+    rows = np.array([0, 1])
+
+    assert calendar.first_fit(rows, 60) == (0, 0)
+    assert calendar.best_fit(rows, 60) == (1, 0)
+    assert calendar.best_fit(rows, 600) is None
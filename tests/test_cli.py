@@ -0,0 +1,62 @@
+import json
+import os
+import subprocess
+import sys
+
+import src.cli as cli
+from src.cli import cache_key, cached_run, load_input, main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT = os.path.join(ROOT, "data", "input", "test-input-data.json")
+
+def test_writes_schedule_and_reuses_cached_result(tmp_path, capsys):
+    output = str(tmp_path / "schedule.json")
+    args = [INPUT, "-o", output, "--cache-dir", str(tmp_path / "cache")]
+
+    assert main(args) == 0
+    first = json.load(open(output))
+    assert main(args + ["--metrics", str(tmp_path / "metrics.jsonl")]) == 0
+
+    assert json.load(open(output)) == first
+    assert len(os.listdir(tmp_path / "cache")) == 1
+    assert "(cached)" in capsys.readouterr().out.splitlines()[-1]
+    records = [json.loads(line) for line in open(tmp_path / "metrics.jsonl")]
+    assert {"type": "counter", "name": "result_cache", "labels": {"result": "hit"}, "value": 1} in records
+
+def test_cache_key_ignores_key_order_but_not_options():
+    data = {"jobs": [{"id": "job1", "required_skills": []}], "date_range": {"start_date": "2024-01-01"}}
+    reordered = {"date_range": {"start_date": "2024-01-01"}, "jobs": [{"required_skills": [], "id": "job1"}]}
+
+    assert cache_key(data, "cp_sat", {"time_limit": 1.0}) == cache_key(reordered, "cp_sat", {"time_limit": 1.0})
+    assert cache_key(data, "cp_sat", {"time_limit": 1.0}) != cache_key(data, "cp_sat", {"time_limit": 2.0})
+
+def test_cache_key_changes_with_the_code(monkeypatch):
+    data = load_input(INPUT)
+    before = cache_key(data, "round_robin", {})
+    monkeypatch.setattr(cli, "_code_version", lambda: "upgraded")
+
+    assert cache_key(data, "round_robin", {}) != before
+
+def test_unreadable_cache_entries_are_misses(tmp_path):
+    data = load_input(INPUT)
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    entry = cache_dir / f"schedule-{cache_key(data, 'round_robin', {})}.pickle"
+    # Pickled against a class that no longer exists, which raises AttributeError on load
+    entry.write_bytes(b"csrc.utils.schedule\nRemovedSchedule\n.")
+
+    job_schedule, _, cached = cached_run(data, "round_robin", {}, str(cache_dir))
+
+    assert not cached and len(job_schedule) > 0
+    assert cached_run(data, "round_robin", {}, str(cache_dir))[2]
+
+def test_round_robin_does_not_import_heavy_modules(tmp_path):
+    script = (
+        "import sys\n"
+        "from src.cli import main\n"
+        f"main([{INPUT!r}, '-o', {str(tmp_path / 'out.ndjson')!r}, '--no-cache'])\n"
+        "print(sorted(name for name in ('numpy', 'pandas', 'matplotlib', 'ortools') if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,33 @@
+import pytest
+
+from src.auto_scheduler import crew_autoschedule
+from src.utils.schedule import SKIP_NOT_ENOUGH_RESOURCES
+
+@pytest.fixture
+def data(make_input):
+    return make_input(
+        [{"id": "job1", "required_skills": ["skill1"], "resource_count": 2},
+         {"id": "job2", "required_skills": ["skill1"], "resource_count": 2},
+         ("job3", ["skill1"]),
+         {"id": "job4", "required_skills": ["skill2"], "resource_count": 2}],
+        [("res1", ["skill1"]), ("res2", ["skill1", "skill2"]), ("res3", ["skill1"])],
+        end_date="2024-01-02",
+    )
+
+def test_crew_jobs_share_one_day(data):
+    schedule = crew_autoschedule(data)
+
+    rows = [(event["job_id"], event["start_date"], assignment["resource_id"]) for event, assignment in schedule]
+    assert rows == [
+        ("job1", "2024-01-01", "res1"),
+        ("job1", "2024-01-01", "res2"),
+        ("job2", "2024-01-02", "res3"),
+        ("job2", "2024-01-02", "res1"),
+        ("job3", "2024-01-01", "res3"),
+    ]
+
+def test_jobs_needing_more_resources_than_eligible_are_skipped(data):
+    schedule = crew_autoschedule(data)
+
+    assert "job4" not in {event["job_id"] for event, _ in schedule}
+    assert schedule.skipped == [{"job_id": "job4", "reason": SKIP_NOT_ENOUGH_RESOURCES}]
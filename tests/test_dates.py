@@ -0,0 +1,34 @@
+from src.utils.dates import DayCalendar
+
+def test_single_day_range():
+    calendar = DayCalendar({"start_date": "2024-03-05", "end_date": "2024-03-05"})
+
+    assert calendar.num_days == 1
+    assert calendar.last_day == 0
+    assert calendar.iso(0) == "2024-03-05"
+    assert calendar.day_of("2024-03-05") == 0
+
+def test_range_across_month_and_year_boundaries():
+    calendar = DayCalendar({"start_date": "2023-12-30", "end_date": "2024-03-01"})
+
+    assert calendar.last_day == 62  # 2024 is a leap year
+    assert [calendar.iso(day) for day in range(4)] == ["2023-12-30", "2023-12-31", "2024-01-01", "2024-01-02"]
+    assert calendar.iso(33) == "2024-02-01"
+    assert calendar.iso(61) == "2024-02-29"
+    assert calendar.iso(calendar.last_day) == "2024-03-01"
+    for day in (0, 2, 33, 61, 62):
+        assert calendar.day_of(calendar.iso(day)) == day
+
+def test_dates_outside_the_range():
+    calendar = DayCalendar({"start_date": "2024-01-30", "end_date": "2024-02-02"})
+
+    assert calendar.iso(4) == "2024-02-03"
+    assert calendar.iso(-1) == "2024-01-29"
+    assert calendar.day_of("2024-02-03") == calendar.last_day + 1
+    assert calendar.day_of("2023-12-31") == -30
+
+def test_reversed_range_is_empty():
+    calendar = DayCalendar({"start_date": "2024-01-02", "end_date": "2024-01-01"})
+
+    assert calendar.num_days == 0
+    assert calendar.last_day == -1
@@ -0,0 +1,38 @@
+import pytest
+
+from src.decomposition import cluster_jobs, decomposed_autoschedule
+
+@pytest.fixture
+def data(make_input):
+    # Two towns far apart, plus one job without a location
+    jobs = [{"id": f"north{i}", "required_skills": ["a"], "latitude": 46.0 + i * 0.01, "longitude": -94.0}
+            for i in range(6)]
+    jobs += [{"id": f"south{i}", "required_skills": ["b"], "latitude": 44.0 + i * 0.01, "longitude": -93.0}
+             for i in range(6)]
+    jobs.append({"id": "nowhere", "required_skills": ["a"], "latitude": None, "longitude": None})
+    return make_input(jobs, [{"id": "res1", "skills": ["a"], "latitude": 46.0, "longitude": -94.0},
+                             ("res2", ["a", "b"]), ("res3", ["b"]), ("res4", ["a"])],
+                      end_date="2024-01-04")
+
+def test_jobs_are_clustered_by_location(data):
+    labels, centroids = cluster_jobs(data["jobs"], 2)
+
+    assert len(centroids) == 2
+    assert len(set(labels[:6])) == 1 and len(set(labels[6:12])) == 1
+    assert labels[0] != labels[6]
+    assert labels[12] == -1
+
+def test_decomposed_schedule_is_merged_and_repaired(data):
+
+    schedule, stats = decomposed_autoschedule(data, num_clusters=2, max_workers=2)
+
+    assert sorted(stats["clusters"]) == [6, 6]
+    assert stats["repaired"] == 1
+    assert len(schedule) == len(data["jobs"])
+    skills = {res["id"]: set(res["skills"]) for res in data["resources"]}
+    required = {job["id"]: set(job["required_skills"]) for job in data["jobs"]}
+    booked = set()
+    for event, assignment in schedule:
+        assert required[event["job_id"]] <= skills[assignment["resource_id"]]
+        assert (assignment["resource_id"], event["start_date"]) not in booked
+        booked.add((assignment["resource_id"], event["start_date"]))
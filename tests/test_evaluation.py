@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.utils.evaluation import ScheduleEvaluator, evaluate_schedule
+from src.utils.travel import build_travel_matrix
+
+@pytest.fixture
+def data(make_input):
+    return make_input(
+        [{"id": "job1", "required_skills": ["skill1"], "latitude": 45.0, "longitude": -93.0},
+         {"id": "job2", "required_skills": ["skill2"], "latitude": 45.1, "longitude": -93.0},
+         {"id": "job3", "required_skills": ["skill1"], "estimated_duration": 4.5,
+          "latitude": 45.0, "longitude": -93.1}],
+        [{"id": "res1", "skills": ["skill1"], "latitude": 45.0, "longitude": -93.0},
+         {"id": "res2", "skills": ["skill1", "skill2"], "latitude": 45.1, "longitude": -93.0}],
+        end_date="2024-01-02",
+    )
+
+def test_valid_schedule_scores_clean(data):
+    schedule = round_robin_with_skills_autoschedule(data)
+
+    metrics = evaluate_schedule(schedule, data)
+
+    assert metrics["scheduled_jobs"] == 3 and metrics["unscheduled_jobs"] == 0
+    assert metrics["skill_violations"] == metrics["out_of_range"] == metrics["double_bookings"] == 0
+    assert metrics["travel_km"] is None
+    # res2 works a full day (job2) and half a day (job3) out of two 9-hour days
+    assert np.allclose(metrics["utilization"], [540 / 1080, (540 + 270) / 1080])
+    assert list(metrics["day_load"]) == [1080, 270]
+    from_tuples = evaluate_schedule(list(schedule), data)
+    assert np.array_equal(from_tuples["utilization"], metrics["utilization"])
+
+def test_problems_are_counted(data):
+    evaluator = ScheduleEvaluator(data)
+
+    metrics = evaluator.evaluate_columns(
+        job_index=np.array([0, 1, 2]),
+        resource_index=np.array([0, 0, 0]),
+        day=np.array([0, 0, 5]),
+        start_minute=np.array([480, 540, -1]),
+        end_minute=np.array([600, 600, -1]),
+    )
+
+    assert metrics["skill_violations"] == 1
+    assert metrics["out_of_range"] == 1
+    assert metrics["double_bookings"] == 1
+
+def test_travel_walks_each_resource_day_from_home(data):
+    travel = build_travel_matrix(data["jobs"], data["resources"], cache_dir=None)
+    evaluator = ScheduleEvaluator(data, travel)
+    distance = travel.distance_km
+
+    metrics = evaluator.evaluate_columns(np.array([0, 2]), np.array([0, 0]), np.array([0, 0]),
+                                         start_minute=np.array([480, 600]), end_minute=np.array([540, 660]))
+
+    home = travel.home_node("res1")
+    expected = distance[home, 0] + distance[0, 2] + distance[2, home]
+    assert np.isclose(metrics["travel_km"], expected)
+
+def test_empty_and_all_skipped_schedules_score(data):
+    evaluator = ScheduleEvaluator(data)
+    empty = evaluator.evaluate_columns(np.array([], dtype=int), np.array([], dtype=int), np.array([], dtype=int))
+
+    data["resources"] = [{"id": "res3", "skills": ["skill3"]}]
+    skipped = round_robin_with_skills_autoschedule(data)
+    assert len(skipped) == 0 and len(skipped.skipped) == 3
+    all_skipped = evaluate_schedule(skipped, data)
+
+    for metrics in (empty, all_skipped):
+        assert metrics["assignments"] == metrics["scheduled_jobs"] == 0
+        assert metrics["unscheduled_jobs"] == 3
+        assert metrics["mean_utilization"] == 0.0 and not metrics["utilization"].any()
+        assert list(metrics["day_load"]) == [0.0, 0.0] and metrics["day_load_cv"] == 0.0
@@ -0,0 +1,71 @@
+import pytest
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.scheduler import Scheduler
+
+@pytest.fixture
+def data(make_input):
+    return make_input([("job1", ["skill1"]), ("job2", ["skill1"]), ("job3", ["skill2"]), ("job4", ["skill1"]),
+                       ("job5", ["skill1"])],
+                      [("res1", ["skill1"]), ("res2", ["skill1", "skill2"])], end_date="2024-01-02")
+
+def test_adding_jobs_in_order_matches_batch(data):
+
+    scheduler = Scheduler.from_data(data)
+
+    assert scheduler.schedule() == list(round_robin_with_skills_autoschedule(data))
+    assert scheduler.unassigned == ["job5"]
+
+def test_cancel_frees_the_day_for_unassigned_jobs(data):
+    scheduler = Scheduler.from_data(data)
+    freed = scheduler.assignment("job2")
+
+    changes = scheduler.cancel_job("job2")
+    assert [(c["action"], c["event"]["job_id"]) for c in changes] == [("delete", "job2")]
+
+    changes = scheduler.schedule_unassigned()
+    assert [(c["action"], c["event"]["job_id"]) for c in changes] == [("create", "job5")]
+    assert scheduler.assignment("job5") == freed
+    assert scheduler.unassigned == []
+
+def test_reassign_emits_update_and_rejects_invalid_targets(data):
+    scheduler = Scheduler.from_data(data)
+    scheduler.cancel_job("job5")
+    scheduler.cancel_job("job4")
+
+    changes = scheduler.reassign("job1", "res1", "2024-01-02")
+    assert changes == [{
+        "action": "update",
+        "event": {"name": "Job job1", "job_id": "job1", "start_date": "2024-01-02",
+                  "end_date": "2024-01-02", "start_time": None, "end_time": None},
+        "event_assignment": {"id": None, "event_id": None, "resource_id": "res1", "key": None},
+        "previous": {"resource_id": "res1", "start_date": "2024-01-01"},
+    }]
+    with pytest.raises(ValueError):
+        scheduler.reassign("job3", "res1")
+    with pytest.raises(ValueError):
+        scheduler.reassign("job2", "res1", "2024-01-02")
+    assert scheduler.assignment("job3") == ("res2", "2024-01-02")
+
+def test_extend_date_range_schedules_leftovers(data):
+    scheduler = Scheduler.from_data(data)
+
+    changes = scheduler.extend_date_range("2024-01-03")
+
+    assert [(c["action"], c["event"]["start_date"]) for c in changes] == [("create", "2024-01-03")]
+    assert scheduler.unassigned == []
+    with pytest.raises(ValueError):
+        scheduler.extend_date_range("2024-01-02")
+
+def test_date_pinned_reassign_rotates_over_resources():
+    resources = [{"id": f"res{r}", "skills": ["skill1"]} for r in range(1, 4)]
+    scheduler = Scheduler(resources, {"start_date": "2024-01-01", "end_date": "2024-01-05"})
+    for job_id in ("a", "b", "c"):
+        scheduler.add_job({"id": job_id, "required_skills": ["skill1"]})
+
+    for job_id, date in (("a", "2024-01-03"), ("b", "2024-01-04"), ("c", "2024-01-05")):
+        scheduler.reassign(job_id, date=date)
+
+    assert [scheduler.assignment(job_id) for job_id in ("a", "b", "c")] == [
+        ("res1", "2024-01-03"), ("res2", "2024-01-04"), ("res3", "2024-01-05"),
+    ]
@@ -0,0 +1,76 @@
+import json
+import os
+
+from src.utils.ingest import load_salesforce_exports, project_job
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "input")
+
+# Same shape as the real exports: locations are compound fields
+JOBS = [
+    {"attributes": {"type": "strk__Job__c"}, "Id": "job1", "Name": "J-1", "strk__Estimated_Duration__c": 90,
+     "strk__Duration_Unit__c": "Minute", "strk__Location__c": {"latitude": 44.8, "longitude": -93.3},
+     "strk__Number_Of_Resources__c": 2, "Skills__c": "electric;repair"},
+    {"attributes": {"type": "strk__Job__c"}, "Id": "job2", "Name": "J-2", "strk__Estimated_Duration__c": 2,
+     "strk__Duration_Unit__c": "Hour", "strk__Location__c": None, "strk__Number_Of_Resources__c": None,
+     "Skills__c": None},
+]
+RESOURCES = [
+    {"attributes": {"type": "strk__Timesheet_User__c"}, "Id": "res1", "strk__Active__c": True,
+     "strk__Last_Known_Location__c": {"latitude": 44.9, "longitude": -93.2}},
+    {"attributes": {"type": "strk__Timesheet_User__c"}, "Id": "res2", "strk__Active__c": False,
+     "strk__Last_Known_Location__c": None},
+]
+DATE_RANGE = {"start_date": "2024-06-01", "end_date": "2024-06-05"}
+
+def write_exports(tmp_path):
+    jobs_filename, resources_filename = tmp_path / "jobs.json", tmp_path / "resources.json"
+    jobs_filename.write_text(json.dumps(JOBS))
+    resources_filename.write_text(json.dumps(RESOURCES))
+    return str(jobs_filename), str(resources_filename)
+
+def test_exports_are_projected_to_scheduler_input(tmp_path):
+    jobs_filename, resources_filename = write_exports(tmp_path)
+
+    data = load_salesforce_exports(jobs_filename, resources_filename, DATE_RANGE,
+                                   job_skill_field="Skills__c", cache_dir=None)
+
+    assert data["job_ids"] == ["job1", "job2"]
+    assert data["jobs"][0] == {"id": "job1", "required_skills": ["electric", "repair"], "estimated_duration": 1.5,
+                               "resource_count": 2, "latitude": 44.8, "longitude": -93.3}
+    assert data["jobs"][1] == {"id": "job2", "required_skills": [], "estimated_duration": 2.0,
+                               "resource_count": None, "latitude": None, "longitude": None}
+    assert data["resource_ids"] == ["res1"]
+    assert (data["resources"][0]["latitude"], data["resources"][0]["longitude"]) == (44.9, -93.2)
+    assert data["date_range"] == DATE_RANGE
+
+def test_repeat_loads_come_from_the_cache(tmp_path):
+    jobs_filename, resources_filename = write_exports(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+
+    first = load_salesforce_exports(jobs_filename, resources_filename, DATE_RANGE, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    second = load_salesforce_exports(jobs_filename, resources_filename, DATE_RANGE, cache_dir=cache_dir)
+    assert second == first
+
+    with open(jobs_filename, "w") as jobs_file:
+        json.dump(JOBS[:1], jobs_file)
+    third = load_salesforce_exports(jobs_filename, resources_filename, DATE_RANGE, cache_dir=cache_dir)
+    assert third["job_ids"] == ["job1"]
+    assert len(os.listdir(cache_dir)) == 2
+
+def test_flattened_location_fields_are_a_fallback():
+    record = {"Id": "job3", "strk__Location__c": None,
+              "strk__Location__Latitude__s": 44.7, "strk__Location__Longitude__s": -93.1}
+
+    job = project_job(record)
+    assert (job["latitude"], job["longitude"]) == (44.7, -93.1)
+
+def test_shipped_exports_keep_job_locations():
+    data = load_salesforce_exports(os.path.join(DATA_DIR, "jobs.json"), os.path.join(DATA_DIR, "resources.json"),
+                                   DATE_RANGE, cache_dir=None)
+
+    located = [job for job in data["jobs"] if job["latitude"] is not None and job["longitude"] is not None]
+    assert len(data["jobs"]) == 915
+    assert len(located) == 874
+    assert all(-90 <= job["latitude"] <= 90 and -180 <= job["longitude"] <= 180 for job in located)
+    assert sum(1 for res in data["resources"] if res["latitude"] is not None) >= 1
@@ -0,0 +1,64 @@
+import io
+import json
+
+import pytest
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.utils.instrumentation import DISABLED, current_instrumentation, instrument
+from src.utils.schedule import SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES
+
+@pytest.fixture
+def data(make_input):
+    return make_input([("job1", ["skill1"]), ("job2", ["skill1"]), ("job3", ["skill1"]), ("job4", ["skill9"])],
+                      [("res1", ["skill1"]), ("res2", ["skill1"])])
+
+def test_skipped_jobs_are_structured_and_nothing_is_printed(data, capsys):
+    schedule = round_robin_with_skills_autoschedule(data)
+
+    assert schedule.skipped == [
+        {"job_id": "job3", "reason": SKIP_NO_AVAILABILITY},
+        {"job_id": "job4", "reason": SKIP_NO_ELIGIBLE_RESOURCES},
+    ]
+    assert capsys.readouterr().out == ""
+
+def test_disabled_by_default():
+    assert current_instrumentation() is DISABLED
+    with DISABLED.phase("anything"):
+        DISABLED.count("jobs")
+
+def test_records_phases_counters_and_summaries(data):
+    with instrument() as instrumentation:
+        assert current_instrumentation() is instrumentation
+        round_robin_with_skills_autoschedule(data)
+    assert current_instrumentation() is DISABLED
+
+    assert set(instrumentation.phases) == {
+        "round_robin_with_skills", "round_robin_with_skills/index", "round_robin_with_skills/assign"
+    }
+    counters = {(name, dict(labels).get("reason")): value
+                for (name, labels), value in instrumentation.counters.items()}
+    assert counters[("jobs_scheduled", None)] == 2
+    assert counters[("jobs_skipped", SKIP_NO_AVAILABILITY)] == 1
+    assert counters[("jobs_skipped", SKIP_NO_ELIGIBLE_RESOURCES)] == 1
+    # job1 and job2 find a free resource on the first probe; job3 probes both
+    assert instrumentation.summaries["probes_per_job"] == [3, 4, 1, 2]
+
+    output = io.StringIO()
+    count = instrumentation.write_json_lines(output)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(records) == count
+    assert {record["type"] for record in records} == {"phase", "counter", "summary"}
+
+    text = instrumentation.prometheus_text()
+    assert ('auto_scheduler_jobs_skipped_total{algorithm="round_robin_with_skills",'
+            'reason="no_eligible_resources"} 1') in text
+    assert 'auto_scheduler_phase_seconds_count{phase="round_robin_with_skills"} 1' in text
+
+def test_profile_modes(data):
+    with instrument(profile="cprofile") as instrumentation:
+        round_robin_with_skills_autoschedule(data)
+    assert "round_robin_with_skills_autoschedule" in instrumentation.profile_report()
+
+    with instrument(profile="tracemalloc") as instrumentation:
+        round_robin_with_skills_autoschedule(data)
+    assert instrumentation.memory["peak_bytes"] > 0
@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.utils.io import (export_job_schedule_to_json, iter_job_schedule_from_file, iter_json_array,
+                          stream_job_schedule_to_file)
+
+@pytest.fixture
+def job_schedule():
+    with open("data/input/test-input-data.json") as input_file:
+        return round_robin_with_skills_autoschedule(json.load(input_file))
+
+@pytest.mark.parametrize("fmt, suffix", [("ndjson", ".ndjson"), ("json", ".json"), ("ndjson", ".ndjson.gz"),
+                                         ("json", ".json.gz")])
+def test_stream_round_trip(tmp_path, job_schedule, fmt, suffix):
+    filename = str(tmp_path / f"schedule{suffix}")
+
+    count = stream_job_schedule_to_file(iter(job_schedule), filename, fmt=fmt, chunk_size=5)
+
+    assert count == len(job_schedule)
+    assert list(iter_job_schedule_from_file(filename)) == list(job_schedule)
+
+def test_stream_json_matches_export(tmp_path, job_schedule):
+    exported = str(tmp_path / "export.json")
+    streamed = str(tmp_path / "stream.json")
+
+    export_job_schedule_to_json(job_schedule, exported)
+    stream_job_schedule_to_file(job_schedule, streamed, fmt="json", chunk_size=7)
+
+    with open(exported) as a, open(streamed) as b:
+        assert json.load(a) == json.load(b)
+    assert list(iter_job_schedule_from_file(exported)) == list(job_schedule)
+
+def test_iter_json_array_across_small_chunks():
+    items = [{"id": i, "text": "x" * i} for i in range(40)]
+    text = io.StringIO(json.dumps(items, indent=2))
+
+    assert list(iter_json_array(text, chunk_size=8)) == items
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+@pytest.mark.parametrize("items", [
+    [12345, 67890, -1.25e-10, 0, 3.5],
+    ["abcdefg", "", "a \"quoted\" word", "ünïcode"],
+    [True, None, False, 123456789, "mixed", [1, 22, 333], {"n": 4444}],
+])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7])
+def test_iter_json_array_scalars_split_across_chunks(items, chunk_size):
+    for text in (json.dumps(items), json.dumps(items, indent=1)):
+        assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == items
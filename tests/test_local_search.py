@@ -0,0 +1,41 @@
+import pytest
+
+from src.local_search import local_search_autoschedule
+from src.utils.evaluation import ScheduleEvaluator
+from src.utils.travel import build_travel_matrix
+
+@pytest.fixture
+def data(make_input):
+    # Two towns; the round robin alternates resources, so both drive to both towns
+    jobs = [{"id": f"job{i}", "required_skills": ["skill1"], "estimated_duration": 2,
+             "latitude": 45.0 if i % 2 else 46.0, "longitude": -93.0} for i in range(8)]
+    return make_input(jobs, [{"id": "res1", "skills": ["skill1"], "latitude": 45.0, "longitude": -93.0},
+                             {"id": "res2", "skills": ["skill1"], "latitude": 46.0, "longitude": -93.0}],
+                      end_date="2024-01-04")
+
+def test_local_search_reduces_travel_without_breaking_constraints(data):
+    travel = build_travel_matrix(data["jobs"], data["resources"], cache_dir=None)
+
+    schedule, stats = local_search_autoschedule(data, travel, time_limit=10.0, max_iterations=2000)
+
+    assert stats["travel_km"] < stats["initial_travel_km"]
+    assert stats["travel_km"] < 1.0  # every job ends up with the resource living in its town
+    metrics = ScheduleEvaluator(data, travel).evaluate(schedule)
+    assert metrics["scheduled_jobs"] == 8
+    assert metrics["skill_violations"] == metrics["out_of_range"] == metrics["double_bookings"] == 0
+    assert abs(metrics["travel_km"] - stats["travel_km"]) < 1e-3
+    for event, _ in schedule:
+        assert "08:00" <= event["start_time"] < event["end_time"] <= "17:00"
+
+def test_insertion_of_unassigned_jobs_stops_at_the_time_limit(data):
+    extra = [dict(job, id=f"extra{i}") for i, job in enumerate(data["jobs"][:4])]
+    data["jobs"] += extra
+    data["job_ids"] += [job["id"] for job in extra]
+    travel = build_travel_matrix(data["jobs"], data["resources"], cache_dir=None)
+
+    _, spent = local_search_autoschedule(data, travel, time_limit=0.0)
+    _, budgeted = local_search_autoschedule(data, travel, time_limit=10.0, max_iterations=0)
+
+    # The round robin places one job per resource and day, leaving four
+    assert (spent["iterations"], spent["inserted"], spent["unassigned"]) == (0, 0, 4)
+    assert (budgeted["inserted"], budgeted["unassigned"]) == (4, 0)
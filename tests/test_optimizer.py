@@ -0,0 +1,32 @@
+import pytest
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.optimizer import optimized_autoschedule
+
+@pytest.fixture
+def data(make_input):
+    # The heuristic hands the first "a" job to res1, which is the only resource able to do "b" jobs
+    return make_input([("job1", ["a"]), ("job2", ["b"])], [("res1", ["a", "b"]), ("res2", ["a"])])
+
+def test_optimizer_improves_on_the_warm_start(data):
+    assert len(round_robin_with_skills_autoschedule(data)) == 1
+
+    schedule, stats = optimized_autoschedule(data, time_limit=10)
+
+    assert stats["status"] == "OPTIMAL"
+    assert stats["heuristic_scheduled"] == 1
+    assert stats["scheduled"] == len(schedule) == 2
+    assert {event["job_id"]: assignment["resource_id"] for event, assignment in schedule} == {
+        "job1": "res2",
+        "job2": "res1",
+    }
+
+def test_heuristic_is_kept_when_the_solver_does_worse(data, stalled_solver):
+    heuristic = round_robin_with_skills_autoschedule(data)
+    stalled_solver("n_")
+
+    schedule, stats = optimized_autoschedule(data, time_limit=10)
+
+    assert stats["status"] == "OPTIMAL"
+    assert stats["scheduled"] == stats["heuristic_scheduled"] == 1
+    assert list(schedule) == list(heuristic)
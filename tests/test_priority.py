@@ -0,0 +1,39 @@
+import pytest
+
+from src.priority import priority_autoschedule, priority_rank
+
+@pytest.fixture
+def data(make_input):
+    return make_input(
+        [{"id": "low", "required_skills": ["A"], "priority": "low", "customer_priority": "low"},
+         {"id": "high", "required_skills": ["A"], "priority": "high", "customer_priority": "low"},
+         {"id": "crew", "required_skills": ["B"], "priority": "low", "customer_priority": "high",
+          "resource_count": 2},
+         {"id": "impossible", "required_skills": ["C"], "priority": "high"}],
+        [{"id": "cheap", "skills": ["A", "B"], "cost_per_day": 100},
+         {"id": "pricey", "skills": ["A", "B"], "cost_per_day": 300},
+         {"id": "b_only", "skills": ["B"], "cost_per_day": 150}],
+    )
+
+def test_priority_rank_follows_decision_rules(data):
+    assert [priority_rank(job) for job in data["jobs"]] == [3, 1, 2, 1]
+    assert priority_rank({"priority": "high", "priority_rank": 5}) == 5
+
+def test_higher_tiers_take_capacity_first(data):
+    schedule, stats = priority_autoschedule(data, time_limit=10.0, num_workers=1)
+
+    rows = sorted((event["job_id"], assignment["resource_id"]) for event, assignment in schedule)
+    # "high" takes the cheapest resource, the crew gets the other two and "low" is left out
+    assert rows == [("crew", "b_only"), ("crew", "pricey"), ("high", "cheap")]
+    assert stats["infeasible"] == ["impossible"]
+    assert [(tier["rank"], tier["scheduled"]) for tier in stats["tiers"]] == [(1, 1), (2, 1), (3, 0)]
+    assert stats["cost"] == 550
+
+def test_greedy_tier_is_kept_when_the_solver_does_worse(data, stalled_solver):
+    greedy, _ = priority_autoschedule(data, time_limit=0.0, num_workers=1)
+    stalled_solver("y_")
+    schedule, stats = priority_autoschedule(data, time_limit=10.0, num_workers=1)
+
+    assert sorted((e["job_id"], a["resource_id"]) for e, a in schedule) == \
+        sorted((e["job_id"], a["resource_id"]) for e, a in greedy)
+    assert [(tier["scheduled"], tier["greedy_scheduled"]) for tier in stats["tiers"]] == [(1, 1), (1, 1), (0, 0)]
@@ -0,0 +1,33 @@
+from src.routing import solve_routing
+
+JOBS = [
+    {"id": "job1", "required_skills": ["electric"], "estimated_duration": 2, "latitude": 44.97, "longitude": -93.26},
+    {"id": "job2", "required_skills": ["plumbing"], "estimated_duration": 3, "latitude": 44.95, "longitude": -93.09},
+    {"id": "job3", "required_skills": ["electric"], "estimated_duration": 1, "latitude": 44.98, "longitude": -93.27},
+]
+TECHNICIANS = [
+    {"id": "tech1", "skills": ["electric"], "max_hours": 5, "latitude": 44.98, "longitude": -93.25},
+    {"id": "tech2", "skills": ["plumbing", "electric"], "max_hours": 8, "latitude": 44.94, "longitude": -93.10},
+]
+
+def test_routes_respect_skills_and_working_day():
+    solution = solve_routing(JOBS, TECHNICIANS, time_limit=10)
+
+    assert solution["status"] == "OPTIMAL"
+    assert solution["unassigned"] == []
+    assert solution["assignments"]["job2"] == "tech2"
+    for tech_id, route in solution["routes"].items():
+        for job_id in route:
+            assert solution["assignments"][job_id] == tech_id
+        starts = [solution["schedule"][job_id] for job_id in route]
+        assert starts == sorted(starts)
+    # Both electric jobs are next to tech1's home base
+    assert sorted(solution["routes"]["tech1"]) == ["job1", "job3"]
+
+def test_jobs_that_do_not_fit_are_left_unassigned():
+    long_job = dict(JOBS[1], id="job4", estimated_duration=9)
+
+    solution = solve_routing(JOBS + [long_job], TECHNICIANS, time_limit=10)
+
+    assert "job4" in solution["unassigned"]
+    assert "job4" not in solution["assignments"]
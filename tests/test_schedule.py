@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from src.auto_scheduler import simple_round_robin_auto_schedule
+from src.utils.io import export_job_schedule_to_json
+
+@pytest.fixture
+def data(make_input):
+    return make_input([("job1", []), ("job2", []), ("job3", [])], [("res1", []), ("res2", [])],
+                      start_date="2024-01-30", end_date="2024-02-01")
+
+def test_schedule_rows_expand_to_event_tuples(data):
+    schedule = simple_round_robin_auto_schedule(data)
+
+    assert len(schedule) == 3
+    assert [row.start_date for row in schedule.rows()] == ["2024-01-30", "2024-01-30", "2024-01-31"]
+    event, assignment = schedule[-1]
+    assert event == {
+        "name": "Job job3",
+        "job_id": "job3",
+        "start_date": "2024-01-31",
+        "end_date": "2024-01-31",
+        "start_time": None,
+        "end_time": None
+    }
+    assert assignment == {"id": None, "event_id": None, "resource_id": "res1", "key": None}
+    assert schedule == list(schedule)
+
+def test_schedule_exports_like_a_list(data, tmp_path):
+    schedule = simple_round_robin_auto_schedule(data)
+    filename = tmp_path / "schedule.json"
+
+    export_job_schedule_to_json(schedule, str(filename))
+
+    exported = json.loads(filename.read_text())
+    assert [item["event"]["job_id"] for item in exported] == ["job1", "job2", "job3"]
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+import src.service as service_module
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.service import (CANCELLED, DONE, TIMED_OUT, FileSObjectSource, SchedulingService, ServiceBusy,
+                         TenantLimits)
+from src.utils.io import iter_export_records
+
+DATE_RANGE = {"start_date": "2024-06-01", "end_date": "2024-06-03"}
+
+def write_tenant(root, tenant, num_jobs, num_resources):
+    directory = root / tenant
+    directory.mkdir()
+    jobs = [{"attributes": {"type": "strk__Job__c"}, "Id": f"{tenant}-job{j}", "Skills__c": "electric" if j % 2 else None}
+            for j in range(num_jobs)]
+    resources = [{"attributes": {"type": "strk__Timesheet_User__c"}, "Id": f"{tenant}-res{r}",
+                  "strk__Active__c": True, "Skills__c": "electric;repair" if r else "repair"}
+                 for r in range(num_resources)]
+    (directory / FileSObjectSource.JOBS_FILENAME).write_text(json.dumps(jobs))
+    (directory / FileSObjectSource.RESOURCES_FILENAME).write_text(json.dumps(resources))
+
+def make_source(tmp_path):
+    write_tenant(tmp_path, "acme", 8, 3)
+    write_tenant(tmp_path, "globex", 5, 2)
+    return FileSObjectSource(str(tmp_path), job_skill_field="Skills__c", resource_skill_field="Skills__c")
+
+def test_tenants_are_scheduled_concurrently_with_warm_state(tmp_path):
+    source = make_source(tmp_path)
+
+    async def scenario():
+        async with SchedulingService(source, executor=ProcessPoolExecutor(max_workers=1)) as service:
+            first = [service.submit(tenant, DATE_RANGE) for tenant in source.tenants()]
+            results = [await service.result(request_id) for request_id in first]
+            records = [record async for record in service.stream(first[0])]
+            again = await service.result(service.submit("acme", DATE_RANGE))
+            return results, records, again
+
+    results, records, again = asyncio.run(scenario())
+
+    assert [result["status"] for result in results] == [DONE, DONE]
+    expected = round_robin_with_skills_autoschedule(source.fetch("acme", DATE_RANGE))
+    assert records == list(iter_export_records(expected))
+    assert results[0]["skipped"] == expected.skipped
+    assert not results[0]["stats"]["warm"] and again["stats"]["warm"]
+
+def test_queue_limit_and_cancellation(tmp_path):
+    source = make_source(tmp_path)
+
+    async def scenario():
+        limits = {"acme": TenantLimits(max_queued=2)}
+        async with SchedulingService(source, max_workers=1, limits=limits,
+                                     executor=ProcessPoolExecutor(max_workers=1)) as service:
+            running = service.submit("acme", DATE_RANGE)
+            queued = service.submit("acme", DATE_RANGE)
+            with pytest.raises(ServiceBusy):
+                service.submit("acme", DATE_RANGE)
+            assert service.cancel(queued)
+            return (await service.result(running))["status"], (await service.result(queued))["status"]
+
+    assert asyncio.run(scenario()) == (DONE, CANCELLED)
+
+def test_requests_over_budget_time_out(tmp_path):
+    source = make_source(tmp_path)
+
+    async def scenario():
+        limits = TenantLimits(time_budget=0.0)
+        async with SchedulingService(source, default_limits=limits,
+                                     executor=ProcessPoolExecutor(max_workers=1)) as service:
+            return await service.result(service.submit("globex", DATE_RANGE))
+
+    result = asyncio.run(scenario())
+    assert result["status"] == TIMED_OUT and result["scheduled"] == 0
+
+class SlowSource(FileSObjectSource):
+    """
+    Source whose "acme" tenant takes a while to load.
+    """
+
+    def version(self, tenant):
+        if tenant == "acme":
+            time.sleep(0.6)
+        return super().version(tenant)
+
+def test_timed_out_request_keeps_its_worker_until_it_returns(tmp_path, monkeypatch):
+    monkeypatch.setattr(service_module, "_WARM_STATE", OrderedDict())
+    make_source(tmp_path)
+    source = SlowSource(str(tmp_path), job_skill_field="Skills__c", resource_skill_field="Skills__c")
+
+    async def scenario():
+        limits = {"acme": TenantLimits(time_budget=0.1), "globex": TenantLimits(time_budget=0.3)}
+        async with SchedulingService(source, max_workers=1, limits=limits,
+                                     executor=ThreadPoolExecutor(max_workers=1)) as service:
+            slow = service.submit("acme", DATE_RANGE)
+            assert (await service.result(slow))["status"] == TIMED_OUT
+            # The abandoned request still occupies the only worker, so this one waits for a slot
+            # instead of burning its budget in the executor queue
+            return await service.result(service.submit("globex", DATE_RANGE))
+
+    result = asyncio.run(scenario())
+    assert result["status"] == DONE
+    assert result["queue_time"] > 0.2
+
+def test_cp_sat_runs_one_search_worker_per_process(tmp_path, monkeypatch):
+    monkeypatch.setattr(service_module, "_WARM_STATE", OrderedDict())
+    source = make_source(tmp_path)
+
+    _, stats = service_module._run_request(source, "acme", "cp_sat", DATE_RANGE, {"time_limit": 5.0})
+    assert stats["num_workers"] == 1
+
+def test_warm_state_keeps_the_most_recent_tenants(tmp_path, monkeypatch):
+    monkeypatch.setattr(service_module, "_WARM_STATE", OrderedDict())
+    monkeypatch.setattr(service_module, "WARM_TENANTS", 2)
+    source = make_source(tmp_path)
+    write_tenant(tmp_path, "initech", 3, 1)
+
+    for tenant in ("acme", "globex", "acme", "initech"):
+        service_module._run_request(source, tenant, "round_robin_with_skills", DATE_RANGE, {})
+    assert list(service_module._WARM_STATE) == ["acme", "initech"]
@@ -0,0 +1,19 @@
+from src.utils.skill_index import SkillIndex
+
+RESOURCES = [
+    {"id": "res1", "skills": ["electric", "inspection"]},
+    {"id": "res2", "skills": ["repair"]},
+    {"id": "res3", "skills": ["electric", "repair"]},
+]
+
+def test_eligible_resources_match_subset_check():
+    index = SkillIndex(RESOURCES)
+    for required in (["electric"], ["repair"], ["electric", "repair"], [], ["survey"]):
+        expected = [res for res in RESOURCES if set(required).issubset(res["skills"])]
+        assert index.eligible_resources(required) == expected
+
+def test_eligible_lookup_is_memoized_per_skill_group():
+    index = SkillIndex(RESOURCES)
+    first = index.eligible_indices(["repair", "electric"])
+    assert first == (2,)
+    assert index.eligible_indices(["electric", "repair"]) is first
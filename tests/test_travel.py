@@ -0,0 +1,51 @@
+import math
+import os
+
+import numpy as np
+
+from src.utils.travel import SpatialGrid, build_travel_matrix, haversine_km
+
+JOBS = [
+    {"id": "job1", "latitude": 44.97, "longitude": -93.26},
+    {"id": "job2", "latitude": 44.95, "longitude": -93.09},
+    {"id": "job3", "latitude": None, "longitude": None},
+]
+RESOURCES = [{"id": "res1", "latitude": 44.86, "longitude": -93.39}]
+
+def haversine(lat1, lon1, lat2, lon2):
+    a = (math.sin(math.radians(lat2 - lat1) / 2) ** 2
+         + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0088 * math.asin(math.sqrt(a))
+
+def test_matrix_layout_and_distances():
+    matrix = build_travel_matrix(JOBS, RESOURCES, cache_dir=None, block_size=1)
+
+    assert matrix.distance_km.shape == (4, 4)
+    assert matrix.distance_km.dtype == np.float32
+    home = matrix.home_node("res1")
+    assert home == 3
+    assert math.isclose(matrix.distance_km[0, home], haversine(44.97, -93.26, 44.86, -93.39), rel_tol=1e-5)
+    assert matrix.distance_km[0, 1] == matrix.distance_km[1, 0]
+    assert matrix.distance_km[2, 0] == 0.0  # no coordinates
+    assert math.isclose(matrix.drive_minutes(0, 1), matrix.distance_km[0, 1] * 60 * 1.3 / 50, rel_tol=1e-5)
+
+def test_matrix_is_cached_as_memmap(tmp_path):
+    first = build_travel_matrix(JOBS, RESOURCES, cache_dir=str(tmp_path))
+    second = build_travel_matrix(JOBS, RESOURCES, cache_dir=str(tmp_path))
+
+    assert isinstance(second.distance_km, np.memmap)
+    assert len(os.listdir(tmp_path)) == 1
+    assert np.array_equal(first.distance_km, second.distance_km)
+
+def test_spatial_grid_rings_walk_outwards():
+    grid = SpatialGrid(cell_km=5.0, reference_lat=45.0)
+    grid.add("here", 45.0, -93.0)
+    grid.add("near", 45.06, -93.0)   # ~6.7 km north
+    grid.add("far", 45.5, -93.0)     # ~56 km north
+
+    rings = list(grid.rings(45.0, -93.0))
+    order = [item for ring in rings for item in ring]
+    assert order == ["here", "near", "far"]
+    assert len(rings) == 1 + grid.cell_of(45.5, -93.0)[1] - grid.cell_of(45.0, -93.0)[1]
+    assert math.isclose(haversine_km(45.0, -93.0, 45.5, -93.0), haversine(45.0, -93.0, 45.5, -93.0))
+    assert list(SpatialGrid(1.0, 0.0).rings(0.0, 0.0)) == []
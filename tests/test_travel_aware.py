@@ -0,0 +1,79 @@
+import pytest
+
+from src.auto_scheduler import travel_aware_autoschedule
+from src.utils.schedule import SKIP_NO_AVAILABILITY, SKIP_NO_ELIGIBLE_RESOURCES
+from src.utils.synthetic import generate_tenant
+from src.utils.travel import haversine_km
+
+# Two technicians based in towns about 30 km apart, jobs around each town
+NORTH = (45.10, -93.30)
+SOUTH = (44.83, -93.30)
+
+def job(job_id, town, offset, duration=2, skills=("skill1",)):
+    return {"id": job_id, "required_skills": list(skills), "estimated_duration": duration,
+            "latitude": town[0] + offset, "longitude": town[1] + offset}
+
+@pytest.fixture
+def data(make_input):
+    def build(jobs, end_date="2024-01-02"):
+        return make_input(jobs, [
+            {"id": "north", "skills": ["skill1"], "latitude": NORTH[0], "longitude": NORTH[1]},
+            {"id": "south", "skills": ["skill1", "skill2"], "latitude": SOUTH[0], "longitude": SOUTH[1]},
+        ], end_date=end_date)
+    return build
+
+def test_jobs_go_to_the_nearest_technician_and_share_a_route(data):
+    schedule = travel_aware_autoschedule(data([
+        job("s1", SOUTH, 0.01), job("n1", NORTH, 0.01), job("s2", SOUTH, -0.01), job("n2", NORTH, 0.02),
+    ]))
+
+    rows = {e["job_id"]: (a["resource_id"], e["start_date"], e["start_time"], e["end_time"]) for e, a in schedule}
+    assert rows["s1"][:2] == rows["s2"][:2] == ("south", "2024-01-01")
+    assert rows["n1"][:2] == rows["n2"][:2] == ("north", "2024-01-01")
+    # Routes are laid out back to back from the start of the day
+    assert sorted(rows[name][2:] for name in ("n1", "n2")) == [("08:00", "10:00"), ("10:00", "12:00")]
+    assert schedule.skipped == []
+
+def test_full_days_open_a_new_route_and_unplaceable_jobs_are_skipped(data):
+    schedule = travel_aware_autoschedule(data([
+        job("s1", SOUTH, 0.01, duration=8, skills=["skill2"]),
+        job("s2", SOUTH, 0.02, duration=8, skills=["skill2"]),
+        job("s3", SOUTH, 0.03, duration=8, skills=["skill2"]),
+        job("x", NORTH, 0.0, skills=["skill3"]),
+    ]))
+
+    rows = {e["job_id"]: (a["resource_id"], e["start_date"]) for e, a in schedule}
+    assert rows == {"s1": ("south", "2024-01-01"), "s2": ("south", "2024-01-02")}
+    assert schedule.skipped == [
+        {"job_id": "s3", "reason": SKIP_NO_AVAILABILITY},
+        {"job_id": "x", "reason": SKIP_NO_ELIGIBLE_RESOURCES},
+    ]
+
+def test_jobs_without_coordinates_are_still_placed(data):
+    jobs = [job("s1", SOUTH, 0.01), {"id": "anywhere", "required_skills": ["skill1"], "estimated_duration": 1}]
+    schedule = travel_aware_autoschedule(data(jobs))
+
+    assert sorted(event["job_id"] for event, _ in schedule) == ["anywhere", "s1"]
+
+def route_km(schedule, data):
+    points = {rec["id"]: (rec["latitude"], rec["longitude"]) for rec in data["jobs"] + data["resources"]}
+    routes = {}
+    for event, assignment in schedule:
+        routes.setdefault((assignment["resource_id"], event["start_date"]), []).append(
+            (event["start_time"], event["job_id"]))
+    total = 0.0
+    for (resource_id, _), stops in routes.items():
+        path = [points[resource_id]] + [points[job_id] for _, job_id in sorted(stops)] + [points[resource_id]]
+        total += sum(haversine_km(*a, *b) for a, b in zip(path, path[1:]))
+    return total
+
+def test_fewer_candidates_still_give_valid_short_routes():
+    data = generate_tenant(300, 20, num_skills=4, horizon_days=10, seed=3)
+    wide = travel_aware_autoschedule(data, max_candidates=len(data["resources"]) * 10)
+    narrow = travel_aware_autoschedule(data, max_candidates=4)
+
+    assert len(narrow) == len(wide)
+    skills = {res["id"]: set(res["skills"]) for res in data["resources"]}
+    required = {job["id"]: set(job["required_skills"]) for job in data["jobs"]}
+    assert all(required[e["job_id"]] <= skills[a["resource_id"]] for e, a in narrow)
+    assert route_km(narrow, data) < 1.25 * route_km(wide, data)
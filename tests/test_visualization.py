@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+import matplotlib
+import pytest
+matplotlib.use("Agg")
+
+from src.auto_scheduler import round_robin_with_skills_autoschedule
+from src.utils.visualization import occupancy_grid, visualize_job_assignments
+
+@pytest.fixture
+def data(make_input):
+    return make_input([("job1", ["skill1"]), ("job2", ["skill2"]), ("job3", ["skill1"]), ("job4", ["skill1"])],
+                      [("res1", ["skill1"]), ("res2", ["skill1", "skill2"])], end_date="2024-01-03")
+
+def test_occupancy_grid_counts_jobs_per_cell(data):
+    schedule = round_robin_with_skills_autoschedule(data)
+    resource_ids = [res["id"] for res in data["resources"]]
+
+    grid = occupancy_grid(schedule, resource_ids, data["date_range"])
+
+    assert grid.shape == (2, 3)
+    assert grid.sum() == 4
+    assert (grid == occupancy_grid(list(schedule), resource_ids, data["date_range"])).all()
+
+def test_multi_day_events_fill_every_day(data):
+    job_schedule = [
+        ({"job_id": "job1", "start_date": "2024-01-02", "end_date": "2024-01-04"}, {"resource_id": "res2"}),
+    ]
+
+    grid = occupancy_grid(job_schedule, ["res1", "res2"], data["date_range"])
+
+    # The day past the range is dropped
+    assert grid.tolist() == [[0, 0, 0], [0, 1, 1]]
+
+def test_headless_output_writes_files(data, tmp_path):
+    schedule = round_robin_with_skills_autoschedule(data)
+
+    paths = visualize_job_assignments(schedule, data["resources"], data["date_range"], data["jobs"],
+                                      "Round Robin", output_dir=str(tmp_path), formats=("png", "svg", "html"))
+
+    assert [os.path.basename(path) for path in paths] == ["Round-Robin.png", "Round-Robin.svg", "Round-Robin.html"]
+    assert all(os.path.getsize(path) > 0 for path in paths)
+    page = open(paths[2], encoding="utf-8").read()
+    payload = page.split('type="application/json">')[1].split("</script>")[0]
+    cells = json.loads(payload)["cells"]
+    assert sorted(map(tuple, cells)) == sorted((row.resource_index, row.day, row.job_index)
+                                               for row in schedule.rows())
+
+def test_headless_rendering_does_not_import_pyplot_or_pandas(tmp_path):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import json, sys\n"
+        "from src.auto_scheduler import round_robin_with_skills_autoschedule\n"
+        "from src.utils.visualization import visualize_job_assignments\n"
+        "data = json.load(open('data/input/test-input-data.json'))\n"
+        "schedule = round_robin_with_skills_autoschedule(data)\n"
+        "visualize_job_assignments(schedule, data['resources'], data['date_range'], data['jobs'], 't',\n"
+        f"                          {str(tmp_path)!r})\n"
+        "print(sorted(name for name in ('matplotlib.pyplot', 'pandas') if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True, check=True)
+
+    assert result.stdout.splitlines()[-1] == "[]"